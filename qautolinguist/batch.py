@@ -0,0 +1,260 @@
+"""
+Multi-project builds in one process.
+
+``BatchRunner`` builds several QAutoLinguist projects (one ``.qal_config.ini`` each) sharing:
+    - an ``EnginePool``: translators are built and connectivity is probed once per engine, not once per project.
+    - a translation memory per (engine, default_locale): strings already translated by a project are reused.
+    - a ``RequestCoalescer``: identical texts requested at the same time by several projects or locales are translated once.
+    - a lrelease worker pool: .qm files of every project are compiled in parallel.
+
+Projects run concurrently (``jobs`` threads), biggest sources first so long builds do not end up last.
+"""
+
+import glob
+import os
+import threading
+import time
+import qautolinguist.consts as consts
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from qautolinguist.config import Config
+from qautolinguist.qal import QAutoLinguist
+from qautolinguist.translator import MATranslator
+from qautolinguist.translators.coalescer import RequestCoalescer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+
+__all__: List[str] = ["EnginePool", "ProjectResult", "BatchRunner"]
+
+
+_PATH_PARAMS = ("source_file", "source_files_folder", "translations_folder", "translatables_folder", "metrics_report")
+
+
+class EnginePool:
+    """
+    Pool of ``MATranslator`` instances per engine (and engine options, see ``QAutoLinguist.engine_options``).
+    Engines keep per-call state, so each concurrent build acquires its own instance; instances are reused by the
+    next builds instead of being built again. Every instance shares ``coalescer``, if given.
+    """
+
+    def __init__(self, coalescer: Optional[RequestCoalescer] = None) -> None:
+        self.coalescer = coalescer
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str], List[MATranslator]] = {}
+        self._all: List[MATranslator] = []
+        self._checked: Set[str] = set()     # engines whose connectivity was already probed
+
+    @contextmanager
+    def acquire(self, engine: str, **engine_options) -> Iterator[MATranslator]:
+        key = (engine, repr(sorted(engine_options.items())))
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            translator = idle.pop() if idle else None
+            check_connection = engine not in self._checked
+            self._checked.add(engine)
+
+        if translator is None:
+            try:
+                translator = MATranslator(engine, check_connection=check_connection, coalescer=self.coalescer, **engine_options)
+            except Exception:
+                with self._lock:
+                    self._checked.discard(engine)
+                raise
+            with self._lock:
+                self._all.append(translator)
+        try:
+            yield translator
+        finally:
+            with self._lock:
+                self._idle[key].append(translator)
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def close(self) -> None:
+        for translator in self._all:
+            translator.close()
+
+
+class ProjectResult:
+    "Outcome of one project of a batch."
+
+    __slots__ = ("config", "ok", "error", "wall", "locales", "counters")
+
+    def __init__(self, config: Path, ok: bool, wall: float, locales: List[str], counters: Dict[str, float], error: Optional[str] = None):
+        self.config = config
+        self.ok = ok
+        self.error = error
+        self.wall = wall
+        self.locales = locales
+        self.counters = counters
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {attr: str(self.config) if attr == "config" else getattr(self, attr) for attr in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"ProjectResult({self.config}, {'ok' if self.ok else 'failed'}, {self.wall:.3f}s)"
+
+
+class BatchRunner:
+    """
+    Builds every project in ``configs`` (paths to config files) in one process.
+
+    Usage:
+        runner = BatchRunner(BatchRunner.discover(["apps/*/.qal_config.ini"]), jobs=4)
+        results = runner.run()
+        runner.report()         # aggregate throughput and per-project results
+
+    Relative paths inside a config file are resolved from the folder of that file, which also holds its build cache
+    and, when ``translations_folder`` is not set, its output folders (``<config folder>/translations``).
+    """
+
+    def __init__(
+        self,
+        configs: Iterable[Union[str, Path]],
+        *,
+        jobs: Optional[int] = None,
+        lrelease_workers: Optional[int] = None,
+        engine_pool: Optional[EnginePool] = None,
+        coalesce: bool = True,
+        **qal_kwargs,
+    ) -> None:
+        self.configs = [Path(config).resolve() for config in configs]
+        self.jobs = jobs or max(1, min(len(self.configs), os.cpu_count() or 1))
+        self.lrelease_workers = lrelease_workers or os.cpu_count() or 1
+        self.engine_pool = engine_pool if engine_pool is not None else EnginePool(RequestCoalescer() if coalesce else None)
+        self.qal_kwargs = qal_kwargs                 # extra QAutoLinguist params applied to every project
+        self.results: List[ProjectResult] = []
+        self._memories: Dict[Tuple[str, str], Dict[str, Dict[str, str]]] = {}
+        self._memories_lock = threading.Lock()
+        self._wall = 0.0
+
+    @staticmethod
+    def discover(patterns: Iterable[str] = (), root: Path = consts.CMD_CWD) -> List[Path]:
+        """
+        Expands ``patterns`` (config paths, folders containing a config file or globs) relative to ``root``.
+        Without patterns, every config file under ``root`` is returned.
+        """
+        patterns = list(patterns) or [f"**/{consts.CONFIG_FILENAME}"]
+        found: Dict[Path, None] = {}
+        for pattern in patterns:
+            pattern = str(pattern) if Path(pattern).is_absolute() else str(root / pattern)
+            for match in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+                path = Path(match)
+                if path.is_dir():
+                    path = path / consts.CONFIG_FILENAME
+                if path.is_file():
+                    found[path.resolve()] = None
+        return list(found)
+
+    def translation_memory(self, engine: str, default_locale: str) -> Dict[str, Dict[str, str]]:
+        "Translation memory shared by the projects using ``engine`` and source language ``default_locale``."
+        with self._memories_lock:
+            return self._memories.setdefault((engine, default_locale), {})
+
+    @staticmethod
+    def load_project(config: Path) -> Dict[str, Any]:
+        "QAutoLinguist params of ``config`` with relative paths resolved from its folder."
+        return BatchRunner._resolve_paths(config, Config().load_config(config))      # one parser per file: ConfigParser.read merges files
+
+    @staticmethod
+    def _resolve_paths(config: Path, content: Dict[str, Any]) -> Dict[str, Any]:
+        for param in _PATH_PARAMS:
+            value = content.get(param)
+            if value and not Path(value).is_absolute():
+                content[param] = str(config.parent / value)
+        if not content.get("cache_dir"):
+            content["cache_dir"] = config.parent
+        return content
+
+    @staticmethod
+    def _project_folders(config: Path, content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Without ``translations_folder``, QAutoLinguist writes into ``CMD_CWD/translations``, which every project of the
+        batch would share (and clean). Each project gets ``<config folder>/translations`` instead; the .ts and
+        translatables folders default to children of it.
+        """
+        if content.get("translations_folder"):
+            return content
+        folder = config.parent / QAutoLinguist._TRANSLATIONS_FOLDER_NAME
+        folder.mkdir(exist_ok=True)
+        return {**content, "translations_folder": str(folder)}
+
+    def load_projects(self) -> Tuple[Dict[Path, Dict[str, Any]], Dict[Path, Exception]]:
+        "Params of every project (``load_project()``) and the errors of those that cannot be loaded. Files are parsed once."
+        errors: Dict[Path, Exception] = {}
+        contents = Config.load_many(self.configs, errors=errors)
+        return {config: self._resolve_paths(config, content) for config, content in contents.items()}, errors
+
+    def _run_project(self, config: Path, content: Dict[str, Any], lrelease_executor: ThreadPoolExecutor) -> ProjectResult:
+        start = time.perf_counter()
+        try:
+            content = self._project_folders(config, {**content, **self.qal_kwargs})
+            engine = content.get("engine") or "google"
+            memory = self.translation_memory(engine, content.get("default_locale") or "en")
+
+            options = QAutoLinguist.engine_options(engine, content.get("failover_engines"), content.get("routing_weights"))
+            with self.engine_pool.acquire(engine, **options) as translator:
+                qal = QAutoLinguist(**content, translator=translator, translation_memory=memory, lrelease_executor=lrelease_executor)
+                try:
+                    qal.build()
+                finally:
+                    qal.detach_translator()
+        except Exception as e:      # a failed project must not stop the others
+            return self._failed(config, e, time.perf_counter() - start)
+
+        return ProjectResult(config, True, time.perf_counter() - start, list(qal.map), dict(qal.instrumentation.counters))
+
+    @staticmethod
+    def _failed(config: Path, error: Exception, wall: float = 0.0) -> ProjectResult:
+        return ProjectResult(config, False, wall, [], {}, error=f"{type(error).__name__}: {error}")
+
+    @staticmethod
+    def _schedule(projects: Dict[Path, Dict[str, Any]]) -> List[Path]:
+        "Biggest sources first (longest processing time first)."
+        def weight(config: Path) -> int:
+            try:
+                source = projects[config].get("source_file")
+                return Path(source).stat().st_size if source else 0
+            except OSError:
+                return 0
+        return sorted(projects, key=weight, reverse=True)
+
+    def run(self) -> List[ProjectResult]:
+        "Builds every project and returns their results in the order of ``configs``."
+        start = time.perf_counter()
+        contents, errors = self.load_projects()
+        with ThreadPoolExecutor(self.lrelease_workers, thread_name_prefix="lrelease") as lrelease_executor, \
+            ThreadPoolExecutor(self.jobs, thread_name_prefix="project") as projects:
+            futures = {
+                config: projects.submit(self._run_project, config, contents[config], lrelease_executor) 
+                for config in self._schedule(contents)
+            }
+            self.results = [
+                futures[config].result() if config in futures else self._failed(config, errors[config]) 
+                for config in self.configs
+            ]
+        self._wall = time.perf_counter() - start
+        return self.results
+
+    def report(self) -> Dict[str, Any]:
+        "Aggregate throughput and per-project results of the last ``run()``."
+        totals: Dict[str, float] = {}
+        for result in self.results:
+            for name, value in result.counters.items():
+                totals[name] = totals.get(name, 0) + value
+
+        wall = self._wall
+        return {
+            "projects": len(self.results),
+            "failed": sum(1 for result in self.results if not result.ok),
+            "wall": round(wall, 6),
+            "engines_built": len(self.engine_pool),
+            "coalescer": self.engine_pool.coalescer.stats() if self.engine_pool.coalescer is not None else None,
+            "counters": totals,
+            "messages_per_second": round(totals.get("messages", 0) / wall, 3) if wall else 0.0,
+            "characters_per_second": round(totals.get("characters", 0) / wall, 3) if wall else 0.0,
+            "results": [result.to_dict() for result in self.results],
+        }
@@ -0,0 +1,66 @@
+"""
+Benchmark of the translation quality backends: in-house n-gram scorer vs nltk.
+
+    python -m qautolinguist.benchs.bench_quality [messages]
+
+Scores the same synthetic (reference, hypothesis) pairs with both backends and prints the time of each one,
+the speedup and the largest score difference. Also measures the import time of the quality module, which
+no longer pulls nltk in.
+"""
+
+import random
+import subprocess
+import sys
+import time
+
+from typing import List, Tuple
+
+from qautolinguist.translators.mt_quality import nltk_sentence_scores, sentence_scores
+
+WORDS = (
+    "open save file the document close all settings window help quit edit view new recent export import "
+    "selected rows delete copy paste undo redo print preview zoom language theme font size"
+).split()
+
+
+def make_pairs(count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    "UI-like sentences (1 to 12 words) and a hypothesis that keeps, drops or replaces each word."
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        reference = rng.choices(WORDS, k=rng.randint(1, 12))
+        hypothesis = [word if rng.random() < 0.8 else rng.choice(WORDS) for word in reference if rng.random() < 0.95]
+        pairs.append((" ".join(reference).capitalize() + ".", " ".join(hypothesis).capitalize() + "."))
+    return pairs
+
+
+def timeit(scorer, pairs: List[Tuple[str, str]]) -> Tuple[float, List[Tuple[float, float]]]:
+    start = time.perf_counter()
+    scores = [scorer(reference, hypothesis) for reference, hypothesis in pairs]
+    return time.perf_counter() - start, scores
+
+
+def import_time(module: str) -> float:
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+
+def main(count: int = 20000) -> None:
+    pairs = make_pairs(count)
+    native_time, native = timeit(sentence_scores, pairs)
+    nltk_time, reference = timeit(nltk_sentence_scores, pairs)
+    difference = max(
+        max(abs(a[0] - b[0]), abs(a[1] - b[1])) for a, b in zip(native, reference)
+    )
+
+    print(f"pairs:                {count}")
+    print(f"native:               {native_time:.3f}s ({count / native_time:,.0f} pairs/s)")
+    print(f"nltk:                 {nltk_time:.3f}s ({count / nltk_time:,.0f} pairs/s)")
+    print(f"speedup:              {nltk_time / native_time:.1f}x")
+    print(f"max score difference: {difference:.2e}")
+    print(f"import mt_quality:    {import_time('qautolinguist.translators.mt_quality'):.3f}s")
+    print(f"import nltk (bleu):   {import_time('nltk.translate.bleu_score'):.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -1,8 +1,8 @@
 from pathlib import Path
-from json import dumps, load
+from json import load
 from qautolinguist.consts import CMD_CWD
-from qautolinguist.debugstyles import DebugLogs
-from typing import Dict, Any, Optional
+from qautolinguist.manifest import BuildManifest
+from typing import Dict, Optional
 
 
 class CacheImpl:
@@ -13,12 +13,11 @@ class CacheImpl:
 
     ``This implementation only works when working with dicts/mappings.``
     
-    There will be created two files: 
-        - ``nodes``: That essentially contains a dict with data.
-        - ``external``: That contain the configuration parameters
+    The cache is stored as a content-addressed ``BuildManifest`` (``manifest.json``):
+        - ``data``: ``dict[locale: [ts_path, translatable_path]]``, stored with the hash of each file.
+        - ``external``: configuration parameters needed to process the data (``qm_folder``, ``debug``, ``verbose``).
         
-    Data is expected to be a dict containing semantic key-values.
-    External/Config must contain configuration parameters or useful information to process the data.
+    Caches written by older versions (``nodes`` and ``external`` files) can still be read with ``get_data``.
     """
     
     def __init__(
@@ -27,7 +26,7 @@ def __init__(
         external: Dict,
         *,
         cwd_dir: Path = CMD_CWD,
-        folder_name: str = ".qal_cache",
+        folder_name: str = BuildManifest.FOLDER_NAME,
         private_folder: bool = False,
     ) -> None:
         
@@ -38,6 +37,7 @@ def __init__(
         self.private_folder = private_folder
         
         self.cache_path = self.cwd_dir / folder_name
+        self.manifest = BuildManifest(self.cwd_dir, folder_name=folder_name)
     
     @property
     def data(self):
@@ -52,6 +52,7 @@ def build_cache(self):
         self._init_folder()
         self._add_data()
         self._add_externals()
+        self.manifest.save()
         return self
         
     def _init_folder(self):
@@ -63,30 +64,33 @@ def _init_folder(self):
             raise OSError(f"Unexpected error while creating cache folder: {e}") from None
     
     def _add_data(self):
-        with open(self.cache_path / "nodes", mode="w", encoding="utf-8") as fp:
-            fp.write(self._process_data(self._data))      
+        for locale, paths in self._data.items():
+            for kind, path in zip(("ts", "translatable"), paths):
+                self.manifest.record_file(locale, kind, Path(path))
         
     def _add_externals(self):
-        with open(self.cache_path / "external", mode="w", encoding="utf-8") as fp:
-            fp.write(self._process_data(self.external))
-    
-    @staticmethod
-    def _process_data(data: Any):
-        "Dumps either an indented dict or raw str depending if data is a dict or not."
-        return dumps(data, indent=4) if isinstance(data, Dict) else str(data)
+        self.manifest.config.update(self.external)
     
     @staticmethod
     def get_data(cwd_dir: Path = CMD_CWD, cache_folder: Optional[str] = None):
-        "Search for `cache_folder` in `cwd_dir`. If `cache_folder` is not specified, will search `.qal_cache` folder."
+        """
+        Search for `cache_folder` in `cwd_dir`. If `cache_folder` is not specified, will search `.qal_cache` folder.
+        Returns ``dict[nodes, external, manifest]``; ``manifest`` is None for caches written by older versions.
+        """
         
         if not cache_folder:
-            cache_folder = ".qal_cache"
+            cache_folder = BuildManifest.FOLDER_NAME
             
         cache_path = cwd_dir / cache_folder
         
         if not cache_path.exists():
             raise OSError(f"Unable to found cache folder in root -> {cwd_dir!r}.")
         
+        manifest = BuildManifest.load(cwd_dir, folder_name=cache_folder)
+        if manifest.exists():
+            return {"nodes": manifest.nodes(), "external": manifest.config, "manifest": manifest}
+
+        # -- legacy cache (nodes + external files) --
         nodes = cache_path / "nodes"
         externals = cache_path / "external"
         
@@ -95,7 +99,7 @@ def get_data(cwd_dir: Path = CMD_CWD, cache_folder: Optional[str] = None):
         if not externals.exists():
             raise OSError(f"config/externals file was not found in folder cache contained in root -> {cwd_dir!r}.")
         
-        data = {}
+        data = {"manifest": None}
         
         with open(nodes, mode="r", encoding="utf-8") as nodes, \
             open(externals, mode="r", encoding="utf-8") as externals: 
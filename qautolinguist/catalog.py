@@ -0,0 +1,187 @@
+"""
+In-memory message catalog.
+
+A ``Catalog`` holds the messages of a Qt translation file (.ts) as slotted ``Message`` records: interned
+context and file names, integer line numbers, and no per-message dicts or preformatted strings. Translations
+are kept outside the catalog as plain lists aligned with it (one per locale), since every locale shares the
+same messages.
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+__all__: List[str] = ["Message", "Catalog", "MessageKey", "message_key"]
+
+
+MessageKey = Tuple[str, str, Optional[str]]      # (context, source, comment)
+
+
+def message_key(context: str, message: ET.Element) -> MessageKey:
+    "Identity of a ``<message>`` element of ``context``, as Qt resolves it: (context, source, disambiguation comment)."
+    source = message.find("source")
+    comment = message.find("comment")
+    return (
+        context,
+        source.text or "" if source is not None else "",
+        comment.text or None if comment is not None else None,
+    )
+
+
+class Message:
+    "A translatable message of a .ts file."
+
+    __slots__ = ("context", "source", "comment", "lines", "filename")
+
+    def __init__(
+        self,
+        context: str,
+        source: str,
+        comment: Optional[str] = None,
+        lines: Tuple[int, ...] = (),
+        filename: Optional[str] = None,
+    ):
+        self.context = sys.intern(context)
+        self.source = source
+        self.comment = comment
+        self.lines = lines
+        self.filename = sys.intern(filename) if filename is not None else None
+
+    @property
+    def key(self) -> MessageKey:
+        "Identity of the message in Qt: (context, source, disambiguation comment)."
+        return self.context, self.source, self.comment
+
+    def location(self, source_file: Union[str, Path]) -> str:
+        "Location shown in translatable files, e.g. ``line ['20'] extracted from 'app.ui'``."
+        return f"line {[str(line) for line in self.lines]} extracted from '{source_file}'"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Message):
+            return NotImplemented
+        return self.key == other.key and self.lines == other.lines and self.filename == other.filename
+
+    def __repr__(self) -> str:
+        return f"Message({self.context!r}, {self.source!r}, comment={self.comment!r}, lines={self.lines})"
+
+
+class Catalog:
+    """
+    Ordered collection of ``Message`` (document order of the .ts).
+
+    Usage:
+        catalog = Catalog.from_ts("translations/qt_font_files/en.ts")
+        sources = catalog.sources()
+        fmt.write(path, catalog.groups(source_file, translations))
+    """
+
+    __slots__ = ("messages", "_index")
+
+    def __init__(self, messages: Optional[Iterable[Message]] = None):
+        self.messages: List[Message] = list(messages or [])
+        self._index: Optional[Dict[MessageKey, int]] = None
+
+    @classmethod
+    def from_ts(cls, ts_file: Union[str, Path]) -> "Catalog":
+        """
+        Parses ``ts_file`` incrementally; every ``<message>`` element is released once read.
+        Relative locations (``-locations relative``, lupdate default) are resolved as Qt does: ``line="+3"`` is an offset
+        from the previous line of the same file and a location without ``filename`` belongs to the previous file.
+
+        ### Raises:
+            - ``OSError``, ``ET.ParseError``: When the file cannot be read or is not valid XML.
+        """
+        messages: List[Message] = []
+        context = ""
+        in_context_name = False
+        stack: List[str] = []
+        current_file: Optional[str] = None
+        current_lines: Dict[Optional[str], int] = {}       # last line of each file, base of relative locations
+
+        for event, elem in ET.iterparse(ts_file, events=("start", "end")):
+            if event == "start":
+                stack.append(elem.tag)
+                in_context_name = elem.tag == "name" and len(stack) >= 2 and stack[-2] == "context"
+                continue
+
+            stack.pop()
+            if in_context_name and elem.tag == "name":
+                context = elem.text or ""
+                in_context_name = False
+            elif elem.tag == "message":
+                _, source, comment = message_key(context, elem)
+                lines: List[int] = []
+                filename: Optional[str] = None
+                for idx, loc in enumerate(elem.iterfind("location")):
+                    current_file = loc.get("filename") or current_file
+                    if idx == 0:
+                        filename = current_file
+                    line = loc.get("line")
+                    if line is None:
+                        continue
+                    if line[:1] in ("+", "-"):
+                        current_lines[current_file] = current_lines.get(current_file, 0) + int(line)
+                    else:
+                        current_lines[current_file] = int(line)
+                    lines.append(current_lines[current_file])
+                messages.append(Message(context, source, comment, tuple(lines), filename))
+                elem.clear()
+            elif elem.tag == "context":
+                elem.clear()
+        return cls(messages)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self.messages)
+
+    def __getitem__(self, idx: int) -> Message:
+        return self.messages[idx]
+
+    def sources(self) -> List[str]:
+        return [message.source for message in self.messages]
+
+    @property
+    def index(self) -> Dict[MessageKey, int]:
+        "``dict[key: position]``, built on first use. Repeated keys (merged by Qt) resolve to their first message."
+        if self._index is None:
+            index: Dict[MessageKey, int] = {}
+            for idx, message in enumerate(self.messages):
+                index.setdefault(message.key, idx)
+            self._index = index
+        return self._index
+
+    def position(self, key: MessageKey) -> Optional[int]:
+        return self.index.get(key)
+
+    def __contains__(self, key: MessageKey) -> bool:
+        return key in self.index
+
+    def keyed(self, translations: Iterable[str]) -> Dict[MessageKey, str]:
+        "``dict[key: translation]`` from ``translations`` aligned with the catalog."
+        return {message.key: translation for message, translation in zip(self.messages, translations)}
+
+    def groups(self, source_file: Union[str, Path], translations: Optional[Iterable[str]] = None) -> Iterator[Dict[str, str]]:
+        """
+        Yields the ``{location, context, [comment], SOURCE, TRANSLATION}`` group of each message, lazily so translatable
+        formats can stream them. ``TRANSLATION`` is the source unless ``translations`` (aligned with the catalog) are given.
+        """
+        translations = translations if translations is not None else (message.source for message in self.messages)
+        for message, translation in zip(self.messages, translations):
+            group = {"location": message.location(source_file), "context": message.context}
+            if message.comment is not None:
+                group["comment"] = message.comment
+            group["SOURCE"] = message.source
+            group["TRANSLATION"] = translation
+            yield group
+
+    @staticmethod
+    def group_key(group: Dict[str, str]) -> Optional[MessageKey]:
+        "Key of a translatable group, None for groups written before contexts were stored."
+        if "context" not in group:
+            return None
+        return group["context"], group.get("SOURCE", ""), group.get("comment")
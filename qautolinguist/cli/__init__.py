@@ -1,4 +1,6 @@
 import click
+import contextlib
+import sys
 import qautolinguist.consts as consts
 import qautolinguist.exceptions as exceptions
 
@@ -58,11 +60,15 @@ def init(filename):
     '-revised', 
     is_flag=True, 
 )
+@click.option('--all', 'all_projects', is_flag=True, help="Build every config file matched by FILE_PATH (paths, folders or globs) in one process.")
+@click.option('--jobs', default=None, type=click.INT, help="Projects built concurrently with --all. Defaults to the number of CPUs.")
+@click.option('--resume', is_flag=True, help="Reuse the translations journaled by a failed or interrupted build.")
+@click.option('--progress', 'progress_format', default=None, type=click.Choice(["bar", "jsonl"]), help="Report live progress: a terminal bar on stderr or JSON lines on stdout (CI). With jsonl, build logs go to stderr.")
 @click.argument(
     'file_path', 
-    required=False, 
+    nargs=-1, 
 )
-def run(file_path, revised):
+def run(file_path, revised, all_projects, jobs, resume, progress_format):
     """
     Crea binarios con archivos de traducción.
     """
@@ -71,6 +77,183 @@ def run(file_path, revised):
         QAutoLinguist.compose_qm_files()  
         return
     
+    if all_projects:
+        _run_batch(file_path, jobs, resume)
+        return
+    
+    if len(file_path) > 1:
+        raise click.UsageError("Only one config file can be built at once. Use --all to build several projects.")
+    
+    content = inst.load_config(_resolve_config_path(file_path[0] if file_path else None))
+    jsonl = progress_format == "jsonl"
+    stdout = sys.stdout
+    
+    with contextlib.redirect_stdout(sys.stderr) if jsonl else contextlib.nullcontext():      # con jsonl, stdout solo recibe las lineas JSON
+        qal_inst = QAutoLinguist(**content, resume=resume)
+        try:
+            qal_inst.build(with_progress_bar=progress_format is not None, progress_format=progress_format or "bar", progress_stream=stdout if jsonl else None)
+        except exceptions.QALBaseException as e:
+            raise e
+
+
+@build.command()
+@click.option('--all', 'all_projects', is_flag=True, help="Plan every config file matched by FILE_PATH (paths, folders or globs).")
+@click.option('-o', '--output', default=None, type=click.Path(dir_okay=False), help="Write the plan to this file instead of stdout.")
+@click.argument(
+    'file_path', 
+    nargs=-1, 
+)
+def plan(file_path, all_projects, output):
+    """
+    Muestra en JSON lo que haría la build (locales, mensajes, caracteres y peticiones estimadas) sin ejecutarla.
+    """
+    import json
+    from qautolinguist.batch import BatchRunner
+    from qautolinguist.plan import BuildPlan
+    
+    if all_projects:
+        configs = BatchRunner.discover(file_path)
+        if not configs:
+            raise click.UsageError("No config files found.")
+        document = {"projects": [BuildPlan.from_config(config).to_dict() for config in configs]}
+    else:
+        if len(file_path) > 1:
+            raise click.UsageError("Only one config file can be planned at once. Use --all to plan several projects.")
+        document = BuildPlan.from_config(_resolve_config_path(file_path[0] if file_path else None)).to_dict()
+    
+    text = json.dumps(document, indent=2)
+    if output is None:
+        click.echo(text)
+    else:
+        Path(output).write_text(text + "\n", encoding="utf-8")
+
+
+@build.group()
+def shard():
+    """
+    Reparte la traducción de un proyecto entre varios procesos o máquinas que comparten una carpeta.
+    """
+    pass
+
+
+@shard.command("plan")
+@click.option('--dir', 'shard_dir', required=True, type=click.Path(file_okay=False), help="Folder where units and results are kept.")
+@click.option('--max-messages', default=500, show_default=True, type=click.INT, help="Unique sources per work unit.")
+@click.option('--locale', 'locales', multiple=True, help="Only shard these locales (repeatable). Defaults to every stale locale.")
+@click.argument(
+    'file_path',
+    required=False,
+)
+def shard_plan(file_path, shard_dir, max_messages, locales):
+    """
+    Divide las traducciones pendientes en unidades de trabajo.
+    """
+    from qautolinguist.sharding import ShardSet
+
+    shards = ShardSet.plan(_resolve_config_path(file_path), shard_dir, max_messages=max_messages, locales=list(locales) or None)
+    click.secho(f"{len(shards.unit_ids)} work units written in {shards.root}", fg="green")
+
+
+@shard.command("work")
+@click.option('--limit', default=None, type=click.INT, help="Stop after translating this many units.")
+@click.option('--worker-id', default=None, help="Name written in the claims and results. Defaults to <host>:<pid>.")
+@click.argument('shard_dir', type=click.Path(exists=True, file_okay=False))
+def shard_work(shard_dir, limit, worker_id):
+    """
+    Traduce las unidades pendientes hasta que no quede ninguna.
+    """
+    from qautolinguist.sharding import ShardWorker
+
+    worker = ShardWorker(shard_dir, worker_id=worker_id)
+    try:
+        done, failed = worker.run(limit)
+    finally:
+        worker.close()
+    click.secho(f"[{worker.worker_id}] {len(done)} units translated", fg="green")
+    for unit_id, error in failed.items():
+        click.secho(f"[FAILED] {unit_id}: {error}", fg="red")
+    if failed:
+        raise SystemExit(1)
+
+
+@shard.command("status")
+@click.option('--release-after', default=None, type=click.FLOAT, help="Release units claimed more than these seconds ago without result.")
+@click.argument('shard_dir', type=click.Path(exists=True, file_okay=False))
+def shard_status(shard_dir, release_after):
+    """
+    Muestra en JSON el estado de las unidades de trabajo.
+    """
+    import json
+    from qautolinguist.sharding import ShardSet
+
+    shards = ShardSet(shard_dir)
+    status = shards.status()
+    if release_after is not None:
+        status["released"] = shards.release_stale(release_after)
+    click.echo(json.dumps(status, indent=2))
+
+
+@shard.command("merge")
+@click.option('--config', 'file_path', default=None, type=click.Path(dir_okay=False), help="Config file to build. Defaults to the planned one.")
+@click.argument('shard_dir', type=click.Path(exists=True, file_okay=False))
+def shard_merge(shard_dir, file_path):
+    """
+    Construye el proyecto con los resultados de todas las unidades.
+    """
+    from qautolinguist.sharding import ShardSet
+
+    ShardSet(shard_dir).merge_build(file_path)
+
+
+@qautolinguist.command()
+@click.option('--interval', default=0.5, show_default=True, type=click.FLOAT, help="Seconds between file checks.")
+@click.option('--debounce', default=0.3, show_default=True, type=click.FLOAT, help="Quiet seconds before rebuilding.")
+@click.argument(
+    'file_path', 
+    required=False, 
+)
+def watch(file_path, interval, debounce):
+    """
+    Reconstruye las traducciones cuando cambian el archivo fuente o los translatables.
+    """
+    from qautolinguist.watch import WatchSession
+    
+    content = inst.load_config(_resolve_config_path(file_path))
+    WatchSession(QAutoLinguist(**content), interval=interval, debounce=debounce).run()
+
+
+def _run_batch(patterns, jobs, resume=False) -> None:
+    "Builds every project matched by ``patterns`` sharing engines, translation memory and lrelease workers."
+    from qautolinguist.batch import BatchRunner
+    
+    configs = BatchRunner.discover(patterns)
+    if not configs:
+        raise click.UsageError("No config files found.")
+    
+    runner = BatchRunner(configs, jobs=jobs, resume=resume)
+    try:
+        results = runner.run()
+    finally:
+        runner.engine_pool.close()
+    
+    for result in results:
+        if result.ok:
+            click.secho(f"[OK]     {result.config} ({result.wall:.2f}s, {len(result.locales)} locales)", fg="green")
+        else:
+            click.secho(f"[FAILED] {result.config} ({result.wall:.2f}s): {result.error}", fg="red")
+    
+    report = runner.report()
+    click.secho(
+        f"{report['projects'] - report['failed']}/{report['projects']} projects built in {report['wall']:.2f}s "
+        f"({report['messages_per_second']} messages/s, {report['characters_per_second']} characters/s)",
+        fg="yellow" if report["failed"] else "green",
+    )
+    if report["failed"]:
+        raise SystemExit(1)
+
+
+def _resolve_config_path(file_path) -> Path:
+    "Config file passed by the user or the one in the CWD. Prompts for a path until an existing one is given."
     if file_path:
         file_path = Path(file_path).resolve()
     else:
@@ -81,16 +264,10 @@ def run(file_path, revised):
             click.secho("No se encontró ningún archivo de configuracion en el directorio actual.", fg="yellow")
             file_path = click.prompt("Indica la ruta del archivo (Crtl+C to cancel)", confirmation_prompt=True, type=click.STRING)
             file_path = Path(file_path).resolve(True)
-    
-    content = inst.load_config(file_path)
-    qal_inst = QAutoLinguist(**content)
-    
-    try:
-        qal_inst.build()
-    except exceptions.QALBaseException as e:
-        raise e
+    return file_path
 
  
 def run_cli():
-    startup_page()
+    if sys.stdout.isatty():     # stdout redirigido (planes, estado de shards, --progress jsonl): solo datos, sin pagina de inicio
+        startup_page()
     qautolinguist()
\ No newline at end of file
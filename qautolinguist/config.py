@@ -6,8 +6,9 @@
 
 from qautolinguist.config_template import INI_FILE_TEMPLATE
 from ast import literal_eval      # para convertir listas y otras estructuras de datos de str a su tipo original
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Tuple, List, Optional, Union
+from typing import Dict, Any, Callable, Iterable, Tuple, List, Optional, Union
 
 try:
     import importlib.resources as import_resources
@@ -15,7 +16,76 @@
     import importlib_resources
     
     
-__all__: List[str] = ["Config"]
+__all__: List[str] = ["Config", "ParamSchema", "compiled_schema"]
+
+
+_POSITIVE_CASES = frozenset({"true", "t", "on", "yes", "1"})
+_NEGATIVE_CASES = frozenset({"false", "f", "off", "no", "0"})
+
+Value = Union[str, int, float, bool, tuple, list, None]
+
+
+def _to_bool(raw: str) -> bool:
+    if raw in _POSITIVE_CASES:
+        return True
+    if raw in _NEGATIVE_CASES:
+        return False
+    raise exceptions.ConfigWrongParamFormat(
+        f"Failed trying to format {raw!r} into a bool type, valid boolean formats are {set(_POSITIVE_CASES)} or {set(_NEGATIVE_CASES)}"
+    )  # raise specific exceptions when refering to booleans to show valid and invalid types.
+
+
+def _unsupported(raw: str) -> Value:
+    raise exceptions.ConfigWrongParamFormat(
+        "Given object was not able to convert. Reason: No implemented type convertion."
+    )
+
+
+def _converter_for(original: Any) -> Callable[[str], Value]:
+    "Converter of the (stripped, lowercased, non empty) raw values of a parameter whose default is ``original``."
+    if original is None or isinstance(original, str):
+        return str
+    if isinstance(original, bool):          # bool antes que int, bool es subclase de int
+        return _to_bool
+    if isinstance(original, int):
+        return int          # raises ValueError on failure
+    if isinstance(original, float):
+        return float        # raises ValueError on failure
+    if isinstance(original, (list, tuple, dict)):
+        return literal_eval         # raises SyntaxError on failure
+    return _unsupported
+
+
+class ParamSchema:
+    "Declaration of a config parameter (``static/config_decls.json``) with its value converter."
+
+    __slots__ = ("name", "default", "comment", "convert")
+
+    def __init__(self, name: str, default: Any, comment: str):
+        self.name = name
+        self.default = default
+        self.comment = comment
+        self.convert: Callable[[str], Value] = _converter_for(default)
+
+    def parse(self, raw: str) -> Value:
+        "Python value of ``raw`` (text read from the config file). Empty values are None."
+        raw = raw.strip().lower()
+        return self.convert(raw) if raw else None
+
+    def __repr__(self) -> str:
+        return f"ParamSchema({self.name}, default={self.default!r})"
+
+
+@lru_cache(maxsize=None)
+def compiled_schema() -> Dict[str, ParamSchema]:
+    "``dict[param: ParamSchema]`` of every config parameter. The package resource is read once per process."
+    # -- Using import_resources module to access resources 
+    # -- once the project has been compiled into an executable.
+    # -- This modele will search the resources path considering 
+    # -- package root via __init__ modules.
+    with import_resources.open_text(consts.PARAM_DECLS_RESOURCE[0], consts.PARAM_DECLS_RESOURCE[1], encoding="utf-8") as fp:
+        params = json.load(fp)
+    return {param: ParamSchema(param, info["default"], info["comment"]) for param, info in params.items()}
 
 
 class Config:
@@ -37,16 +107,14 @@ def _process_dict_data(self) -> Dict[str, Tuple[str, str]]:
         "Devuelve un diccinario  ``dict[param:(value,comment)]`` tomando a partir de los parametros requeridos por ``QAutoLinguist``" 
         
         
-        with import_resources.open_text(consts.PARAM_DECLS_RESOURCE[0], consts.PARAM_DECLS_RESOURCE[1], encoding="utf-8") as fp:
-            params = json.load(fp)  
-        # -- Importamos el diccionario estatico que contiene los comentarios, es de la forma dict[param: (comment, default)] --
+        # -- Usamos el schema compilado que contiene los comentarios, es de la forma dict[param: ParamSchema(default, comment)] --
         # -- default es el valor por defecto que da QAutoLinguist.
         return {
             param: (
-                helpers.stringfy(param_info['default']),
-                helpers.fit_string(param_info['comment'], split_size=75, preffix="#"),
+                helpers.stringfy(schema.default),
+                helpers.fit_string(schema.comment, split_size=75, preffix="#"),
             )
-            for param, param_info in params.items()
+            for param, schema in compiled_schema().items()
         }
 
     def _format_dict_data(self) -> Dict[str, str]:
@@ -67,54 +135,6 @@ def _format_dict_data(self) -> Dict[str, str]:
     def _process_template(self) -> str:
         return INI_FILE_TEMPLATE.format(**self._format_dict_data())   
     
-    def _conv_value_type(self, raw, original) -> Union[str, int, float, bool, tuple, list, None]:
-        """
-        This function gets a string and tries to convert into a python valid format type and tries to convert to python datatype        
-        NOTE: ``This function actually converts that types specified below:``
-        - ``List, Tuple, Set``
-        - ``bool, str, int, float, complex``
-        - [NotImplemented] ``pathlib.Path``
-        
-        ### Raises:
-        - ``ConfigWrongParamFormat``: If some value in configuration file was not able to convert to its original type.
-        """
-        raw = raw.strip().lower()
-        converter = None
-
-        if not raw:   
-            return None
-        if original is None:
-            return raw or None
-        if isinstance(original, str):
-            return raw 
-
-        if isinstance(original, bool):
-            positive_cases = {"true", "t", "on", "yes", "1"}
-            negative_cases = {"false", "f", "off", "no", "0"}
-            if raw in positive_cases:
-                return True
-            if raw in negative_cases:
-                return False
-            else: 
-                raise exceptions.ConfigWrongParamFormat(
-                    f"Failed trying to format {raw!r} into a bool type, valid boolean formats are {positive_cases} or {negative_cases}"
-                )  # raise specific exceptions when refering to booleans to show valid and invalid types.
-                
-        if isinstance(original, int):
-            converter = int     # raises ValueError on failure
-        elif isinstance(original, float):
-            converter = float  # raises ValueError on failure
-        elif isinstance(original, (list, tuple)):
-            converter = literal_eval           # para convertir listas y otras estructuras de datos de str a su tipo original
-            # raises SyntaxError on failure
-            
-        if converter is None:
-            raise exceptions.ConfigWrongParamFormat(
-                "Given object was not able to convert. Reason: No implemented type convertion."
-            )
-        
-        return converter(raw)
-
     def _check_missing_params(self, data: Dict[str, str]) -> None:
         """
         Toma un diccionario y comprueba que todas las llaves tengan un valor no nulo
@@ -134,14 +154,7 @@ def _process_read(self) -> Dict[str, Any]:
         - ``ConfigWrongParamFormat``: If some value in configuration file was not able to convert to its original type.
         - ``UncompletedConfig``: If some parameter in ``Required`` section is missing.
         """
-        
-        # -- Using import_resources module to access resources 
-        # -- once the project has been compiled into an executable.
-        # -- This modele will search the resources path considering 
-        # -- package root via __init__ modules.
-        with import_resources.open_text(consts.PARAM_DECLS_RESOURCE[0], consts.PARAM_DECLS_RESOURCE[1], encoding="utf-8") as fp:
-            params = json.load(fp)  
-            
+        schema = compiled_schema()
         raw_data = self._get_dict_from_load() # dict[section: {option1:value, option2:value, ...}]
         d  = {}
         
@@ -150,7 +163,7 @@ def _process_read(self) -> Dict[str, Any]:
         for section, options in raw_data.items():              
             for key,value in options.items():
                 try:
-                    d[key] = self._conv_value_type(value, params[key]["default"])  # value, type(original value), since raw values were converted to str.
+                    d[key] = schema[key].parse(value)  # converter precomputed from the type of the default value
                 except exceptions.ConfigWrongParamFormat as e:
                     raise e from None
         return d
@@ -222,4 +235,29 @@ def load_config(self, loc: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
         raise exceptions.MissingConfigFile("Unable to find Config file. Create a config file with Config.create() or pass a valid path.") # No se ha encontrado el archivo, se deberá pasar la ruta en este caso.
             
        
-            
\ No newline at end of file
+            
+
+    @classmethod
+    def load_many(
+        cls, 
+        locs: Iterable[Union[str, Path]], 
+        *, 
+        errors: Optional[Dict[Path, Exception]] = None
+    ) -> Dict[Path, Dict[str, Any]]:
+        """
+        Loads several configuration files, each one with its own parser (``ConfigParser.read`` merges files) and 
+        the schema compiled once. Returns ``dict[resolved path: content]``.
+        
+        When ``errors`` is given, files that cannot be loaded are stored there instead of raising, so a batch 
+        is not stopped by one broken file.
+        """
+        contents = {}
+        for loc in locs:
+            path = Path(loc).resolve()
+            try:
+                contents[path] = cls().load_config(path)
+            except (exceptions.QALBaseException, configparser.Error, KeyError, ValueError, SyntaxError, OSError) as e:
+                if errors is None:
+                    raise
+                errors[path] = e
+        return contents
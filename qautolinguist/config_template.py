@@ -47,6 +47,12 @@
 {translatables_folder_comment}
 {translatables_folder}= {translatables_folder_default}
         
+{translatable_format_comment}
+{translatable_format}= {translatable_format_default}
+
+{engine_comment}
+{engine}= {engine_default}
+
 {use_default_on_failure_comment}
 {use_default_on_failure}= {use_default_on_failure_default}     
 
@@ -61,6 +67,24 @@
 
 {verbose_comment}
 {verbose}= {verbose_default}   
+
+{metrics_report_comment}
+{metrics_report}= {metrics_report_default}
+
+{quality_check_comment}
+{quality_check}= {quality_check_default}
+
+{verify_translations_comment}
+{verify_translations}= {verify_translations_default}
+
+{checkpoint_size_comment}
+{checkpoint_size}= {checkpoint_size_default}
+
+{failover_engines_comment}
+{failover_engines}= {failover_engines_default}
+
+{routing_weights_comment}
+{routing_weights}= {routing_weights_default}
 """
 
 # =============================   INTERNAL    ====================================================
@@ -89,6 +89,10 @@ class TranslationFailed(QALTranslatorException):
 class TranslatorConnectionError(QALTranslatorException):
     "Exception raised when failed to connect/access to the server."
     pass
+
+class InvalidEngine(QALTranslatorException):
+    "Exception raised when the requested translation engine is not registered in ``translators.engines.__engines__``"
+    pass
      
 class ConfigFileAlreadyCreated(QALConfigException):
     "Exception raised when trying to create/initialize a file that already exists"
@@ -98,7 +102,11 @@ class ConfigWrongParamFormat(QALConfigException):
     "Exception raised when an unexpected error is raised during the conversion of config file params to python types"
     pass
 
-class TOMLConversionError(QALBaseException):
+class TranslatableError(QALBaseException):
+    "Exception raised when a translatable file cannot be written or read in its format."
+    pass
+
+class TOMLConversionError(TranslatableError):
     "Exception raised when trying to convert any python object into a TOML file format."
     pass
 
@@ -1,6 +1,9 @@
+import errno
 import shutil
 import os
-from typing import Optional, Union
+import itertools
+import threading
+from typing import Dict, IO, Iterator, Optional, Set, Tuple, Union
 from pathlib import Path
 from contextlib import contextmanager
 from qautolinguist.debugstyles import DebugLogs
@@ -48,9 +51,87 @@ def stringfy(obj):
         return str(obj).lower()     # make booleans lowercase to be recognizable to config file using configparser.getboolean()
     return "" if isinstance(obj, type(None)) else str(obj)
 
+_FICLONE = 0x40049409          # linux/fs.h: _IOW(0x94, 9, int)
+_COPY_CHUNK = 1 << 30
+_unsupported: Set[Tuple[str, int]] = set()      # (method, st_dev) of the filesystems where a staging method failed
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    "Copy-on-write clone of ``src`` (btrfs, xfs, bcachefs...): no data is copied until one of the files changes."
+    import fcntl      # POSIX only
+    
+    with open(src, mode="rb") as src_fp, open(dst, mode="wb") as dst_fp:
+        fcntl.ioctl(dst_fp.fileno(), _FICLONE, src_fp.fileno())
+
+
+def _copy_file_range(src: Path, dst: Path) -> None:
+    """
+    In-kernel copy, no user-space buffers. Recent kernels clone the blocks themselves when the filesystem can.
+    
+    ### Raises:
+        - ``OSError`` (``EINVAL``): If the kernel stops copying before the end of ``src`` (filesystems that report 
+          a wrong size or do not support it), so ``stage_copy()`` falls back to the next method.
+    """
+    with open(src, mode="rb") as src_fp, open(dst, mode="wb") as dst_fp:
+        size = remaining = os.fstat(src_fp.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src_fp.fileno(), dst_fp.fileno(), min(remaining, _COPY_CHUNK))
+            if copied == 0:
+                raise OSError(errno.EINVAL, f"copy_file_range stopped after {size - remaining} of {size} bytes", str(src))
+            remaining -= copied
+
+
+def _hardlink(src: Path, dst: Path) -> None:
+    os.link(src, dst)
+
+
+_STAGING_METHODS = (
+    ("hardlink", _hardlink),
+    ("reflink", _reflink),
+    ("copy_file_range", _copy_file_range),
+)
+_FALLBACK_ERRORS = {errno.EXDEV, errno.EPERM, errno.EACCES, errno.EINVAL, errno.ENOTTY, errno.EOPNOTSUPP, errno.ENOSYS}
+_FILE_ERRORS = {errno.EMLINK}       # limits of one file (link count), the method still works for the others
+
+
+def stage_copy(src: Union[str, Path], dst: Union[str, Path], *, link: bool = False) -> str:
+    """
+    Copies ``src`` into ``dst`` (replaced if it exists) with the cheapest method available and returns its name:
+        - ``hardlink``: only with ``link=True``. ``dst`` is the same file as ``src``, nothing is copied. Only for copies that
+          are never modified in place: replacing them as a whole (``atomic_write``) breaks the link and leaves ``src`` untouched.
+        - ``reflink``: copy-on-write clone, where the filesystem supports it.
+        - ``copy_file_range``: in-kernel copy (Linux).
+        - ``copy``: ``shutil.copyfile`` (sendfile on Linux).
+    Methods that fail on a filesystem are not tried again on it; a file over its link limit (``EMLINK``) is only copied
+    itself. Metadata is not copied.
+    """
+    src, dst = Path(src), Path(dst)
+    device = src.stat().st_dev
+    
+    for name, method in _STAGING_METHODS:
+        if (name == "hardlink" and not link) or (name, device) in _unsupported:
+            continue
+        if (name == "reflink" and os.name != "posix") or (name == "copy_file_range" and not hasattr(os, "copy_file_range")):
+            continue
+        try:
+            dst.unlink(missing_ok=True)
+            method(src, dst)
+            return name
+        except OSError as e:
+            if e.errno in _FILE_ERRORS:
+                continue
+            if e.errno not in _FALLBACK_ERRORS:
+                raise
+            _unsupported.add((name, device))
+    
+    shutil.copyfile(src, dst)
+    return "copy"
+
+
 def make_temp_copy(file_: Union[str, Path], deep_copy: bool = True):
     """
     Makes a temporally file with the content of ``file_`` and return temp file path.
+    The content is staged with ``stage_copy()`` (reflinks where the filesystem supports them).
     
     ### Params:
     @param deep_copy: When True, copy metadata, otherwise only the content will be copied.
@@ -58,10 +139,9 @@ def make_temp_copy(file_: Union[str, Path], deep_copy: bool = True):
     file_ = file_ if isinstance(file_, Path) else Path(file_)
     temp_file_path = file_.with_name(f"{file_.stem}.temp")
     
+    stage_copy(file_, temp_file_path)
     if deep_copy:
-        shutil.copy(file_, temp_file_path)
-    else:
-        shutil.copyfile(temp_file_path, file_) 
+        shutil.copystat(file_, temp_file_path)
         
     return temp_file_path
 
@@ -75,46 +155,158 @@ def remove_temp_copy(temp: Union[str, Path], file_: Union[str, Path], deep_copy:
     file_ = file_ if isinstance(file_, Path) else Path(file_)
     
     if deep_copy:
-        shutil.copy(temp, file_)
+        os.replace(temp, file_)         # temp is discarded anyway: renamed instead of copied
     else:
-        shutil.copyfile(temp, file_)  
-    os.remove(temp)
+        shutil.copyfile(temp, file_)    # file_ keeps its inode and metadata
+        os.remove(temp)
     
     return file_
 
+def _fsync_file(path: Union[str, Path]) -> None:
+    "Windows only flushes handles with write access (EBADF otherwise). POSIX does not need it, so read-only files can be synced there."
+    with open(path, mode="rb" if os.name == "posix" else "rb+") as fp:
+        os.fsync(fp.fileno())
+
+
+def _fsync_dir(path: Union[str, Path]) -> None:
+    "Makes the renames done in the folder ``path`` durable. Not supported on every platform (Windows), ignored there."
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SyncBatch:
+    """
+    Files written by ``atomic_path``/``atomic_write`` with ``sync=batch`` are renamed over their targets as soon as
+    they are complete and made durable together by ``sync()`` (or when a ``with batch:`` block ends): every file is
+    fsynced and then every folder once, instead of syncing each write as it happens.
+    
+    Usage:
+        with SyncBatch() as batch:          # a build stage
+            with atomic_write(path, "w", sync=batch) as fp:
+                ...
+    """
+
+    def __init__(self) -> None:
+        self._paths: Dict[Path, None] = {}
+        self._lock = threading.Lock()      # files may be written by worker threads (lrelease)
+
+    def add(self, path: Union[str, Path]) -> None:
+        with self._lock:
+            self._paths[Path(path)] = None
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def sync(self) -> int:
+        "fsyncs the pending files and their folders. Returns the number of files synced (removed ones are skipped)."
+        with self._lock:
+            paths, self._paths = list(self._paths), {}
+        synced = 0
+        for path in paths:
+            try:
+                _fsync_file(path)
+            except FileNotFoundError:
+                continue
+            synced += 1
+        for folder in dict.fromkeys(path.parent for path in paths):
+            _fsync_dir(folder)
+        return synced
+
+    def __enter__(self) -> "SyncBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.sync()
+
+
+_temp_ids = itertools.count()
+
+
+@contextmanager
+def atomic_path(file_path: Union[str, Path], *, sync: Optional[SyncBatch] = None) -> Iterator[Path]:
+    """
+    Yields a temporary path in the folder of ``file_path`` for writers that take a path (lrelease, ElementTree...).
+    When the block ends without errors the temporary file replaces ``file_path`` in one rename (keeping the permissions of
+    the replaced file), so readers and interrupted builds never see a partially written file; otherwise it is removed
+    and ``file_path`` is left untouched.
+    
+    Without ``sync`` the file is fsynced before the rename and its folder after it. With a ``SyncBatch`` both are
+    deferred to ``sync.sync()``.
+    """
+    file_path = Path(file_path)
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{next(_temp_ids)}.tmp")
+    try:
+        yield temp_path
+        if sync is None:
+            _fsync_file(temp_path)              # before copymode: the temporary file is still writable
+        if file_path.exists():
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    if sync is None:
+        _fsync_dir(file_path.parent)
+    else:
+        sync.add(file_path)
+
+
+@contextmanager
+def atomic_write(file_path: Union[str, Path], mode: str = "w", *, sync: Optional[SyncBatch] = None, **kwargs) -> Iterator[IO]:
+    """
+    ``open(file_path, mode, **kwargs)`` that writes into a temporary file, see ``atomic_path()``. 
+    Only for modes that write a file from scratch (``w``, ``wb``...).
+    """
+    with atomic_path(file_path, sync=sync) as temp_path, open(temp_path, mode, **kwargs) as fp:
+        yield fp
+
+
 @contextmanager
 def safe_open(file_path: Union[str, Path], both_paths=False, **kwargs):
     """
     @param kwargs can be any parameter that you can pass to ``builtins.open()`` function.
     
     Usage:
-        with safe_open(_file) as file_path:
-            # Solo obtén la ruta de file_path
-            # En caso de excepción, el contenido original será restaurado
+        with safe_open(_file, mode="w") as file_io:
+            # Escribe en file_io
+            # En caso de excepción, el contenido original no se modifica
 
-        with safe_open(_file, return_both=True) as (file_path, temp_file_path):
-            # Obtén ambas rutas: file_path y temp_file_path
-            # En caso de excepción, el contenido original será restaurado
+        with safe_open(_file, both_paths=True, mode="a") as (file_io, temp_file_path):
+            # file_io escribe en temp_file_path, que reemplaza a _file al terminar el bloque
+    
+    Writes go to a temporary file that replaces ``file_path`` when the block ends (``atomic_path()``), so nothing has to 
+    be restored on failure. The file is only copied first for modes that keep its content (``a``, ``r+``...).
+    Read-only modes (``r``, ``rb``) open ``file_path`` itself.
     """
     file_path = file_path if isinstance(file_path, Path) else Path(file_path)
-    temp_file_path = make_temp_copy(file_path)
-    original_io   = open(file_path, **kwargs)
-    temp_io       = open(temp_file_path, **kwargs)
+    mode = kwargs.get("mode", "r")
     
-    try:
-        if both_paths:
-            yield original_io, temp_io
-        else:
-            yield original_io
-    except Exception as e:
-        print(DebugLogs.error("Used temporally file to restore the content."))
-        remove_temp_copy(temp_file_path, file_path) # restaura el contenido de temp a file y borra temp
-        raise e
-    finally:
-        original_io.close()
-        if temp_file_path:
-            temp_io.close()
-        os.remove(temp_file_path)         # En cualquier caso, elimina el archivo temporal
+    if not any(flag in mode for flag in "wax+"):
+        with open(file_path, **kwargs) as file_io:
+            yield (file_io, file_path) if both_paths else file_io
+        return
+    
+    with atomic_path(file_path) as temp_file_path:
+        if not any(flag in mode for flag in "wx") and file_path.exists():
+            shutil.copyfile(file_path, temp_file_path)
+        try:
+            with open(temp_file_path, **kwargs) as temp_io:
+                yield (temp_io, temp_file_path) if both_paths else temp_io
+        except Exception:
+            print(DebugLogs.error(f"Unable to write {file_path}, its content was not modified."))
+            raise
         
 
 def process_loc(loc: Union[str, Path], dir_okay: bool = False):
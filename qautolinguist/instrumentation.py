@@ -0,0 +1,228 @@
+"Light-weight build instrumentation: per-stage and per-locale timings, counters and pluggable span hooks."
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+
+__all__: List[str] = ["Span", "BuildInstrumentation", "opentelemetry_hook"]
+
+
+SpanHook = Callable[[str, "Span"], None]     # hook(event, span) where event is "start" or "end"
+CounterHook = Callable[[str, float, Optional[str]], None]      # hook(name, value, locale) after every count()
+
+
+class Span:
+    """
+    A timed section of the build (a stage, or a stage applied to one locale).
+    Follows the OpenTelemetry naming: ``name``, ``attributes``, ``parent``, epoch ``start_ns``/``end_ns``.
+    """
+
+    __slots__ = ("name", "attributes", "parent", "start_ns", "end_ns", "_wall_start", "_wall_end", "_cpu_start", "_cpu_end")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"] = None):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self._wall_end: Optional[float] = None
+        self._cpu_end: Optional[float] = None
+
+    def finish(self) -> None:
+        self._wall_end = time.perf_counter()
+        self._cpu_end = time.thread_time()
+        self.end_ns = time.time_ns()
+
+    @property
+    def locale(self) -> Optional[str]:
+        return self.attributes.get("locale")
+
+    @property
+    def wall(self) -> float:
+        "Elapsed wall time in seconds."
+        return (self._wall_end if self._wall_end is not None else time.perf_counter()) - self._wall_start
+
+    @property
+    def cpu(self) -> float:
+        "CPU time in seconds consumed by the thread that ran the span."
+        return (self._cpu_end if self._cpu_end is not None else time.thread_time()) - self._cpu_start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent is not None else None,
+            "attributes": self.attributes,
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+        }
+
+
+class BuildInstrumentation:
+    """
+    Collects spans and counters during a build and renders them as a JSON report.
+
+    Usage:
+        instr = BuildInstrumentation()
+        with instr.stage("translate", locale="es"):
+            ...
+            instr.count("requests", locale="es")
+        instr.dump("build_report.json")
+
+    Hooks added with ``add_hook`` are called as ``hook("start" | "end", span)``, e.g. ``opentelemetry_hook()``.
+    Counter hooks (``add_counter_hook``) are called as ``hook(name, value, locale)`` after each ``count()``, e.g. ``progress.BuildProgress``.
+    """
+
+    def __init__(self, hooks: Optional[List[SpanHook]] = None) -> None:
+        self._hooks: List[SpanHook] = list(hooks or [])
+        self._counter_hooks: List[CounterHook] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()       # per-thread stack of open spans
+        self.spans: List[Span] = []
+        self.counters: Dict[str, float] = {}
+        self.locale_counters: Dict[str, Dict[str, float]] = {}
+        self._sections: Dict[str, Callable[[], Any]] = {}
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    def add_hook(self, hook: SpanHook) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: SpanHook) -> None:
+        self._hooks.remove(hook)
+
+    def add_counter_hook(self, hook: CounterHook) -> None:
+        self._counter_hooks.append(hook)
+
+    def remove_counter_hook(self, hook: CounterHook) -> None:
+        self._counter_hooks.remove(hook)
+
+    def attach(self, name: str, provider: Callable[[], Any]) -> None:
+        "Adds a section ``name`` to the report whose content is ``provider()`` at report time."
+        self._sections[name] = provider
+
+    def current_span(self) -> Optional[Span]:
+        "Innermost open span of the calling thread, if any."
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def current_locale(self) -> Optional[str]:
+        "Locale of the innermost open span of the calling thread that has one."
+        for span in reversed(self._stack()):
+            if span.locale is not None:
+                return span.locale
+        return None
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _emit(self, event: str, span: Span) -> None:
+        for hook in self._hooks:
+            hook(event, span)
+
+    @contextmanager
+    def stage(self, name: str, **attributes) -> Iterator[Span]:
+        "Times the enclosed block. Nested stages record the enclosing one as parent."
+        stack = self._stack()
+        span = Span(name, attributes, stack[-1] if stack else None)
+        stack.append(span)
+        self._emit("start", span)
+        try:
+            yield span
+        finally:
+            span.finish()
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+            self._emit("end", span)
+
+    def count(self, name: str, value: float = 1, *, locale: Optional[str] = None) -> None:
+        "Increments counter ``name`` globally and, if given, for ``locale``."
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            if locale is not None:
+                counters = self.locale_counters.setdefault(locale, {})
+                counters[name] = counters.get(name, 0) + value
+        for hook in self._counter_hooks:
+            hook(name, value, locale)
+
+    def report(self) -> Dict[str, Any]:
+        "Returns a JSON-serializable dict with totals, per-stage and per-locale figures."
+        stages: Dict[str, Dict[str, float]] = {}
+        locales: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+            locale_counters = {locale: dict(c) for locale, c in self.locale_counters.items()}
+
+        for span in spans:
+            if span.locale is None:
+                totals = stages.setdefault(span.name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+            else:
+                locale_stages = locales.setdefault(span.locale, {"stages": {}})["stages"]
+                totals = locale_stages.setdefault(span.name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+            totals["wall"] += span.wall
+            totals["cpu"] += span.cpu
+            totals["calls"] += 1
+
+        for locale, counts in locale_counters.items():
+            locales.setdefault(locale, {"stages": {}})["counters"] = counts
+
+        wall = time.perf_counter() - self._started
+        characters = counters.get("characters", 0)
+        sections = {name: provider() for name, provider in self._sections.items()}
+        return {
+            **sections,
+            "total": {
+                "wall": round(wall, 6),
+                "cpu": round(time.process_time() - self._cpu_started, 6),
+                "characters_per_second": round(characters / wall, 3) if wall else 0.0,
+            },
+            "stages": stages,
+            "locales": locales,
+            "counters": counters,
+            "spans": [span.to_dict() for span in spans],
+        }
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        "Writes ``report()`` as indented JSON into ``path``."
+        path = Path(path)
+        with open(path, mode="w", encoding="utf-8") as fp:
+            json.dump(self.report(), fp, indent=4)
+        return path
+
+
+def opentelemetry_hook(tracer: Any = None) -> SpanHook:
+    """
+    Returns a hook that mirrors build spans as OpenTelemetry spans.
+    Requires ``opentelemetry-api`` (optional dependency). If ``tracer`` is None, ``trace.get_tracer("qautolinguist")`` is used.
+    """
+    try:
+        from opentelemetry import trace
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError("opentelemetry_hook requires 'opentelemetry-api'. Install it with 'pip install opentelemetry-api'") from None
+
+    tracer = tracer or trace.get_tracer("qautolinguist")
+    open_spans: Dict[int, Any] = {}
+
+    def hook(event: str, span: Span) -> None:
+        if event == "start":
+            parent = open_spans.get(id(span.parent)) if span.parent is not None else None
+            context = trace.set_span_in_context(parent) if parent is not None else None
+            attributes = {key: value for key, value in span.attributes.items() if value is not None}
+            open_spans[id(span)] = tracer.start_span(span.name, context=context, attributes=attributes, start_time=span.start_ns)
+        else:
+            otel_span = open_spans.pop(id(span), None)
+            if otel_span is not None:
+                otel_span.set_attribute("cpu_time", span.cpu)
+                otel_span.end(end_time=span.end_ns)
+
+    return hook
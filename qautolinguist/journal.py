@@ -0,0 +1,102 @@
+"""
+Translation journal of a build.
+
+Every chunk of sources translated by a build is appended to ``<cache_dir>/.qal_cache/journal.jsonl`` and synced
+to disk before the next chunk is sent, one JSON object per line::
+
+    {"engine": "google", "default_locale": "en", "memory": "es", "sources": [...], "translations": [...]}
+
+``memory`` is the key of the translation memory the chunk belongs to (the locale, or ``<locale>><default_locale>``
+for back-translations). A failed or interrupted build keeps its journal; ``build run --resume`` loads it into the
+translation memory, so only the chunks that were not completed are sent to the engine again. A successful build
+removes it. A line cut by a crash is ignored.
+"""
+
+import json
+import os
+import threading
+
+from pathlib import Path
+from qautolinguist.manifest import BuildManifest
+from typing import Dict, IO, List, Optional, Union
+
+
+__all__: List[str] = ["BuildJournal"]
+
+
+class BuildJournal:
+    """
+    Usage:
+        journal = BuildJournal(cache_dir)
+        journal.load("google", "en")        # dict[memory key: dict[source: translation]] of the previous build
+        journal.append("es", sources, translations, engine="google", default_locale="en")
+        journal.discard()                   # build completed
+
+    Appends are serialized, the forward and back-translation threads of a build share the journal.
+    """
+
+    FILENAME = "journal.jsonl"
+
+    def __init__(self, cache_dir: Union[str, Path], *, folder_name: str = BuildManifest.FOLDER_NAME):
+        self.root = Path(cache_dir) / folder_name
+        self._fp: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+        self.chunks = 0         # chunks appended by this instance
+
+    @property
+    def path(self) -> Path:
+        return self.root / self.FILENAME
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self, engine: str, default_locale: str) -> Dict[str, Dict[str, str]]:
+        "Translations journaled by builds of ``engine`` and ``default_locale``, per memory key. Other entries are ignored."
+        memory: Dict[str, Dict[str, str]] = {}
+        try:
+            fp = open(self.path, mode="r", encoding="utf-8")
+        except FileNotFoundError:
+            return memory
+        with fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:          # last line cut by a crash
+                    continue
+                if entry.get("engine") != engine or entry.get("default_locale") != default_locale:
+                    continue
+                if len(entry["sources"]) == len(entry["translations"]):
+                    memory.setdefault(entry["memory"], {}).update(zip(entry["sources"], entry["translations"]))
+        return memory
+
+    def append(self, memory_key: str, sources: List[str], translations: List[str], *, engine: str, default_locale: str) -> None:
+        "Appends a translated chunk and waits until it is on disk."
+        line = json.dumps(
+            {"engine": engine, "default_locale": default_locale, "memory": memory_key, "sources": sources, "translations": translations},
+            ensure_ascii=False,
+        )
+        with self._lock:
+            if self._fp is None:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._fp = open(self.path, mode="a", encoding="utf-8")
+            self._fp.write(line + "\n")
+            self._fp.flush()
+            os.fsync(self._fp.fileno())
+            self.chunks += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+    def discard(self) -> None:
+        "Closes and removes the journal."
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __repr__(self) -> str:
+        return f"BuildJournal({self.path})"
@@ -0,0 +1,200 @@
+"""
+Content-addressed build manifest.
+
+The manifest is the cache of a build: it records the hash of every file involved (source, reference .ts,
+per-locale .ts, translatable and .qm), a hash per message and translation, and the engine used. Later builds
+and ``compose_qm_files`` compare it with the files on disk to skip untouched locales and detect stale artefacts.
+
+Layout (``<cache_dir>/.qal_cache/manifest.json``)::
+
+    {
+        "version": 1,
+        "engine": "google",
+        "config": {"qm_folder": ..., "default_locale": ..., "debug": ..., "verbose": ...},
+        "source": {"path": ..., "hash": ...},
+        "reference": {"path": ..., "hash": ..., "messages": [message_hash, ...]},
+        "locales": {
+            "es": {
+                "ts": {"path": ..., "hash": ...},
+                "translatable": {"path": ..., "hash": ..., "mtime": ...},
+                "qm": {"path": ..., "hash": ...},
+                "translations": [translation_hash, ...]
+            }
+        }
+    }
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from qautolinguist.consts import CMD_CWD
+from qautolinguist.helpers import atomic_write
+
+
+__all__: List[str] = ["BuildManifest", "hash_file", "hash_text"]
+
+
+_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path: Union[str, Path]) -> Optional[str]:
+    "sha256 of the file content, read in chunks. Returns None if the file does not exist."
+    digest = hashlib.sha256()
+    try:
+        with open(path, mode="rb") as fp:
+            for chunk in iter(lambda: fp.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_text(text: Optional[str]) -> str:
+    "Short (64 bits) hash of a message or translation."
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=8).hexdigest()
+
+
+class BuildManifest:
+    """
+    Content-addressed record of a build. See module docstring for the layout.
+
+    Usage:
+        manifest = BuildManifest.load(cache_dir)        # empty manifest if none was saved
+        if manifest.locale_is_fresh("es"): ...          # qm on disk matches what was built
+        manifest.record_file("es", "qm", qm_path)
+        manifest.save()
+    """
+
+    VERSION = 1
+    FILENAME = "manifest.json"
+    FOLDER_NAME = ".qal_cache"
+
+    def __init__(self, cache_dir: Union[str, Path] = CMD_CWD, data: Optional[Dict[str, Any]] = None, *, folder_name: str = FOLDER_NAME):
+        self.root = Path(cache_dir) / folder_name
+        self.data: Dict[str, Any] = data if data is not None else {"version": self.VERSION, "locales": {}}
+
+    @property
+    def path(self) -> Path:
+        return self.root / self.FILENAME
+
+    @classmethod
+    def load(cls, cache_dir: Union[str, Path] = CMD_CWD, *, folder_name: str = FOLDER_NAME) -> "BuildManifest":
+        "Loads the manifest in ``cache_dir``. Returns an empty one if missing or written by another manifest version."
+        manifest = cls(cache_dir, folder_name=folder_name)
+        try:
+            with open(manifest.path, mode="r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return manifest
+        if data.get("version") == cls.VERSION:
+            manifest.data = data
+        return manifest
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def save(self) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.path, mode="w", encoding="utf-8") as fp:       # a build interrupted while saving keeps the previous manifest
+            json.dump(self.data, fp, indent=4)
+        return self.path
+
+    #& -- Top-level entries --
+    @property
+    def engine(self) -> Optional[str]:
+        return self.data.get("engine")
+
+    @engine.setter
+    def engine(self, name: str) -> None:
+        self.data["engine"] = name
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self.data.setdefault("config", {})
+
+    @property
+    def locales(self) -> Dict[str, Dict[str, Any]]:
+        return self.data.setdefault("locales", {})
+
+    def locale(self, locale: str) -> Dict[str, Any]:
+        return self.locales.setdefault(locale, {})
+
+    def record_source(self, path: Path) -> None:
+        self.data["source"] = {"path": str(path), "hash": hash_file(path)}
+
+    def record_reference(self, path: Path, sources: Iterable[str]) -> None:
+        self.data["reference"] = {
+            "path": str(path),
+            "hash": hash_file(path),
+            "messages": [hash_text(source) for source in sources],
+        }
+
+    @property
+    def reference_hash(self) -> Optional[str]:
+        return self.data.get("reference", {}).get("hash")
+
+    @property
+    def message_hashes(self) -> List[str]:
+        return self.data.get("reference", {}).get("messages", [])
+
+    #& -- Per-locale entries --
+    def record_file(self, locale: str, kind: str, path: Path) -> str:
+        "Records ``path`` hash (and mtime) as the ``kind`` (ts, translatable, qm) artefact of ``locale``. Returns the hash."
+        path = Path(path)
+        file_hash = hash_file(path)
+        entry = {"path": str(path.resolve()), "hash": file_hash}
+        if kind == "translatable":
+            entry["mtime"] = path.stat().st_mtime_ns
+        self.locale(locale)[kind] = entry
+        return file_hash
+
+    def record_translations(self, locale: str, translations: Iterable[str]) -> None:
+        self.locale(locale)["translations"] = [hash_text(translation) for translation in translations]
+
+    def translation_hashes(self, locale: str) -> List[str]:
+        return self.locales.get(locale, {}).get("translations", [])
+
+    def path_of(self, locale: str, kind: str) -> Optional[Path]:
+        entry = self.locales.get(locale, {}).get(kind)
+        return Path(entry["path"]) if entry else None
+
+    def file_changed(self, locale: str, kind: str, path: Optional[Path] = None) -> bool:
+        """
+        True if the ``kind`` artefact of ``locale`` differs from the recorded one (or was never recorded / is missing).
+        mtime is checked first so unchanged translatables are not hashed.
+        """
+        entry = self.locales.get(locale, {}).get(kind)
+        if not entry:
+            return True
+        path = Path(path or entry["path"])
+        if not path.exists():
+            return True
+        if "mtime" in entry and path.stat().st_mtime_ns == entry["mtime"]:
+            return False
+        return hash_file(path) != entry["hash"]
+
+    def locale_is_fresh(self, locale: str, reference_hash: Optional[str] = None, engine: Optional[str] = None) -> bool:
+        """
+        True when ``locale`` .qm was built from the same reference (and engine) and is still on disk unmodified.
+        """
+        if reference_hash is not None and reference_hash != self.reference_hash:
+            return False
+        if engine is not None and engine != self.engine:
+            return False
+        return not self.file_changed(locale, "qm")
+
+    def stale_locales(self) -> List[str]:
+        "Locales whose recorded .qm is missing or was modified outside the build."
+        return [locale for locale in self.locales if self.file_changed(locale, "qm")]
+
+    #& -- Legacy CacheImpl view --
+    def nodes(self) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        ``dict[locale: (ts_path, translatable_path)]`` as stored by the former ``nodes`` cache file.
+        Paths not recorded (clean builds remove the .ts and translatables) are None.
+        """
+        return {
+            locale: (entry.get("ts", {}).get("path"), entry.get("translatable", {}).get("path"))
+            for locale, entry in self.locales.items()
+        }
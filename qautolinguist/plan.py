@@ -0,0 +1,186 @@
+"""
+Build plans.
+
+``BuildPlan`` describes what a build of a project would do without doing it: which locales are up to date in
+the build manifest and which ones would be rebuilt, how many messages and characters would be sent to the
+engine and an estimate of the requests needed. Nothing is translated, lupdate is not run and the network is
+not touched, so plans of many projects can be computed quickly by a scheduler to shard and prioritize builds.
+
+Sources are read from the reference .ts recorded in the manifest when the source file did not change since
+the last build (exact), or estimated from the source file itself otherwise (``.ts`` exact, ``.ui`` and ``.py``
+approximated, see ``estimate_sources``).
+"""
+
+import re
+import xml.etree.ElementTree as ET
+import qautolinguist.consts as consts
+
+from pathlib import Path
+from qautolinguist.catalog import Catalog
+from qautolinguist.manifest import BuildManifest, hash_file
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+__all__: List[str] = ["BuildPlan", "estimate_sources", "estimate_requests", "REQUEST_CHAR_LIMITS"]
+
+
+# characters accepted per request by each engine (None: offline, no requests)
+REQUEST_CHAR_LIMITS: Dict[str, Optional[int]] = {
+    "google": 5000,
+    "mymemory": 500,
+    "deepl": 5000,
+    "microsoft": 5000,
+    "failover": 5000,       # google first
+    "pseudo": None,
+}
+
+_PY_TR_RE = re.compile(r"""\b(?:tr|translate)\(\s*(?:["'][^"']*["']\s*,\s*)?(["'])((?:\\.|(?!\1).)*)\1""")
+
+
+def estimate_sources(source_file: Union[str, Path]) -> Tuple[List[str], bool]:
+    """
+    Translation sources of ``source_file`` without running lupdate, and whether they are exact.
+    - ``.ts``: every ``<message>`` (exact).
+    - ``.ui``: ``<string>`` elements not marked ``notr="true"`` (approximate).
+    - other files: string literals passed to ``tr()``/``translate()`` (approximate).
+    """
+    source_file = Path(source_file)
+    if source_file.suffix == ".ts":
+        return Catalog.from_ts(source_file).sources(), True
+    if source_file.suffix == ".ui":
+        strings = ET.parse(source_file).getroot().iter("string")
+        return [elem.text for elem in strings if elem.text and elem.get("notr") != "true"], False
+    text = source_file.read_text(encoding="utf-8", errors="replace")
+    return [match.group(2) for match in _PY_TR_RE.finditer(text)], False
+
+
+def estimate_requests(engine: str, texts: List[str]) -> int:
+    """
+    Requests needed to translate ``texts`` into one locale: the joined batch is sent at once when it fits in
+    the engine limit, otherwise the engine falls back to one request per text.
+    """
+    limit = REQUEST_CHAR_LIMITS.get(engine, 5000)
+    if limit is None or not texts:
+        return 0
+    joined = sum(map(len, texts)) + len(texts) - 1        # texts + separators
+    return 1 if joined <= limit else len(texts)
+
+
+class BuildPlan:
+    """
+    Usage:
+        plan = BuildPlan.from_config(".qal_config.ini")
+        plan.to_dict()          # JSON serializable
+        plan.stale              # locales that would be rebuilt
+
+    ``content`` are QAutoLinguist params (as returned by ``Config.load_config``).
+    """
+
+    __slots__ = ("content", "config_path", "manifest", "sources", "exact", "source_changed", "locales")
+
+    def __init__(self, content: Dict[str, Any], *, config_path: Optional[Path] = None):
+        self.content = content
+        self.config_path = config_path
+        cache_dir = content.get("cache_dir") or (config_path.parent if config_path is not None else consts.CMD_CWD)
+        self.manifest = BuildManifest.load(cache_dir)
+        self.sources, self.exact, self.source_changed = self._load_sources()
+        self.locales: Dict[str, Dict[str, Any]] = {locale: self._plan_locale(locale) for locale in self.target_locales}
+
+    @classmethod
+    def from_config(cls, config: Union[str, Path]) -> "BuildPlan":
+        "Plan of the project of ``config``. Relative paths in the file are resolved from its folder."
+        from qautolinguist.batch import BatchRunner     # imported here, batch imports qal
+
+        config = Path(config).resolve()
+        return cls(BatchRunner.load_project(config), config_path=config)
+
+    @property
+    def engine(self) -> str:
+        return self.content.get("engine") or "google"
+
+    @property
+    def default_locale(self) -> str:
+        return self.content.get("default_locale") or "en"
+
+    @property
+    def target_locales(self) -> List[str]:
+        return [locale for locale in self.content.get("available_locales") or [] if locale != self.default_locale]
+
+    @property
+    def stale(self) -> List[str]:
+        return [locale for locale, entry in self.locales.items() if entry["status"] == "stale"]
+
+    def _load_sources(self) -> Tuple[List[str], bool, bool]:
+        "``(sources, exact, source_changed)``: the recorded reference .ts is used while the source file is unchanged."
+        source_file = Path(self.content["source_file"])
+        recorded = self.manifest.data.get("source", {})
+        changed = not recorded or recorded.get("hash") != hash_file(source_file)
+        reference = self.manifest.data.get("reference", {}).get("path")
+        if not changed and reference and hash_file(reference) == self.manifest.reference_hash:
+            return Catalog.from_ts(reference).sources(), True, False
+        sources, exact = estimate_sources(source_file)
+        return sources, exact, changed
+
+    def _stale_reason(self, locale: str) -> Optional[str]:
+        "Why ``locale`` would be rebuilt, None if it is up to date (same rules as ``QAutoLinguist._fresh_locales``)."
+        manifest = self.manifest
+        if not manifest.exists():
+            return "no previous build"
+        if manifest.config.get("default_locale") != self.default_locale:
+            return "default locale changed"
+        if self.source_changed:
+            return "source changed"
+        if manifest.engine != self.engine:
+            return "engine changed"
+        if manifest.file_changed(locale, "qm"):
+            return "qm missing or modified"
+        if not self.content.get("clean", True) and (manifest.file_changed(locale, "ts") or manifest.file_changed(locale, "translatable")):
+            return "ts or translatable missing or modified"
+        return None
+
+    def _plan_locale(self, locale: str) -> Dict[str, Any]:
+        reason = self._stale_reason(locale)
+        unique = list(dict.fromkeys(self.sources)) if reason is not None else []
+        size = self.content.get("checkpoint_size", 200) or len(unique) or 1        # chunks sent by QAutoLinguist._translate_locale
+        requests = sum(estimate_requests(self.engine, unique[start:start + size]) for start in range(0, len(unique), size))
+        if self.content.get("verify_translations"):
+            requests *= 2           # back-translations are batched the same way
+        files = {}
+        for kind in ("ts", "translatable", "qm"):       # as recorded by the last build
+            path = self.manifest.path_of(locale, kind)
+            files[kind] = str(path) if path is not None else None
+        return {
+            "status": "fresh" if reason is None else "stale",
+            "reason": reason,
+            "messages": len(unique),
+            "characters": sum(map(len, unique)),
+            "requests": requests,
+            "files": files,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        stale = [self.locales[locale] for locale in self.stale]
+        return {
+            "config": str(self.config_path) if self.config_path is not None else None,
+            "source_file": str(self.content["source_file"]),
+            "engine": self.engine,
+            "default_locale": self.default_locale,
+            "sources": {
+                "messages": len(self.sources),
+                "unique": len(set(self.sources)),
+                "characters": sum(map(len, self.sources)),
+                "exact": self.exact,
+                "changed": self.source_changed,
+            },
+            "locales": self.locales,
+            "totals": {
+                "locales": len(self.locales),
+                "stale": len(stale),
+                "messages": sum(entry["messages"] for entry in stale),
+                "characters": sum(entry["characters"] for entry in stale),
+                "requests": {self.engine: sum(entry["requests"] for entry in stale)},
+            },
+        }
+
+    def __repr__(self) -> str:
+        return f"BuildPlan({self.content.get('source_file')}, {len(self.stale)}/{len(self.locales)} locales stale)"
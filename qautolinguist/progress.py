@@ -0,0 +1,230 @@
+"""
+Live progress of a build.
+
+``BuildProgress`` listens to the spans and counters of a ``BuildInstrumentation`` (the same events the metrics report
+is made of) and keeps a snapshot of the build: current stage and locale, messages resolved per locale (translated
+or taken from the translation memory), messages/s, requests/s, characters translated, cache hit rate, engine errors
+and the ETA of the translation. Snapshots are rendered by a ``ProgressRenderer``:
+
+    - ``bar``: one line redrawn on a terminal (a line per stage when the stream is not a terminal).
+    - ``jsonl``: one JSON object per line, for CI logs and tools.
+
+A build that is slow because it is throttled shows requests/s dropping and engine errors growing, while a big one
+keeps its rates and only has a long ETA.
+"""
+
+import json
+import sys
+import threading
+import time
+
+from qautolinguist.instrumentation import BuildInstrumentation, Span
+from typing import Any, Callable, Dict, IO, List, Optional, Type
+
+
+__all__: List[str] = ["BuildProgress", "ProgressRenderer", "TerminalRenderer", "JsonLinesRenderer", "RENDERERS", "get_renderer"]
+
+
+Snapshot = Dict[str, Any]
+
+_TRANSLATED = ("messages", "memory_hits")           # counters of the messages resolved by the translate stage
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+class ProgressRenderer:
+    "Receives the snapshots of a ``BuildProgress``. ``event`` is ``stage_start``, ``stage_end``, ``progress``, ``done`` or ``failed``."
+
+    def render(self, event: str, snapshot: Snapshot) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class TerminalRenderer(ProgressRenderer):
+    """
+    Single line redrawn in place::
+
+        [translate_translatables] es | [#######.............]  35% 420/1200 | 38.2 msg/s 1.4 req/s | 9,870 chars | hits 12% | ETA 00:20
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None, width: int = 20):
+        self.stream = stream if stream is not None else sys.stderr
+        self.width = width
+        self.tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._last_length = 0
+
+    def line(self, snapshot: Snapshot) -> str:
+        done, total = snapshot["done"], snapshot["total"]
+        ratio = done / total if total else 0.0
+        filled = int(ratio * self.width)
+        parts = [
+            f"[{snapshot['stage'] or 'build'}]{' ' + snapshot['locale'] if snapshot['locale'] else ''}",
+            f"[{'#' * filled}{'.' * (self.width - filled)}] {ratio:4.0%} {done}/{total}",
+            f"{snapshot['messages_per_second']:.1f} msg/s {snapshot['requests_per_second']:.1f} req/s",
+            f"{snapshot['characters']:,} chars",
+            f"hits {snapshot['cache_hit_rate']:.0%}",
+        ]
+        if snapshot["request_errors"]:
+            parts.append(f"{snapshot['request_errors']} errors")
+        if snapshot["state"] == "running":
+            parts.append(f"ETA {_format_seconds(snapshot['eta'])}")
+        else:
+            parts.append(f"{snapshot['state']} in {_format_seconds(snapshot['elapsed'])}")
+        return " | ".join(parts)
+
+    def render(self, event: str, snapshot: Snapshot) -> None:
+        line = self.line(snapshot)
+        if self.tty:
+            self.stream.write("\r" + line.ljust(self._last_length) + ("\n" if event in ("done", "failed") else ""))
+            self._last_length = len(line)
+        elif event in ("stage_end", "done", "failed"):       # logs: no carriage returns, a line per finished stage
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+class JsonLinesRenderer(ProgressRenderer):
+    "One JSON object per line: the snapshot with its ``event``."
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream if stream is not None else sys.stdout
+
+    def render(self, event: str, snapshot: Snapshot) -> None:
+        self.stream.write(json.dumps({"event": event, **snapshot}) + "\n")
+        self.stream.flush()
+
+
+RENDERERS: Dict[str, Type[ProgressRenderer]] = {
+    "bar": TerminalRenderer,
+    "jsonl": JsonLinesRenderer,
+}
+
+
+def get_renderer(name: str, **kwargs) -> ProgressRenderer:
+    "Renderer registered as ``name`` (bar, jsonl)."
+    try:
+        return RENDERERS[name.strip().lower()](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown progress renderer {name!r}. Available: {', '.join(RENDERERS)}") from None
+
+
+class BuildProgress:
+    """
+    Usage:
+        progress = BuildProgress(qal.instrumentation, TerminalRenderer())
+        try:
+            ...                 # the build
+        finally:
+            progress.close()
+
+    Stage starts and ends are always rendered; counter updates at most once per ``interval`` seconds.
+    The expected work is the ``messages_expected`` counter (sources per locale, counted when translation starts).
+    """
+
+    def __init__(
+        self,
+        instrumentation: BuildInstrumentation,
+        renderer: ProgressRenderer,
+        *,
+        interval: float = 0.1,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.instrumentation = instrumentation
+        self.renderer = renderer
+        self.interval = interval
+        self.clock = clock
+        self.stage: Optional[str] = None
+        self.locale: Optional[str] = None
+        self._lock = threading.RLock()          # counters come from translation, verification and lrelease threads
+        self._started = clock()
+        self._translation_started: Optional[float] = None
+        self._last_render = float("-inf")
+        self._closed = False
+        self._error: Optional[str] = None
+        instrumentation.add_hook(self._on_span)
+        instrumentation.add_counter_hook(self._on_count)
+
+    #& -- Events --
+    def _on_span(self, event: str, span: Span) -> None:
+        with self._lock:
+            if span.locale is not None:
+                if event == "start" and span.name == "translate":
+                    self.locale = span.locale
+                return
+            if event == "start":
+                self.stage = span.name
+            else:
+                self.stage = span.parent.name if span.parent is not None else None
+            self._render(f"stage_{event}", force=True)
+
+    def _on_count(self, name: str, value: float, locale: Optional[str]) -> None:
+        if name in _TRANSLATED and self._translation_started is None:
+            with self._lock:
+                self._translation_started = self.clock()
+        self._render("progress")
+
+    def _render(self, event: str, *, force: bool = False) -> None:
+        with self._lock:
+            now = self.clock()
+            if self._closed or (not force and now - self._last_render < self.interval):
+                return
+            self._last_render = now
+            self.renderer.render(event, self.snapshot())
+
+    #& -- Figures --
+    def snapshot(self) -> Snapshot:
+        "Current figures of the build. Rates are measured since the first translated message."
+        instrumentation = self.instrumentation
+        with instrumentation._lock:
+            counters = dict(instrumentation.counters)
+            per_locale = {locale: dict(c) for locale, c in instrumentation.locale_counters.items()}
+
+        now = self.clock()
+        elapsed = now - self._started
+        translating = now - self._translation_started if self._translation_started is not None else 0.0
+
+        locales = {}
+        for locale, c in per_locale.items():
+            if "messages_expected" in c:
+                locales[locale] = {"done": int(sum(c.get(name, 0) for name in _TRANSLATED)), "total": int(c["messages_expected"])}
+        done = sum(entry["done"] for entry in locales.values())
+        total = sum(entry["total"] for entry in locales.values())
+        translated, hits = counters.get("messages", 0), counters.get("memory_hits", 0)
+
+        rate = done / translating if translating > 0 else 0.0
+        return {
+            "state": ("failed" if self._error is not None else "done") if self._closed else "running",
+            "error": self._error,
+            "stage": self.stage,
+            "locale": self.locale,
+            "elapsed": round(elapsed, 3),
+            "done": done,
+            "total": total,
+            "locales": locales,
+            "messages_per_second": round(translated / translating, 3) if translating > 0 else 0.0,
+            "requests_per_second": round(counters.get("requests", 0) / translating, 3) if translating > 0 else 0.0,
+            "characters": int(counters.get("characters", 0)),
+            "cache_hit_rate": round(hits / (hits + translated), 3) if hits + translated else 0.0,
+            "request_errors": int(counters.get("request_errors", 0)),
+            "retries": int(counters.get("retries", 0)),
+            "eta": round((total - done) / rate, 3) if rate > 0 and total > done else (0.0 if total and done >= total else None),
+        }
+
+    def close(self, error: Optional[str] = None) -> None:
+        "Renders the final snapshot (``failed`` with ``error``) and detaches from the instrumentation."
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._error = error
+            self.renderer.render("failed" if error is not None else "done", self.snapshot())
+            self.renderer.close()
+        self.instrumentation.remove_hook(self._on_span)
+        self.instrumentation.remove_counter_hook(self._on_count)
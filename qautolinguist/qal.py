@@ -62,19 +62,31 @@
 
 
 
+import re
 import shutil
 import subprocess
-import pytomlpp as tomlparser
+import sys
 import xml.etree.ElementTree as ET
 import qautolinguist.consts as consts
 import qautolinguist.exceptions as exceptions
+import qautolinguist.translatables as translatables
 
 from click import echo
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from xml.sax.saxutils import escape
 from qautolinguist.pathex import Path
 from qautolinguist.debugstyles import DebugLogs
 from qautolinguist.translator import MATranslator
+from qautolinguist.translators.mt_quality import QualityReport
+from qautolinguist.translators.metrics import MetricsAggregator
 from qautolinguist.cache_impl import CacheImpl
-from typing import Optional, List, Tuple, Union, Dict
+from qautolinguist.catalog import Catalog, MessageKey, message_key
+from qautolinguist.manifest import BuildManifest, hash_file, hash_text
+from qautolinguist.journal import BuildJournal
+from qautolinguist.helpers import SyncBatch, atomic_path, atomic_write, stage_copy
+from qautolinguist.instrumentation import BuildInstrumentation
+from qautolinguist.progress import BuildProgress, ProgressRenderer, TerminalRenderer, get_renderer
+from typing import Optional, List, Tuple, Union, Dict, Iterable, Iterator, Set, Any, IO
 
 
 __all__: List = ["QAutoLinguist"]
@@ -90,11 +102,24 @@ class QAutoLinguist:
     :param source_files_folder: ``Folder that contains the .ts files (Qt translation Files). If not specified, a folder will be created in CWD where you put the command.``
     :param translations_folder: ``Folder that contains the .qm file (Final translation files that your app will use). If not specified, a folder will be created in CWD where you put the command.``
     :param translatables_folder: ``Folder that contains the .toml files (editable translation files). If not specified, a folder will be created in CWD where you put the command.``
+    :param translatable_format: ``Format of the translatable files: toml (default, human-editable) or jsonl (compact, streamable). Revised builds always use toml.``
+    :param engine: ``Translation engine registered in translators.engines (google, mymemory, deepl, microsoft, pseudo, failover). pseudo works offline.``
     :param use_default_on_failure: ``When True, translation reference will be use in case one translation in one language fails. When False a FailedTranslation exception wil be raised.``
     :param revise_after_build: ``Allow to see and edit translated translations in case you want to modify some words or phrases after compile the files.``
     :param clean: ``Removes all runtime directories created (translatables & font_files folders) and keeps the folder that contains the final translations. Essentially a clean build.``
     :param debug_mode: ``Displays information about the state of the build.``
     :param verbose: ``Displays more information about the processes done. DEBUG_MODE must be True to enable that option.``
+    :param metrics_report: ``JSON file where per-stage and per-locale timings and counters are written after the build. None to disable.``
+    :param cache_dir: ``Folder where the build cache (.qal_cache/manifest.json) is kept. If not specified, CWD where you put the command.``
+    :param translation_memory: ``dict[locale: dict[source: translation]]`` reused across builds (watch mode, batch builds). Only sources missing in it are sent to the engine.
+    :param translator: ``Already built MATranslator to use instead of creating one for engine (shared by batch builds). Not thread-safe, use one per concurrent build.``
+    :param lrelease_executor: ``concurrent.futures.Executor where .qm files are compiled in parallel. If None, they are compiled one after another.``
+    :param quality_check: ``Scores every translated batch (see translators.mt_quality) and reports the entries flagged for review. BLEU/GLEU need verify_translations, only the length ratio is checked without it.``
+    :param verify_translations: ``Back-translates each locale to default_locale while the next locales are translated and scores the round trip. Suspicious messages are marked type="unfinished" in the .ts files of non-revised builds.``
+    :param checkpoint_size: ``Messages sent to the engine per chunk. Each translated chunk is appended to the build journal (.qal_cache/journal.jsonl) before the next one is sent. 0 translates each locale in one batch without journal.``
+    :param resume: ``Reuses the chunks journaled by a previous failed or interrupted build instead of translating them again.``
+    :param failover_engines: ``Engines used by the failover engine. Each locale is sent to the best engine supporting it (see translators.routing), the next ones are used when it fails.``
+    :param routing_weights: ``Weights of the failover routing score, {"cost": ..., "latency": ...}. Latencies are measured during the build.``
     """
     
     _TS_EXT                    = ".ts"              #Explicit written extension 
@@ -103,6 +128,7 @@ class QAutoLinguist:
     _SOURCE_FILES_FOLDER_NAME  = "qt_font_files"    # static folder names
     _TRANSLATIONS_FOLDER_NAME  = "translations"     # //
     _TRANSLATABLES_FOLDER_NAME = "translatables"    # //
+    _TRANSLATION_TAG_RE        = re.compile(rb"<translation\b[^>]*?(?:/>|>.*?</translation>)", re.DOTALL)   # <translation> elements of a .ts
     # SOURCE FILES:         Contain the Qt Translation sources files (.ts files)
     # TRANSLATION FILES:    Contain compiled final-use translation files (.qm files)
     # TRANSLATABLE FILES:   Contain .toml files with translation sources.                                           
@@ -116,13 +142,26 @@ def __init__(
         source_files_folder:    Union[str, Path] = None, #.ts files.   If None, will be created a child folder in translation_folder
         translations_folder:    Union[str, Path] = None, # .qm files.  If None, a new folder in CWD is created
         translatables_folder:   Union[str, Path] = None, #.toml files. If None, will be created a child folder in translation_folder
+        engine:                 str = "google",          # translation engine name, see translators.engines.__engines__
+        translatable_format:    str = "toml",            # toml (editable) | jsonl (compact, non-revised builds only)
         use_default_on_failure: bool = True,             # Se debe usar la traduccion del default si la de alguno falla. When False a FailedTranslation exception wil be raised
         revise_after_build:     bool = False,            # Permite al usuario ver las traducciones y modificarlas antes de ser compiladas a .qm
         clean:                  bool = True,             # Elimina todos los directorios y archivo de configuracion creados excepto la de las traducciones. 
         debug_mode:             bool = False,            # Enabled debug logging
         verbose:                bool = False,            # Verbose all called private methods  
+        metrics_report:         Union[str, Path] = None, # JSON report with build timings. If None, no report is written
+        cache_dir:              Union[str, Path] = None, # folder containing .qal_cache. If None, CWD of the command
+        translation_memory:     Dict[str, Dict[str, str]] = None, # {locale: {source: translation}} shared between builds
+        translator:             MATranslator = None,     # shared translator. If None, a new one is created for engine
+        lrelease_executor:      Executor = None,         # pool to run lrelease. If None, .qm files are compiled sequentially
+        quality_check:          bool = False,            # score translations and flag suspicious ones
+        verify_translations:    bool = False,            # back-translation round trip, marks suspicious messages as unfinished
+        checkpoint_size:        int = 200,               # messages per journaled chunk. 0 disables the journal
+        resume:                 bool = False,            # load the journal of a failed build into translation_memory
+        failover_engines:       List[str] = None,        # engines of the failover engine. If None, google and mymemory
+        routing_weights:        Dict[str, float] = None, # failover routing weights {"cost": ..., "latency": ...}
     ):
-        print("DEBUG============================", Path(source_file).exists())  #! Si pasas una ruta relativa, QAL intenta resolverla respecto al directorio
+        print("DEBUG============================", Path(source_file).exists(), file=sys.stderr)  #! Si pasas una ruta relativa, QAL intenta resolverla respecto al directorio
         #! donde se ejecuta, y si la ruta es relativa respecto a otro directorio, al resolverla no existirá porque se resolverá desde un directorio al cual no
         #! es relativa.
 
@@ -130,7 +169,8 @@ def __init__(
         self.source_file = Path(source_file).prepare(is_dir=False, create_empty=False, strict=True)
 
         # -- validating languages --
-        self.translator = MATranslator()                   # Inicializamos el translator que traducirá las fuentes con una API
+        self._engine_options = self.engine_options(engine, failover_engines, routing_weights)
+        self.translator = translator if translator is not None else MATranslator(engine, **self._engine_options)    # Inicializamos el translator que traducirá las fuentes con una API
         if not self.translator.validate_languages(available_locales):
             raise exceptions.InvalidLanguage("Found invalid or not supported languages in available_locales")
 
@@ -174,14 +214,43 @@ def __init__(
             self.translatables_folder = Path(translatables_folder).prepare(create_empty=False, strict=True) 
 
 
+        # -- selecting translatable format --
+        self.translatable_format = translatables.get_format(translatable_format or "toml")
+        if revise_after_build and not self.translatable_format.editable:
+            echo(DebugLogs.warning(
+                f"Translatable format {self.translatable_format.name!r} is not editable, using 'toml' since revise_after_build is enabled."
+            ))
+            self.translatable_format = translatables.get_format("toml")
+
         # -- set instance attrs --
         self.default_locale           = default_locale
+        self.engine                   = engine
         self.available_locales        = available_locales
         self.use_default_on_failure   = use_default_on_failure
         self.revise_after_build       = revise_after_build
         self.clean                    = clean
         self.debug_mode               = debug_mode
         self.verbose                  = verbose     
+        self.metrics_report           = metrics_report
+        self.cache_dir                = Path(cache_dir) if cache_dir is not None else consts.CMD_CWD
+        self.translation_memory       = translation_memory if translation_memory is not None else {}
+        self.instrumentation          = BuildInstrumentation()   # per-stage/per-locale timings and counters
+        self.lrelease_executor        = lrelease_executor
+        self.quality_check            = quality_check
+        self.verify_translations      = verify_translations
+        self.checkpoint_size          = checkpoint_size
+        self.resume                   = resume
+        self.journal: Optional[BuildJournal] = None     # translated chunks of the running build(), see _open_journal()
+        self._sync = SyncBatch()        # outputs are written atomically and synced to disk together at the end of each build stage
+        self.quality_reports: Dict[str, QualityReport] = {}     # last quality check per locale
+        # a shared translator also serves other builds, so its own aggregator is not reported
+        self._translator_metrics = self.translator.metrics if translator is None else MetricsAggregator()
+        self.instrumentation.attach("translator", self._translator_metrics.summary)
+        if quality_check or verify_translations:
+            self.instrumentation.attach("quality", lambda: {lang: report.to_dict() for lang, report in self.quality_reports.items()})
+        self._translator_hooks = [self._on_translator_event] if translator is None else [self._on_translator_event, self._translator_metrics]
+        for hook in self._translator_hooks:
+            self.translator.add_hook(hook)
 
         self._ts_reference_file         = self.source_files_folder / f"{self.default_locale}{self._TS_EXT}"
         self.map: dict[str, List[Path]] = {locale: [] for locale in self.available_locales}
@@ -189,10 +258,20 @@ def __init__(
         # instance to build one                      
 
     
+    @staticmethod
+    def engine_options(engine: str, failover_engines: Optional[List[str]] = None, routing_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        "``MATranslator`` params of ``engine``: the failover engine takes its engines and routing weights, other engines none."
+        if engine.strip().lower() != "failover":
+            return {}
+        options = {"engines": list(failover_engines or ()), "routing_weights": routing_weights}
+        return {name: value for name, value in options.items() if value}
+
+
     #& --  INTERNAL FUNCTIONS  --
-    def _extract_translation_sources(self, ts_file: Path) -> Dict[str, List[str]]:
+    def _extract_catalog(self, ts_file: Path) -> Catalog:
         """
-        Extracts the sources from a Qt translation (.ts) file.
+        Extracts the messages from a Qt translation (.ts) file, one per ``<message>`` (messages sharing a source in 
+        different contexts are kept apart).
         ### Args:
             ts_file (Path): The path to the Qt translation file. Can be either Path object or str
             
@@ -200,65 +279,43 @@ def _extract_translation_sources(self, ts_file: Path) -> Dict[str, List[str]]:
             - `QALBaseException` -> When something throw an error.
         """
         try:
-            tree = ET.parse(ts_file)
-        except (OSError, KeyError, AttributeError, ET.ParseError) as e:
+            catalog = Catalog.from_ts(ts_file)
+        except (OSError, KeyError, AttributeError, ValueError, ET.ParseError) as e:
             raise exceptions.QALBaseException(
                 f"Unexpected error while trying to extract sources from TS file with root {ts_file}. Detailed error: {e}"
             ) from e
-        
-        root = tree.getroot()
-        d = {}
-        for message_elem in root.findall('.//message'):
-            source = message_elem.find('source').text                                                   # siempre va a existir, nunca será None
-            lines =  [location_elem.get('line') for location_elem in message_elem.findall('location')]  # al menos habrá un elemento <location> dentro de cada <message>
-            d[source] = lines
                     
         if self.debug_mode and self.verbose:
            echo(DebugLogs.verbose(f"Sources extracted correctly from file {ts_file}"))
-        return d
+        return catalog
 
 
-    def _compose_groups_dict(self, fonts: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+    def _compose_groups(self, catalog: Catalog, translations: Optional[Iterable[str]] = None) -> Iterator[Dict[str, str]]:
         """
-        Returns a static mapping with the structure ``dict[Group{idx}: {location, source,translation}]`` to be
-        used to create source-translation groups in translatable file.    
+        Yields the ``{location, SOURCE, TRANSLATION}`` groups used to create source-translation groups in translatable file,
+        one at a time so translatable formats can stream them. The translatable format decides how each group is stored 
+        (``Group{idx}`` tables in TOML). ``TRANSLATION`` is the source unless ``translations`` are given.
         """
-        #{group{idx}: {location, source, translation}}
-        return {
-                f"Group{idx}": {
-                    "location": f"line {loc} extracted from '{self.source_file}'", 
-                    "SOURCE": source, 
-                    "TRANSLATION": source
-                }
-                for idx, (source, loc) in enumerate(fonts.items())
-        }
+        return catalog.groups(self.source_file, translations)
     
 
-    def _create_translatable(self, ts_file: Path) -> Path:  
+    def _create_translatable(self, ts_file: Path, groups: Optional[Iterable[Dict[str, str]]] = None) -> Path:  
         """
         Creates a plain translatable file from a .ts file.
 
         ### Args:
             @param ts_file: The path to the .ts file (Path).
+            @param groups: Already composed groups. When given, ``ts_file`` is not parsed again and only names the translatable.
         ### Raises:
-            - ``TOMLConversionError``: Raised when tried to create a TOML file.
+            - ``TranslatableError``: Raised when tried to create the translatable file (``TOMLConversionError`` for TOML).
         """
-
-        extracted_source_fonts = self._extract_translation_sources(ts_file)  #retorna un diccionario de la forma {source: [lines]}
-        name = ts_file.stem+self._TOML_EXT                                   # tanto los translatable files como los translations tienen el mismo nombre  
-        composed_path = self.translatables_folder / name                     # name= <locale>.toml
-        to_dict_fonts = self._compose_groups_dict(extracted_source_fonts)    # dict[group{idx}: {location:str, source:str, translation:str}]
+        if groups is None:
+            catalog = self._extract_catalog(ts_file)        # Catalog[Message(context, source, comment, lines)]
+            groups = self._compose_groups(catalog)          # iter[{location:str, source:str, translation:str}]
         
-        try:
-            with open(composed_path, mode="w") as file_:
-                # file_.write(
-                #     helpers.fit_string(consts.TRANSLATABLE_HEADER_DEFINITION, 80,  preffix="#", as_generator=True)
-                # )
-                file_.write(tomlparser.dumps(to_dict_fonts))
-        except (ValueError, OSError) as e:
-            raise exceptions.TOMLConversionError(
-                f"Unexpected error during the creation of translatable file for {ts_file}. Detailed error: {e}"
-            ) from e
+        name = ts_file.stem + self.translatable_format.extension            # tanto los translatable files como los translations tienen el mismo nombre  
+        composed_path = self.translatables_folder / name                     # name= <locale>.toml | <locale>.jsonl
+        self.translatable_format.write(composed_path, groups, sync=self._sync)
         
         if self.debug_mode and self.verbose:
            echo(DebugLogs.verbose(f"Translatable file created correctly from {ts_file}"))
@@ -267,20 +324,13 @@ def _create_translatable(self, ts_file: Path) -> Path:
 
     def _insert_translations_to_translatable(self, content: List[str], file_: Path) -> None:
         """
-        Read a valid ``TOML`` file and inserts the new content to the file.
+        Read a valid translatable file and inserts the new content to the file.
         
         ### Raises:
             - ``ValueError``: If content length does not match to file content length.
         """
-        data = tomlparser.load(file_, encoding="utf-8")     # dict[group{idx}: {location, source, translation}]
-        
-        if len(data.values()) != len(content):
-            raise ValueError("Content length does not match to file content length.")
-        
-        for items, translation in zip(data.values(), content):      # number of items in content must match with the number of groups, and then translations.
-            items["TRANSLATION"] = translation
-            
-        tomlparser.dump(data, file_, encoding="utf-8")
+        # number of items in content must match with the number of groups, and then translations.
+        translatables.format_for(file_).update_translations(file_, content, sync=self._sync)
 
 
     @staticmethod
@@ -292,17 +342,9 @@ def _translatable2list(file_: Path, *, debug: bool = True) -> List[str]:
             @param file_: The path to the plain text file to be converted.
             
         ### Raises:
-            - ``TOMLConversionError``: Raised when tried to read and process a TOML file.
+            - ``TranslatableError``: Raised when tried to read and process the translatable file (``TOMLConversionError`` for TOML).
         """
-        try:
-            file_data = tomlparser.load(file_, encoding="utf-8")      
-        except (ValueError, OSError) as e:
-            raise exceptions.TOMLConversionError(f"Unexpected error during loading the file {file_!r}. Detailed error: {e}") from e
-        
-        t =  [
-            group_data.get('TRANSLATION', '') 
-            for group_data in file_data.values()
-        ]
+        t = translatables.format_for(file_).translations(file_)     # format is resolved from the file extension (.toml, .jsonl)
     
         if debug:
            echo(DebugLogs.verbose(f"Sucessfully created list containing translation sources of TS file -> {file_}"))
@@ -311,7 +353,9 @@ def _translatable2list(file_: Path, *, debug: bool = True) -> List[str]:
 
 
     @staticmethod
-    def _insert_translated_sources(ts_file: Path, translatable_file: Path, *, debug: bool = True, verbose: bool = True) -> None:
+    def _insert_translated_sources(
+        ts_file: Path, translatable_file: Path, *, debug: bool = True, verbose: bool = True, sync: Optional[SyncBatch] = None
+    ) -> None:
         """
         Insert translated sources into a Qt translation source file (.ts).
 
@@ -323,7 +367,7 @@ def _insert_translated_sources(ts_file: Path, translatable_file: Path, *, debug:
             - ``TranslationFailed``: If the number of translations does not match the existing translations in the .ts file.
         """     
         try:
-            QAutoLinguist._process_insertion_from_source(ts_file, translatable_file, debug=verbose) 
+            QAutoLinguist._process_insertion_from_source(ts_file, translatable_file, debug=verbose, sync=sync) 
         except (ValueError, OSError) as e:
             raise exceptions.TranslationFailed(f"Unable to insert translated sources of {ts_file} in {translatable_file}. Detailed error: {e}") from e
             
@@ -332,7 +376,7 @@ def _insert_translated_sources(ts_file: Path, translatable_file: Path, *, debug:
 
 
     @staticmethod
-    def _process_insertion_from_source(ts_file: Path, translatable_file: Path, *, debug: bool = True) -> None: 
+    def _process_insertion_from_source(ts_file: Path, translatable_file: Path, *, debug: bool = True, sync: Optional[SyncBatch] = None) -> None: 
         """
         Processes a .ts file by updating the translations based in sources contanined in translatable_file.
         This method is called only in _insert_translated_sources()
@@ -342,30 +386,101 @@ def _process_insertion_from_source(ts_file: Path, translatable_file: Path, *, de
             @param translatable_file: The path to the translatable file.
             
         ### Raises:
-            - ``TranslationFailed``: If the number of translations in the .ts file does not match the number of translations in the translatable file.
+            - ``TranslationFailed``: If a message of the .ts file has no translation in the translatable file.
       
         NOTE: ``The method used only works for Qt6 versions and subversions. Consider remodel to work with older versions.``
         """
-        tree = ET.parse(ts_file)
-        root = tree.getroot()
-        current_translations = root.findall(".//message/translation")
-        translations_list = QAutoLinguist._translatable2list(translatable_file)
+        groups = translatables.format_for(translatable_file).read(translatable_file)
+        keys = [Catalog.group_key(group) for group in groups]
+        translations = [group.get("TRANSLATION", "") for group in groups]
         
-        if len(current_translations) != len(translations_list):                              #verify the number of translations are equal in translations_list and current
-            raise exceptions.TranslationFailed(
+        if None in keys:        # translatable written before contexts were stored: positional insertion
+            catalog = Catalog.from_ts(ts_file)
+            if len(catalog) != len(translations):
+                raise exceptions.TranslationFailed(
                     "The number of sources in the translatable does not match the number of sources in the translation file. \n"
                     "NOTE: If the translatables have been translated manually, it is possible that some sources have been deleted or two sources have been joined in one line."
                 )
-            
-        for idx, translation_tag in enumerate(current_translations):
-            translation_tag.set("type", "Finished")                                      # Cambiar el atributo a type="finished" (se puede obviar)
-            translation_tag.text = translations_list[idx]
-        tree.write(ts_file, encoding="utf-8", xml_declaration=True)       
+            keyed = catalog.keyed(translations)
+        else:
+            keyed = dict(zip(keys, translations))
+        QAutoLinguist._write_translations_to_ts(ts_file, keyed, sync=sync)
         
         if debug:
             echo(DebugLogs.verbose(f"Successfully updated ts file source with translatable file {translatable_file}"))                 
 
 
+    @staticmethod
+    def _write_translations_to_ts(
+        ts_file: Path, 
+        translations: Dict[MessageKey, str], 
+        *, 
+        unfinished: Iterable[MessageKey] = (), 
+        sync: Optional[SyncBatch] = None,
+    ) -> None:
+        """
+        Updates every ``<translation>`` of ``ts_file`` with the translation of its (context, source, comment) key 
+        in ``translations`` and writes the file once, atomically. Messages in ``unfinished`` are left ``type="unfinished"`` for review.
+        
+        ### Raises:
+            - ``TranslationFailed``: If a message of the .ts file has no translation in ``translations``.
+        """
+        tree = ET.parse(ts_file)
+        unfinished = set(unfinished)
+        missing = []
+        for context in tree.getroot().iter("context"):
+            name = context.findtext("name") or ""
+            for message in context.iter("message"):
+                key = message_key(name, message)
+                if key not in translations:
+                    missing.append(key)
+                    continue
+                translation_tag = message.find("translation")
+                if translation_tag is None:
+                    translation_tag = ET.SubElement(message, "translation")
+                translation_tag.set("type", "unfinished" if key in unfinished else "Finished")   # Cambiar el atributo a type="finished" (se puede obviar)
+                translation_tag.text = translations[key]
+        
+        if missing:
+            shown = ", ".join(f"{context}::{source!r}" for context, source, _ in missing[:5])
+            raise exceptions.TranslationFailed(
+                f"{len(missing)} messages of {ts_file} have no translation ({shown}{', ...' if len(missing) > 5 else ''}).\n"
+                "NOTE: If the translatables have been translated manually, it is possible that some sources have been deleted or edited."
+            )
+        with atomic_path(ts_file, sync=sync) as temp_path:
+            tree.write(temp_path, encoding="utf-8", xml_declaration=True)
+
+
+    @staticmethod
+    def _patch_translations_in_ts(ts_file: Path, changes: Dict[int, str], expected: int, *, sync: Optional[SyncBatch] = None) -> None:
+        """
+        Replaces only the ``<translation>`` elements of ``ts_file`` whose index is in ``changes``, leaving the rest
+        of the file byte-for-byte untouched (no XML parsing nor serialization of the whole tree).
+        
+        ### Args:
+            @param changes: ``dict[index: translation]`` of the translations that changed.
+            @param expected: number of ``<translation>`` elements the file must contain.
+        ### Raises:
+            - ``TranslationFailed``: If the number of translations in the .ts file does not match ``expected``.
+        """
+        content = ts_file.read_bytes()
+        matches = list(QAutoLinguist._TRANSLATION_TAG_RE.finditer(content))
+        if len(matches) != expected:
+            raise exceptions.TranslationFailed(
+                f"The number of sources in the translatable ({expected}) does not match the number of sources in the translation file {ts_file} ({len(matches)})."
+            )
+        
+        chunks, last = [], 0
+        for idx in sorted(changes):
+            match = matches[idx]
+            chunks.append(content[last:match.start()])
+            chunks.append(f'<translation type="Finished">{escape(changes[idx])}</translation>'.encode("utf-8"))
+            last = match.end()
+        chunks.append(content[last:])
+        with atomic_write(ts_file, mode="wb", sync=sync) as fp:
+            fp.writelines(chunks)
+
+
     @staticmethod
     def _make_qm_file(ts_file: Path, dst_path: Path, options: Optional[List[str]] = None, debug: bool = True) -> None: 
         """
@@ -443,36 +558,52 @@ def create_reference_file(self, options: Optional[List[str]] = None) -> None:
 
     def create_ts_files(self) -> None:
         """
-        Creates translation files for each available_locale.
+        Creates translation files for each available_locale, staged from the reference file without copying its data
+        when the filesystem allows it (see ``helpers.stage_copy``). Non-revised builds hardlink them: every .ts is
+        replaced as a whole when its translations are inserted, which breaks the link before anything is modified.
         
         ### Raises:
             - `QALBaseException`: When `OSError`.
         """
-        for lang in self.available_locales:
+        link = not self.revise_after_build          # revised .ts files wait for the user, they are real copies
+        for lang in self.map:                   # every available locale unless the build skipped the up-to-date ones
             name = lang.lower() + self._TS_EXT   
             ts_path = self.source_files_folder / name
             
             try:
-                shutil.copy(self._ts_reference_file, ts_path)
+                method = stage_copy(self._ts_reference_file, ts_path, link=link)
             except OSError as e:
                 raise exceptions.QALBaseException(
                     f"Unable to create .ts for {ts_path}; Check if _create_reference_file() was called to initialize the ts reference file.\n Detailed Error: {e}"
                 ) from e
             
             self.map[lang].insert(0, ts_path)   # entramos a la key=locale (ya creada) y guardamos en idx 0 del mapping
+            if self.debug_mode and self.verbose:
+                echo(DebugLogs.verbose(f"{ts_path} staged from the reference file ({method})"))
             
         if self.debug_mode: 
             echo(DebugLogs.info(f"Translation files created correctly using {self._ts_reference_file}, saved in {self.source_files_folder}"))
 
 
-    def create_translatables(self) -> None:
-        #? Podemos crear también los translatables con los translation files también; Ya están creados.
-        for lang in self.available_locales:
+    def create_translatables(self, translations: Optional[Dict[str, List[str]]] = None) -> None:
+        """
+        Creates a translatable file for each locale. Sources are extracted only once from the reference file, since 
+        every locale .ts is a copy of it.
+        
+        ### Args:
+            @param translations: Optional ``dict[locale: translations]``. When given, translatables are written already translated,
+            so they do not have to be loaded and rewritten later by ``translate_translatables()``.
+        """
+        catalog = self._extract_catalog(self._ts_reference_file)
+        
+        for lang in self.map:
             if not self.map[lang]:          # Aún no se ha creado los archivos (lista vacia). Suele pasar cuando se llama manualmente al método
                 raise exceptions.QALBaseException("Call create_ts_files() method to create translation files first.")
             
+            locale_groups = self._compose_groups(catalog, None if translations is None else translations[lang])   # streamed to the file
+            
             ts_file = self.map[lang][0]         # cogemos el Path del translation file ya creado a partir del locale ubicado en idx 0
-            toml_file = self._create_translatable(ts_file)   #los tsf se crean con el ts de cada locale, que por ahora son solo copias con el locale <defaut_locale>
+            toml_file = self._create_translatable(ts_file, locale_groups)   #los tsf se crean con el ts de cada locale, que por ahora son solo copias con el locale <defaut_locale>
             self.map[lang].insert(1, toml_file)       # guardamos el path en el idx1
         
         if self.debug_mode: 
@@ -480,99 +611,402 @@ def create_translatables(self) -> None:
     
 
     def insert_translated_sources(self) -> None:
-        for ts_file, tsf_file in self.map.values():
+        for lang, (ts_file, tsf_file) in self.map.items():
             if not ts_file or not tsf_file:         # Aún no se ha creado los archivos. Suele pasar cuando se llama manualmente al método
                 raise DebugLogs.error(
                     "Translation files have not been created yet. Call create_ts_files() and create_translatables() in this order."
                 )
             
-            self._insert_translated_sources(ts_file, tsf_file)
+            with self.instrumentation.stage("insert_translations", locale=lang):
+                self._insert_translated_sources(ts_file, tsf_file, sync=self._sync)
             
         if self.debug_mode: 
            echo(DebugLogs.info(f"Translatables inserted corretly in ts files from {self.translatables_folder}"))
 
 
+    def translate_sources(self, sources: List[str], allow_unresolved_sources: bool = False, never_fail: bool = True) -> Dict[str, List[str]]:
+        """
+        Translates ``sources`` into every locale of the build and returns ``dict[locale: translations]``. 
+        Nothing is read from or written to disk but the build journal. Sources already in ``translation_memory`` are not sent to the engine.
+        With ``verify_translations``, each locale is back-translated in a background thread while the next ones are translated.
+        """
+        self._open_journal()
+        for lang in self.map:
+            self.instrumentation.count("messages_expected", len(sources), locale=lang)     # progress: messages resolved per locale
+        translations = {}
+        verifier = self._make_back_translator() if self.verify_translations else None
+        verifications: Dict[str, Future] = {}
+        
+        with ThreadPoolExecutor(1, thread_name_prefix="verify") as executor:      # one back-translation at a time, overlapped with forward ones
+            for lang in self.map:
+                translations[lang] = self._translate_locale(
+                    self.translator, sources, lang, 
+                    target=lang, source_lang=self.default_locale, locale=lang,
+                    allow_unresolved_sources=allow_unresolved_sources, never_fail=never_fail,
+                )
+                if verifier is not None:
+                    verifications[lang] = executor.submit(self._verify_locale, verifier, lang, sources, translations[lang])
+        
+            if verifier is not None:
+                self._collect_verifications(sources, translations, verifications)
+                verifier.close()
+            elif self.quality_check:
+                self.check_translations(sources, translations)
+        return translations
+
+
+    def _open_journal(self) -> None:
+        "With ``resume``, loads the chunks journaled by the previous build into ``translation_memory``. Otherwise the journal starts empty."
+        if self.journal is None:
+            return
+        if not self.resume:
+            self.journal.discard()
+            return
+        
+        resumed = 0
+        for key, entries in self.journal.load(self.engine, self.default_locale).items():
+            memory = self.translation_memory.setdefault(key, {})
+            for source, translation in entries.items():
+                if source not in memory:
+                    memory[source] = translation
+                    resumed += 1
+        self.instrumentation.count("resumed_messages", resumed)
+        if resumed and self.debug_mode:
+            echo(DebugLogs.info(f"Resuming build: {resumed} translations loaded from {self.journal.path}"))
+
+
+    def _translate_locale(
+        self, 
+        translator: MATranslator, 
+        sources: List[str], 
+        memory_key: str, 
+        *, 
+        target: str, 
+        source_lang: str, 
+        locale: str, 
+        stage: str = "translate", 
+        **kwargs
+    ) -> List[str]:
+        """
+        Translates the ``sources`` missing in ``translation_memory[memory_key]`` and returns the translation of every source.
+        With a journal, they are sent in chunks of ``checkpoint_size`` and each chunk is journaled once translated.
+        Stats are counted for ``locale``.
+        """
+        memory = self.translation_memory.setdefault(memory_key, {})
+        pending = [source for source in dict.fromkeys(sources) if source not in memory]
+        size = (self.checkpoint_size if self.journal is not None else 0) or len(pending) or 1
+        
+        with self.instrumentation.stage(stage, locale=locale):
+            for start in range(0, len(pending), size):
+                chunk = pending[start:start + size]
+                try:
+                    result = translator.translate_batch(
+                        batch=chunk,
+                        target_lang=target, 
+                        source_lang=source_lang, 
+                        fast_translation=True, 
+                        **kwargs
+                    )
+                except Exception as e:
+                    raise exceptions.QALBaseException(f"Unexpected error thrown while translating translatables. Detailed error: {e}") from e
+                if stage == "translate":
+                    self._count_translation(locale, chunk, result)
+                else:
+                    self.instrumentation.count(f"{stage}_messages", len(chunk), locale=locale)
+                memory.update(zip(chunk, result))
+                if self.journal is not None:
+                    self.journal.append(memory_key, chunk, list(result), engine=self.engine, default_locale=self.default_locale)
+            hits = "memory_hits" if stage == "translate" else f"{stage}_memory_hits"
+            self.instrumentation.count(hits, len(sources) - len(pending), locale=locale)
+        return [memory[source] for source in sources]
+
+
+    def _make_back_translator(self) -> MATranslator:
+        "Second translator of the same engine for back-translations (engines keep per-call state, they cannot be shared between threads)."
+        return MATranslator(self.engine, check_connection=False, coalescer=self.translator.coalescer, **self._engine_options)
+
+
+    def _verify_locale(self, verifier: MATranslator, lang: str, sources: List[str], translations: List[str]) -> List[str]:
+        """
+        Back-translates ``translations`` into ``default_locale``.
+        Back-translations are kept in ``translation_memory[<lang>><default_locale>]`` so later builds only send new ones.
+        """
+        return self._translate_locale(
+            verifier, translations, f"{lang}>{self.default_locale}", target=self.default_locale, source_lang=lang, locale=lang, stage="back_translate"
+        )
+
+
+    def _collect_verifications(self, sources: List[str], translations: Dict[str, List[str]], verifications: Dict[str, Future]) -> None:
+        """
+        Waits for the back-translation of every locale and scores the round trips against ``sources`` (BLEU/GLEU), 
+        all locales at once. A failed verification does not fail the build.
+        """
+        back_translations = {}
+        for lang, future in verifications.items():
+            try:
+                back_translations[lang] = future.result()
+            except exceptions.QALBaseException as e:
+                echo(DebugLogs.warning(f"Unable to verify the translations of {lang!r}, they are kept unverified. Detailed error: {e}"))
+        self.check_translations(sources, {lang: translations[lang] for lang in back_translations}, back_translations)
+
+
+    def _suspicious_keys(self, lang: str, catalog: Catalog) -> Set[MessageKey]:
+        "Keys of the messages of ``catalog`` flagged by the verification of ``lang``."
+        report = self.quality_reports.get(lang) if self.verify_translations else None
+        return {catalog[idx].key for idx in report.flagged} if report is not None else set()
+
+
+    def check_translations(
+        self, 
+        sources: List[str], 
+        translations: Dict[str, List[str]], 
+        back_translations: Optional[Dict[str, List[str]]] = None,
+    ) -> Dict[str, QualityReport]:
+        """
+        Scores the ``translations`` (``dict[locale: translations]``) of ``sources`` and stores the reports in ``quality_reports``.
+        Without ``back_translations`` (``verify_translations``) only the length ratio is checked: BLEU and GLEU need a round trip.
+        Entries flagged for review are counted (``quality_flagged``) and listed in debug mode.
+        """
+        with self.instrumentation.stage("quality_check"):
+            reports = self.translator.mt_quality_validator.check_locales(
+                {lang: (sources, translations[lang], None) for lang in translations}, back_translations=back_translations
+            )
+        self._report_quality(sources, reports)
+        return reports
+
+
+    def _report_quality(self, sources: List[str], reports: Dict[str, QualityReport]) -> None:
+        self.quality_reports.update(reports)
+        for lang, report in reports.items():
+            self.instrumentation.count("quality_flagged", len(report.flagged), locale=lang)
+            if report.flagged and self.debug_mode:
+                shown = ", ".join(repr(sources[idx]) for idx in report.flagged[:5])
+                echo(DebugLogs.warning(
+                    f"{len(report.flagged)} translations of {lang!r} flagged for review: {shown}{', ...' if len(report.flagged) > 5 else ''}"
+                ))
+
+
     def translate_translatables(self, allow_unresolved_sources: bool = False, never_fail: bool = True) -> None:
         
         to_translate = self._translatable2list(self.map[self.available_locales[0]][1])    # Tomamos el texto del .toml (idx 1) del primer lenguaje disponible puesto que el texto a traducir es el mismo.
+        translations = self.translate_sources(to_translate, allow_unresolved_sources, never_fail)
         
         for lang, paths in self.map.items():
-            try:
-                result = self.translator.translate_batch(
-                    batch=to_translate,
-                    target_lang=lang, 
-                    source_lang=self.default_locale, 
-                    fast_translation=True, 
-                    allow_unresolved_sources=allow_unresolved_sources,
-                    never_fail=never_fail,
-                )
-            except Exception as e:
-                raise exceptions.QALBaseException(f"Unexpected error thrown while translating translatables. Detailed error: {e}") from e
-        
-            self._insert_translations_to_translatable(result, paths[1])    # el resultado del texto, el Path del archivo .toml
+            with self.instrumentation.stage("write_translatable", locale=lang):
+                self._insert_translations_to_translatable(translations[lang], paths[1])    # el resultado del texto, el Path del archivo .toml
         
         if self.debug_mode:
             echo(DebugLogs.info(f"Translatables translated with sucess contained in {self.translatables_folder}"))
 
 
+    def detach_translator(self) -> None:
+        "Removes the hooks this instance added to ``translator``, so a shared translator can be reused by other builds."
+        for hook in self._translator_hooks:
+            self.translator.remove_hook(hook)
+        self._translator_hooks = []
+
+
+    def _on_translator_event(self, event) -> None:
+        "Translator hook that feeds request counters of the locale being translated by the calling thread."
+        locale = self.instrumentation.current_locale()
+        count = self.instrumentation.count
+        if event.kind == "request":
+            count("requests", locale=locale)
+            count("request_bytes_sent", event.payload_bytes, locale=locale)
+            count("request_bytes_received", event.response_bytes, locale=locale)
+            if not event.ok:
+                count("request_errors", locale=locale)
+        elif event.path in ("separator_retry", "each"):
+            count("retries", locale=locale)
+
+
+    def _count_translation(self, lang: str, batch: List[str], result: List[str]) -> None:
+        "Feeds the instrumentation counters with the payload of a translated batch."
+        count = self.instrumentation.count
+        count("messages", len(batch), locale=lang)
+        count("characters", sum(len(text) for text in batch), locale=lang)
+        count("bytes_sent", sum(len(text.encode("utf-8")) for text in batch), locale=lang)
+        count("bytes_received", sum(len(text.encode("utf-8")) for text in result if text), locale=lang)
+
+
     def create_qm_files(self, options: List = None) -> None:    
-        "Creates Qm files for created .ts files."
-        for files in self.map.values():
-            ts_file = files[0]
-            qm_path = self.translations_folder / ts_file.stem + self._QM_EXT
-            
-            self._make_qm_file(ts_file, qm_path, options)
+        "Creates Qm files for created .ts files. When ``lrelease_executor`` is set, locales are compiled in parallel."
+        def compile_(lang: str, ts_file: Path) -> None:
+            qm_path = self.translations_folder / (ts_file.stem + self._QM_EXT)
+            with self.instrumentation.stage("lrelease", locale=lang), atomic_path(qm_path, sync=self._sync) as temp_path:
+                self._make_qm_file(ts_file, temp_path, options)     # lrelease writes a temporary file renamed once complete
             
             if self.debug_mode and self.verbose:
                 echo(DebugLogs.verbose(f"Compiled qm file sucessfully done at {ts_file}."))
+        
+        if self.lrelease_executor is None:
+            for lang, files in self.map.items():
+                compile_(lang, files[0])
+        else:
+            futures = [self.lrelease_executor.submit(compile_, lang, files[0]) for lang, files in self.map.items()]
+            for future in futures:
+                future.result()         # re-raises CompilationError of any locale
             
         if self.debug_mode:
            echo(DebugLogs.info(f"Qm files created sucessfully at {self.translations_folder}"))
 
 
-    def build(self, with_progress_bar: bool = False) -> None:
+    def build(self, with_progress_bar: bool = False, progress_format: str = "bar", progress_stream: Optional[IO[str]] = None) -> None:
         """Call all the public methods to make a build.
         If ``clean_build`` is set to True, all directories used to make the build will be removed except the one that contains the binaries.
+        With ``with_progress_bar``, progress is reported as ``progress_format`` (``bar`` or ``jsonl``, see ``progress.RENDERERS``)
+        on ``progress_stream`` (stderr for ``bar``, stdout for ``jsonl`` by default).
         """
         if self._build_done:
             raise exceptions.QALBaseException("Build has been done before. Use restore() or update() functions instead.")
         
         echo(DebugLogs.info("Preparing build..."))
+        self.journal = BuildJournal(self.cache_dir) if self.checkpoint_size else None
 
         try:
-            if with_progress_bar:
-                self.run_build_with_bar()
-            else:
-                self._run_build()
+            with self.instrumentation.stage("build"):
+                if with_progress_bar:
+                    self.run_build_with_bar(get_renderer(progress_format, stream=progress_stream))
+                else:
+                    self._run_build()
         except KeyboardInterrupt:
             self.restore()          # elimina todos los archivos o directorios creados por build, aparte de limpiar el diccionario.
-            raise exceptions.QALBaseException("Build stopped") from None
+            raise exceptions.QALBaseException(f"Build stopped.{self._resume_hint()}") from None
         except exceptions.QALBaseException as e:
             self.restore()          # elimina todos los archivos o directorios creados por build, aparte de limpiar el diccionario.
-            raise exceptions.QALBaseException(f"Something went wrong during the build. Detailed error: {e}") from None
+            raise exceptions.QALBaseException(f"Something went wrong during the build. Detailed error: {e}{self._resume_hint()}") from None
+        else:
+            if self.journal is not None:
+                self.journal.discard()      # every translation is in the outputs now
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            if self.metrics_report is not None:
+                report_path = self.instrumentation.dump(self.metrics_report)
+                if self.debug_mode:
+                    echo(DebugLogs.info(f"Build metrics report written in {report_path}"))
+
+
+    def _resume_hint(self) -> str:
+        "Tells how to reuse the translations journaled by a failed build, if any."
+        if self.journal is None or not self.journal.exists():
+            return ""
+        return f"\nTranslated chunks were kept in {self.journal.path}. Run the build again with resume=True (build run --resume) to reuse them."
 
 
     def _run_build(self) -> None:
         """Method that calls all QAutoLinguist methods to run the build"""
         self._build_done = True
-        self.create_reference_file()                
-        self.create_ts_files()         
-        self.create_translatables()          
-        self.translate_translatables()
+        self._translator_metrics.reset()        # the report covers this build only (watch sessions rebuild with the same instance)
+        stage = self.instrumentation.stage
+        
+        with stage("lupdate"):
+            self.create_reference_file()                
+        
         if self.revise_after_build:
+            with stage("create_ts_files"):
+                self.create_ts_files()         
+            with stage("create_translatables"), self._sync:
+                self.create_translatables()          
+            with stage("translate_translatables"), self._sync:
+                self.translate_translatables()
             echo(
                 DebugLogs.warning(
                 "Build completed with sucess.\n CAUTION: The build is incomplete, manually translates and modifies the .tsf and calls the .compose_qm_files() method"
                 )
             )
-            self._gen_cache()
+            with stage("cache"):
+                self._gen_cache()
         else:
-            self.insert_translated_sources()
+            self._run_in_memory_build(stage)
+
+
+    def _run_in_memory_build(self, stage) -> None:
+        """
+        Non-revised build: sources and translations stay in memory from extraction to insertion. Translatables are
+        written exactly once, already translated, and not at all when ``clean`` would delete them afterwards.
+        Locales whose outputs in the build manifest are still up to date are skipped.
+        """
+        manifest = BuildManifest.load(self.cache_dir)
+        with stage("check_manifest"):
+            reference_hash = hash_file(self._ts_reference_file)
+            fresh = self._fresh_locales(manifest, reference_hash)
+        for lang in fresh:
+            del self.map[lang]
+        if fresh and self.debug_mode:
+            echo(DebugLogs.info(f"Skipping up-to-date locales: {', '.join(fresh)}"))
+        
+        with stage("create_ts_files"):
+            self.create_ts_files()
+        with stage("extract_sources"):
+            catalog = self._extract_catalog(self._ts_reference_file)
+            sources = catalog.sources()
+        with stage("translate_translatables"):
+            translations = self.translate_sources(sources)
+        
+        if not self.clean:
+            with stage("create_translatables"), self._sync:
+                self.create_translatables(translations)
+        
+        with stage("insert_translated_sources"), self._sync:
+            for lang in self.map:
+                with stage("insert_translations", locale=lang):
+                    try:
+                        self._write_translations_to_ts(
+                            self.map[lang][0], catalog.keyed(translations[lang]), unfinished=self._suspicious_keys(lang, catalog), sync=self._sync
+                        )
+                    except (ValueError, OSError) as e:
+                        raise exceptions.TranslationFailed(f"Unable to insert translated sources in {self.map[lang][0]}. Detailed error: {e}") from e
+        with stage("create_qm_files"), self._sync:
             self.create_qm_files()
-            if self.clean:
+        with stage("cache"):
+            self._record_build(manifest, sources, translations)
+        if self.clean:
+            with stage("sanitize"):
                 self._sanitize_after_build()
 
 
+    def _fresh_locales(self, manifest: BuildManifest, reference_hash: Optional[str]) -> List[str]:
+        """
+        Locales whose .qm was built by a previous build from the same reference, engine and default locale and is 
+        still unmodified on disk. In non-clean builds, their .ts and translatable must be unmodified too.
+        """
+        if not manifest.exists() or manifest.config.get("default_locale") != self.default_locale:
+            return []
+        
+        fresh = []
+        for lang in self.map:
+            if not manifest.locale_is_fresh(lang, reference_hash, self.engine):
+                continue
+            if not self.clean and (manifest.file_changed(lang, "ts") or manifest.file_changed(lang, "translatable")):
+                continue
+            fresh.append(lang)
+        return fresh
+
+
+    def _record_build(self, manifest: BuildManifest, sources: List[str], translations: Dict[str, List[str]]) -> None:
+        "Records the outputs of the locales built in ``manifest`` and saves it."
+        manifest.engine = self.engine
+        manifest.config.update(self._cache_config())
+        manifest.record_source(self.source_file)
+        manifest.record_reference(self._ts_reference_file, sources)
+        
+        for lang, paths in self.map.items():
+            manifest.record_file(lang, "qm", self.translations_folder / (paths[0].stem + self._QM_EXT))
+            manifest.record_translations(lang, translations[lang])
+            if self.clean:                              # .ts and translatables are removed by _sanitize_after_build
+                manifest.locale(lang).pop("ts", None)
+                manifest.locale(lang).pop("translatable", None)
+            else:
+                for kind, path in zip(("ts", "translatable"), paths):
+                    manifest.record_file(lang, kind, path)
+        manifest.save()
+        
+        if self.debug_mode and self.verbose:
+            echo(DebugLogs.verbose(f"Build manifest written in {manifest.path}"))
+
+
     def _sanitize_after_build(self) -> None:
         """Elimina todos directorios creados durante la build menos el que contiene los .qm.
         NOTE: Se eliminarán de manera permanente el ``source_files_folder`` y ``translatables_folder``
@@ -582,44 +1016,136 @@ def _sanitize_after_build(self) -> None:
     
     
     @staticmethod
-    def compose_qm_files(cache_impl: Optional[CacheImpl] = None, options: Optional[Union[List[str], Tuple[str]]] = None) -> None:
+    def compose_qm_files(
+        cache_impl: Optional[CacheImpl] = None, 
+        options: Optional[Union[List[str], Tuple[str]]] = None, 
+        cache_dir: Optional[Union[str, Path]] = None,
+    ) -> List[str]:
         """Crea los binarios a partir de una caché . 
         ``Usar cuando se ha creado una build pero se han modificado los translatables. ``
         Esta función llamará a ``_insert_translated_sources()`` y ``_make_qm_file()``
         
         ### Funcionamiento:
-        - Se espera un objeto CacheImpl para obtener los datos de la cache, sino se busca la carpeta en el CWD_CMD.
+        - Se espera un objeto CacheImpl para obtener los datos de la cache, sino se busca la carpeta en ``cache_dir`` (CMD_CWD por defecto).
+        - Con un build manifest, los locales cuyo translatable y .qm no han cambiado desde la última compilación se omiten.
+        
+        Returns the locales whose .qm was compiled.
         """
+        if cache_dir is None:
+            cache_dir = cache_impl.cwd_dir if cache_impl is not None else consts.CMD_CWD     # If None, try to find cache folder in command CWD
         
-        if cache_impl is None:
-            cache_data = CacheImpl.get_data(consts.CMD_CWD) # If None, this static method will try to find cache folder in command CWD
-        else:
-            cache_data = cache_impl.get_data(consts.CMD_CWD) # Static method that tries to find cache folder in CMD_CWD and return a dict with nodes.
+        cache_data = CacheImpl.get_data(Path(cache_dir))    # dict with nodes, external config and the manifest (None for old caches)
         nodes = cache_data["nodes"]
         config = cache_data["external"]
+        manifest: Optional[BuildManifest] = cache_data["manifest"]
+        compiled = []
+        sync = SyncBatch()          # outputs of every locale are synced once, before the manifest records them
+        
+        incomplete = {
+            locale: [path for path in paths if path is None or not Path(path).exists()]
+            for locale, paths in nodes.items()
+        }
+        incomplete = {locale: missing for locale, missing in incomplete.items() if missing}
+        if incomplete and len(incomplete) == len(nodes):
+            raise exceptions.QALBaseException(
+                f"Unable to compose qm files from {cache_dir}: the .ts files and translatables of the last build were not kept "
+                "(clean builds remove them). Build again with clean=False to revise translations."
+            )
+        for locale, missing in incomplete.items():
+            echo(DebugLogs.warning(
+                f"Skipping {locale!r}: its .ts file or translatable is missing ({', '.join(str(path) for path in missing if path) or 'not recorded'})."
+            ))
         
-        for (ts_file, translatable_file) in nodes.values():
+        for locale, (ts_file, translatable_file) in nodes.items():
+            if locale in incomplete:
+                continue
             
             ts_file = Path(ts_file).resolve(True) 
             translatable_file = Path(translatable_file).resolve(True)
             
             qm_final_path = Path(config["qm_folder"]).joinpath(ts_file.stem + QAutoLinguist._QM_EXT).resolve()  # composing final qm path
             # that takes ts_file stem and .qm ext to join with qm_folder path.
-
-            try:
-                QAutoLinguist._insert_translated_sources(ts_file, translatable_file, debug=config["debug"], verbose=config["verbose"])
-                QAutoLinguist._make_qm_file(ts_file, qm_final_path, options, debug=config["debug"])
-            except (
-                exceptions.TranslationFailed,
-                exceptions.CompilationError,
-                exceptions.InvalidOptions
-            ) as err:
-                raise exceptions.CompilationError(f"Unable to create qm files, an unexpected error raised: {err}") from None
+            
+            if manifest is None:        # old cache: no hashes to compare with, everything is recompiled
+                QAutoLinguist._compose_qm_file(ts_file, translatable_file, qm_final_path, options, config, sync=sync)
+                compiled.append(locale)
+                continue
+            
+            qm_changed = manifest.file_changed(locale, "qm", qm_final_path)
+            if not qm_changed and not manifest.file_changed(locale, "translatable", translatable_file):
+                continue            # untouched since its last compilation
+            
+            translations = QAutoLinguist._translatable2list(translatable_file, debug=False)
+            previous = manifest.translation_hashes(locale)
+            if len(previous) == len(translations) and not manifest.file_changed(locale, "ts", ts_file):
+                changes = {
+                    idx: translation for idx, (translation, old_hash) in enumerate(zip(translations, previous)) 
+                    if hash_text(translation) != old_hash
+                }
+                if not changes and not qm_changed:      # translatable saved without edits
+                    manifest.record_file(locale, "translatable", translatable_file)
+                    continue
+                QAutoLinguist._compose_qm_file(
+                    ts_file, translatable_file, qm_final_path, options, config, changes=changes, expected=len(translations), sync=sync
+                )
+            else:                       # first compose or .ts modified outside QAL: full insertion
+                QAutoLinguist._compose_qm_file(ts_file, translatable_file, qm_final_path, options, config, sync=sync)
+            
+            manifest.record_file(locale, "ts", ts_file)
+            manifest.record_file(locale, "translatable", translatable_file)
+            manifest.record_file(locale, "qm", qm_final_path)
+            manifest.record_translations(locale, translations)
+            compiled.append(locale)
+        
+        sync.sync()
+        if manifest is not None:
+            manifest.save()
         
         if config["debug"]:
-            echo(DebugLogs.info(f"Sucessfully created QM files in {config['qm_folder']}.\nWARNING: Created from revised build."))
+            skipped = [locale for locale in nodes if locale not in compiled and locale not in incomplete]
+            echo(DebugLogs.info(
+                f"Sucessfully created QM files in {config['qm_folder']}.\nWARNING: Created from revised build."
+                + (f"\nUp-to-date locales skipped: {', '.join(skipped)}" if skipped else "")
+            ))
+        return compiled
+
 
 
+    @staticmethod
+    def _compose_qm_file(
+        ts_file: Path, 
+        translatable_file: Path, 
+        qm_path: Path, 
+        options: Optional[Union[List[str], Tuple[str]]], 
+        config: Dict, 
+        *, 
+        changes: Optional[Dict[int, str]] = None, 
+        expected: int = 0,
+        sync: Optional[SyncBatch] = None,
+    ) -> None:
+        """
+        Inserts ``translatable_file`` into ``ts_file`` and compiles ``qm_path``. When ``changes`` is given only those
+        ``<translation>`` elements are patched (see ``_patch_translations_in_ts()``).
+        
+        ### Raises:
+            - ``CompilationError``: If insertion or compilation fails.
+        """
+        try:
+            if changes is None:
+                QAutoLinguist._insert_translated_sources(ts_file, translatable_file, debug=config["debug"], verbose=config["verbose"], sync=sync)
+            elif changes:
+                QAutoLinguist._patch_translations_in_ts(ts_file, changes, expected, sync=sync)
+                if config["debug"] and config["verbose"]:
+                    echo(DebugLogs.verbose(f"Patched {len(changes)} translations of {ts_file} from {translatable_file}"))
+            with atomic_path(qm_path, sync=sync) as temp_path:
+                QAutoLinguist._make_qm_file(ts_file, temp_path, options, debug=config["debug"])
+        except (
+            exceptions.TranslationFailed,
+            exceptions.CompilationError,
+            exceptions.InvalidOptions
+        ) as err:
+            raise exceptions.CompilationError(f"Unable to create qm files, an unexpected error raised: {err}") from None
+
 
     def restore(self) -> None:
         """Borra todo el proceso hecho por .build()
@@ -651,39 +1177,45 @@ def update(self) -> None:
         self.build()
 
 
-    def run_build_with_bar(self) -> None:
-        # from tqdm import tqdm
-        
-        # if self._build_done:
-        #     raise exceptions.QALBaseException("Build has been done before. Use restore() or update() functions instead.")
-        
-        # echo(DebugLogs.info("Preparing build..."))
+    def run_build_with_bar(self, renderer: Optional[ProgressRenderer] = None) -> None:
+        """
+        Runs the build reporting its progress (stage, locale, messages/s, requests/s, characters, cache hit rate and ETA)
+        with ``renderer``, a terminal bar on stderr by default.
+        """
+        progress = BuildProgress(self.instrumentation, renderer or TerminalRenderer())
+        try:
+            self._run_build()
+        except BaseException as e:
+            progress.close(error=f"{type(e).__name__}: {e}")
+            raise
+        else:
+            progress.close()
 
-        # # Obtén el número total de pasos en la tarea
-        # total_steps = 5  # Ajusta esto según la cantidad de métodos llamados en _run_build()
-        # # Crea una barra de progreso
-        # progress_bar = tqdm(total=total_steps, desc="Building", unit="step")
-        # # Llama a _run_build() con la barra de progreso
-        # self._run_build(progress_bar)
-        # ...
-        raise NotImplementedError
+
+    def _cache_config(self) -> Dict[str, Union[str, bool]]:
+        "Configuration parameters stored in the cache, needed by ``compose_qm_files()``."
+        return {
+            "qm_folder": str(self.translations_folder.resolve(True)),
+            "default_locale": self.default_locale,
+            "debug": self.debug_mode,
+            "verbose": self.verbose,
+        }
 
 
     def _gen_cache(self):
-        "Generates a ``CacheImpl`` object to make the program cache."
+        "Generates a ``CacheImpl`` object to make the program cache (build manifest)."
         
         data = {
             lang: [str(path.resolve(True)) for path in paths] 
             for lang, paths in self.map.items() 
         }
-        config = {
-            "qm_folder": str(self.translations_folder.resolve(True)),
-            "debug": self.debug_mode,
-            "verbose": self.verbose,
-        }
         
-        cache_inst = CacheImpl(data, config, cwd_dir=consts.CMD_CWD)
-        cache_inst.build_cache()
+        cache_inst = CacheImpl(data, self._cache_config(), cwd_dir=self.cache_dir)
+        manifest = cache_inst.manifest
+        manifest.engine = self.engine
+        manifest.record_source(self.source_file)
+        manifest.record_reference(self._ts_reference_file, self._extract_catalog(self._ts_reference_file).sources())
+        cache_inst.build_cache()        # translations are recorded once compose_qm_files() inserts them in the .ts files
         
         
         if self.debug_mode and self.verbose:
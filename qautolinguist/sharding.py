@@ -0,0 +1,322 @@
+"""
+Sharded translation of one project.
+
+The translation of a big project is split into work units (a locale and a range of its unique sources) that
+independent worker processes translate, on the same machine or on several machines sharing the shard folder.
+Each worker writes the results of the units it claimed; a deterministic merge step then builds the project with
+those results as its translation memory, so nothing is sent to the engine again::
+
+    qautolinguist build shard plan .qal_config.ini --dir shards --max-messages 500
+    qautolinguist build shard work shards           # as many workers as wanted, each one with its own rate limits
+    qautolinguist build shard merge shards
+
+Layout (``<shard_dir>``)::
+
+    shards.json             {"version", "config", "engine", "default_locale", "units": [unit_id, ...]}
+    units/<unit_id>.json    {"id", "locale", "start", "stop", "sources": [...]}
+    claims/<unit_id>        created exclusively by the worker that took the unit
+    results/<unit_id>.json  {"id", "locale", "worker", "wall", "translations": [...]}
+
+Units are planned from ``plan.BuildPlan``, so up-to-date locales are not sharded. When its sources are estimated
+(source file changed and not a .ts), messages missing in the results are translated by the merge build itself.
+"""
+
+import json
+import os
+import socket
+import time
+import qautolinguist.exceptions as exceptions
+
+from pathlib import Path
+from qautolinguist.helpers import atomic_write
+from qautolinguist.plan import BuildPlan
+from qautolinguist.translator import MATranslator
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+__all__: List[str] = ["WorkUnit", "ShardSet", "ShardWorker"]
+
+
+def _write_json(path: Path, data: Any) -> None:
+    "Writes ``data`` atomically: readers on other processes or machines never see partial files."
+    with atomic_write(path, mode="w", encoding="utf-8") as fp:
+        json.dump(data, fp, ensure_ascii=False)
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, mode="r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+class WorkUnit:
+    "Sources ``start:stop`` of the unique sources of a project, to be translated into ``locale``."
+
+    __slots__ = ("id", "locale", "start", "stop", "sources")
+
+    def __init__(self, id: str, locale: str, start: int, stop: int, sources: List[str]):
+        self.id = id
+        self.locale = locale
+        self.start = start
+        self.stop = stop
+        self.sources = sources
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkUnit":
+        return cls(**{attr: data[attr] for attr in cls.__slots__})
+
+    def __repr__(self) -> str:
+        return f"WorkUnit({self.id}, {self.locale}, {self.start}:{self.stop})"
+
+
+class ShardSet:
+    """
+    Shard folder of a project.
+
+    Usage:
+        shards = ShardSet.plan(".qal_config.ini", "shards", max_messages=500)
+        ShardWorker(shards).run()           # in every worker
+        shards.merge_build()                # once every unit is done
+    """
+
+    VERSION = 1
+    FILENAME = "shards.json"
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.units_folder = self.root / "units"
+        self.claims_folder = self.root / "claims"
+        self.results_folder = self.root / "results"
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """
+        ### Raises:
+            - ``QALBaseException``: If ``root`` is not a shard folder.
+        """
+        if self._data is None:
+            try:
+                data = _read_json(self.root / self.FILENAME)
+            except (OSError, ValueError) as e:
+                raise exceptions.QALBaseException(f"{self.root} is not a shard folder. Detailed error: {e}") from None
+            if data.get("version") != self.VERSION:
+                raise exceptions.QALBaseException(f"{self.root} was planned by an incompatible version ({data.get('version')}).")
+            self._data = data
+        return self._data
+
+    @property
+    def unit_ids(self) -> List[str]:
+        return self.data["units"]
+
+    @classmethod
+    def plan(
+        cls,
+        config: Union[str, Path],
+        root: Union[str, Path],
+        *,
+        max_messages: int = 500,
+        locales: Optional[List[str]] = None,
+    ) -> "ShardSet":
+        """
+        Splits the stale locales of the project of ``config`` (or only ``locales``) into units of ``max_messages``
+        unique sources at most and writes them in ``root``.
+
+        ### Raises:
+            - ``QALBaseException``: If ``root`` already holds units or ``max_messages`` is not positive.
+        """
+        if max_messages < 1:
+            raise exceptions.QALBaseException("max_messages must be a positive number.")
+        shards = cls(root)
+        if (shards.root / cls.FILENAME).exists():
+            raise exceptions.QALBaseException(f"{shards.root} already holds a shard plan. Remove it or use another folder.")
+
+        build_plan = BuildPlan.from_config(config)
+        sources = list(dict.fromkeys(build_plan.sources))
+        targets = [locale for locale in build_plan.stale if locales is None or locale in locales]
+
+        for folder in (shards.units_folder, shards.claims_folder, shards.results_folder):
+            folder.mkdir(parents=True, exist_ok=True)
+        unit_ids = []
+        for locale in targets:
+            for index, start in enumerate(range(0, len(sources), max_messages)):
+                stop = min(start + max_messages, len(sources))
+                unit = WorkUnit(f"{locale}-{index:04d}", locale, start, stop, sources[start:stop])
+                _write_json(shards.unit_path(unit.id), unit.to_dict())
+                unit_ids.append(unit.id)
+
+        shards._data = {
+            "version": cls.VERSION,
+            "config": str(build_plan.config_path),
+            "engine": build_plan.engine,
+            "default_locale": build_plan.default_locale,
+            "exact": build_plan.exact,
+            "units": unit_ids,
+        }
+        _write_json(shards.root / cls.FILENAME, shards._data)        # written last: until then the folder is not a shard folder
+        return shards
+
+    def unit_path(self, unit_id: str) -> Path:
+        return self.units_folder / f"{unit_id}.json"
+
+    def claim_path(self, unit_id: str) -> Path:
+        return self.claims_folder / unit_id
+
+    def result_path(self, unit_id: str) -> Path:
+        return self.results_folder / f"{unit_id}.json"
+
+    def load_unit(self, unit_id: str) -> WorkUnit:
+        return WorkUnit.from_dict(_read_json(self.unit_path(unit_id)))
+
+    def claim(self, unit_id: str, worker: str) -> bool:
+        "Takes ``unit_id`` for ``worker``. Exclusive creation of the claim file: only one worker gets each unit."
+        if self.result_path(unit_id).exists():
+            return False
+        try:
+            fd = os.open(self.claim_path(unit_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, mode="w", encoding="utf-8") as fp:
+            fp.write(worker)
+        return True
+
+    def release(self, unit_id: str) -> None:
+        "Gives ``unit_id`` back so another worker can take it."
+        try:
+            os.remove(self.claim_path(unit_id))
+        except FileNotFoundError:
+            pass
+
+    def release_stale(self, max_age: float) -> List[str]:
+        "Releases the units claimed more than ``max_age`` seconds ago and still without result (crashed workers)."
+        released = []
+        now = time.time()
+        for unit_id in self.unit_ids:
+            claim = self.claim_path(unit_id)
+            try:
+                stale = now - claim.stat().st_mtime > max_age
+            except FileNotFoundError:
+                continue
+            if stale and not self.result_path(unit_id).exists():
+                self.release(unit_id)
+                released.append(unit_id)
+        return released
+
+    def status(self) -> Dict[str, Any]:
+        "Units per state (``done``, ``claimed``, ``pending``)."
+        states: Dict[str, List[str]] = {"done": [], "claimed": [], "pending": []}
+        for unit_id in self.unit_ids:
+            if self.result_path(unit_id).exists():
+                states["done"].append(unit_id)
+            elif self.claim_path(unit_id).exists():
+                states["claimed"].append(unit_id)
+            else:
+                states["pending"].append(unit_id)
+        return {"units": len(self.unit_ids), **{state: len(ids) for state, ids in states.items()}, "missing": states["claimed"] + states["pending"]}
+
+    def merge(self) -> Dict[str, Dict[str, str]]:
+        """
+        ``dict[locale: dict[source: translation]]`` with the results of every unit, read in unit order.
+
+        ### Raises:
+            - ``QALBaseException``: If some unit has no result or a result does not match its unit.
+        """
+        missing = self.status()["missing"]
+        if missing:
+            raise exceptions.QALBaseException(
+                f"{len(missing)} of {len(self.unit_ids)} units have no result yet: {', '.join(missing[:10])}{', ...' if len(missing) > 10 else ''}"
+            )
+        memory: Dict[str, Dict[str, str]] = {}
+        for unit_id in self.unit_ids:
+            unit = self.load_unit(unit_id)
+            translations = _read_json(self.result_path(unit_id))["translations"]
+            if len(translations) != len(unit.sources):
+                raise exceptions.QALBaseException(
+                    f"Result of unit {unit_id} has {len(translations)} translations for {len(unit.sources)} sources."
+                )
+            memory.setdefault(unit.locale, {}).update(zip(unit.sources, translations))
+        return memory
+
+    def merge_build(self, config: Optional[Union[str, Path]] = None, **qal_kwargs) -> "QAutoLinguist":
+        """
+        Builds the project of ``config`` (the planned one by default) with the merged results as translation memory.
+        ``qal_kwargs`` override params of the config file.
+        """
+        from qautolinguist.batch import BatchRunner     # imported here, batch imports qal
+        from qautolinguist.qal import QAutoLinguist
+
+        config = Path(config or self.data["config"]).resolve()
+        memory = self.merge()
+        content = {**BatchRunner.load_project(config), **qal_kwargs}
+        qal = QAutoLinguist(**content, translation_memory=memory)
+        qal.build()
+        return qal
+
+    def __repr__(self) -> str:
+        return f"ShardSet({self.root})"
+
+
+class ShardWorker:
+    """
+    Translates the pending units of a ``ShardSet`` one after another. Any number of workers can run at the same
+    time on the same folder; each unit is translated by the worker that claims it first.
+
+    Usage:
+        done, failed = ShardWorker("shards").run()
+    """
+
+    def __init__(self, shards: Union[ShardSet, str, Path], *, worker_id: Optional[str] = None, translator: Optional[MATranslator] = None):
+        self.shards = shards if isinstance(shards, ShardSet) else ShardSet(shards)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._translator = translator
+
+    @property
+    def translator(self) -> MATranslator:
+        if self._translator is None:
+            self._translator = MATranslator(self.shards.data["engine"])
+        return self._translator
+
+    def translate_unit(self, unit: WorkUnit) -> List[str]:
+        return self.translator.translate_batch(
+            batch=unit.sources,
+            target_lang=unit.locale,
+            source_lang=self.shards.data["default_locale"],
+            fast_translation=True,
+        )
+
+    def run(self, limit: Optional[int] = None) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Claims and translates pending units until there are none left (or ``limit`` units were done).
+        A failed unit is released for other workers and does not stop this one.
+        Returns ``(done unit ids, dict[failed unit id: error])``.
+        """
+        done: List[str] = []
+        failed: Dict[str, str] = {}
+        for unit_id in self.shards.unit_ids:
+            if limit is not None and len(done) >= limit:
+                break
+            if unit_id in failed or not self.shards.claim(unit_id, self.worker_id):
+                continue
+            start = time.perf_counter()
+            try:
+                unit = self.shards.load_unit(unit_id)
+                translations = self.translate_unit(unit)
+                _write_json(self.shards.result_path(unit_id), {
+                    "id": unit_id,
+                    "locale": unit.locale,
+                    "worker": self.worker_id,
+                    "wall": round(time.perf_counter() - start, 6),
+                    "translations": list(translations),
+                })
+            except Exception as e:      # engines raise their own errors too, the unit is left for another worker
+                self.shards.release(unit_id)
+                failed[unit_id] = f"{type(e).__name__}: {e}"
+                continue
+            done.append(unit_id)
+        return done, failed
+
+    def close(self) -> None:
+        if self._translator is not None:
+            self._translator.close()
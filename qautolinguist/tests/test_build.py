@@ -0,0 +1,687 @@
+import io
+import json
+import pytest
+import shutil
+import xml.etree.ElementTree as ET
+import qautolinguist.consts as consts
+import qautolinguist.exceptions as exceptions
+import qautolinguist.translatables as translatables
+
+from pathlib import Path
+from xml.sax.saxutils import escape
+from qautolinguist.qal import QAutoLinguist
+from qautolinguist.catalog import Catalog
+from qautolinguist.manifest import BuildManifest
+from qautolinguist.watch import WatchSession
+from qautolinguist.batch import BatchRunner
+from qautolinguist.plan import BuildPlan, estimate_requests
+from qautolinguist.sharding import ShardSet, ShardWorker
+from qautolinguist.journal import BuildJournal
+from qautolinguist.progress import JsonLinesRenderer
+from qautolinguist.translator import MATranslator
+from qautolinguist.translators import GoogleTranslator
+from qautolinguist.translators.mock_server import MockTranslationServer
+from qautolinguist.translators.pseudo import PseudoTranslator, pseudo_localize
+
+ROOT = Path(__file__).parent
+TARGET_TS = ROOT / "targets" / "test.ts"
+
+
+@pytest.fixture
+def offline_build(tmp_path, monkeypatch):
+    """
+    Returns a factory of QAutoLinguist instances that build without network, lupdate or lrelease:
+    the pseudo engine translates, the reference .ts is copied from targets/test.ts and .qm files are
+    written as copies of their .ts.
+    """
+    def fake_lupdate(self, options=None):
+        shutil.copy(self.source_file, self._ts_reference_file)      # sources are .ts files already
+
+    def fake_lrelease(ts_file, dst_path, options=None, debug=True):
+        shutil.copy(ts_file, dst_path)
+
+    monkeypatch.setattr(QAutoLinguist, "create_reference_file", fake_lupdate)
+    monkeypatch.setattr(QAutoLinguist, "_make_qm_file", staticmethod(fake_lrelease))
+    monkeypatch.chdir(tmp_path)
+
+    def factory(locales=("es", "fr"), source=TARGET_TS, **kwargs):
+        translations = tmp_path / "translations"
+        translations.mkdir(exist_ok=True)
+        kwargs.setdefault("engine", "pseudo")
+        kwargs.setdefault("cache_dir", tmp_path)
+        return QAutoLinguist(source, list(locales), translations_folder=translations, **kwargs)
+
+    return factory
+
+
+class TestInMemoryBuild:
+
+    def test_clean_build_writes_no_translatables(self, offline_build, monkeypatch):
+        writes = []
+        monkeypatch.setattr(translatables.TomlTranslatable, "write", lambda self, path, groups, **kwargs: writes.append(path))
+        inst = offline_build(clean=True)
+        inst.build()
+
+        assert writes == []
+        assert sorted(p.name for p in inst.translations_folder.iterdir()) == ["es.qm", "fr.qm"]     # no temporary files left
+        assert not inst.translatables_folder.exists()
+
+    def test_translatables_written_once_already_translated(self, offline_build, monkeypatch):
+        original_write = translatables.TomlTranslatable.write
+        writes = []
+
+        def counting_write(self, path, groups, **kwargs):
+            writes.append(path)
+            original_write(self, path, groups, **kwargs)
+
+        monkeypatch.setattr(translatables.TomlTranslatable, "write", counting_write)
+        inst = offline_build(clean=False)
+        inst.build()
+
+        assert sorted(p.name for p in writes) == ["es.toml", "fr.toml"]
+        reference = inst.source_files_folder / "en.ts"
+        assert reference.read_bytes() == TARGET_TS.read_bytes()     # staged .ts files were replaced, not modified in place
+        assert not inst.map["es"][0].samefile(reference)
+        groups = translatables.format_for(inst.map["es"][1]).read(inst.map["es"][1])
+        assert groups[0]["TRANSLATION"] == pseudo_localize(groups[0]["SOURCE"])
+        assert pseudo_localize("Watermark") in inst.map["es"][0].read_text(encoding="utf-8")
+
+
+    def test_quality_check(self, offline_build, tmp_path):
+        inst = offline_build(clean=True, quality_check=True, metrics_report=tmp_path / "report.json")
+        inst.build()
+        assert sorted(inst.quality_reports) == ["es", "fr"]
+        assert len(inst.quality_reports["es"].length_ratio) == 67
+        assert inst.instrumentation.report()["quality"]["es"]["messages"] == 67
+
+
+    def test_verify_translations_marks_suspicious_messages(self, offline_build, monkeypatch):
+        sources = Catalog.from_ts(TARGET_TS).sources()
+        back = {pseudo_localize(source): source for source in sources}
+        back[pseudo_localize("Watermark")] = "Water brand"          # garbled round trip
+
+        class BackTranslator:
+            coalescer = None
+            def translate_batch(self, batch, **kwargs):
+                assert kwargs["target_lang"] == "en"
+                return [back[text] for text in batch]
+            def close(self):
+                pass
+
+        monkeypatch.setattr(QAutoLinguist, "_make_back_translator", lambda self: BackTranslator())
+        inst = offline_build(clean=False, verify_translations=True)
+        inst.build()
+
+        assert [sources[idx] for idx in inst.quality_reports["es"].flagged] == ["Watermark"]
+        assert inst.translation_memory["fr>en"][pseudo_localize("Watermark")] == "Water brand"
+        tree = ET.parse(inst.map["es"][0])
+        types = {message.findtext("source"): message.find("translation").get("type") for message in tree.iter("message")}
+        assert types["Watermark"] == "unfinished"
+        assert types["MainWindow"] == "Finished"
+
+
+    def test_verify_translations_scores_round_trips(self, offline_build, monkeypatch):
+        import qautolinguist.translators.mt_quality as mt_quality
+        sources = Catalog.from_ts(TARGET_TS).sources()
+        back = {pseudo_localize(source): source for source in sources}
+        pools = []
+
+        class BackTranslator:
+            coalescer = None
+            def translate_batch(self, batch, **kwargs):
+                return [back[text] for text in batch]
+            def close(self):
+                pass
+
+        class SpyPool(mt_quality.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                pools.append(self)
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(QAutoLinguist, "_make_back_translator", lambda self: BackTranslator())
+        monkeypatch.setattr(mt_quality, "ProcessPoolExecutor", SpyPool)
+        inst = offline_build(clean=True, verify_translations=True)
+        inst.translator.mt_quality_validator.parallel_threshold = 1
+        inst.build()
+
+        assert len(pools) == 1                  # every locale scored at once, one worker per locale
+        for lang in ("es", "fr"):
+            assert inst.quality_reports[lang].mean("gleu") == 1.0
+            assert inst.instrumentation.report()["quality"][lang]["messages"] == 67
+
+
+class TestContexts:
+    "Messages sharing a source in different contexts are built and inserted by (context, source, comment)."
+
+    @pytest.fixture
+    def duplicated_source(self, tmp_path):
+        content = TARGET_TS.read_text(encoding="utf-8").replace(
+            "</TS>",
+            "<context>\n    <name>Dialog</name>\n    <message>\n        <location filename=\"dialog.ui\" line=\"7\"/>\n"
+            "        <source>Watermark</source>\n        <translation type=\"unfinished\"></translation>\n    </message>\n</context>\n</TS>",
+        )
+        path = tmp_path / "duplicated.ts"
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    @pytest.mark.parametrize("clean", [True, False])
+    def test_build_with_repeated_source(self, offline_build, duplicated_source, clean):
+        inst = offline_build(source=duplicated_source, clean=clean)
+        inst.build()
+        qm = (inst.translations_folder / "es.qm").read_text(encoding="utf-8")
+        assert qm.count(pseudo_localize("Watermark")) == 2
+        if not clean:
+            assert len(translatables.format_for(inst.map["es"][1]).read(inst.map["es"][1])) == 68
+
+    def test_insertion_is_keyed(self, offline_build, duplicated_source):
+        inst = offline_build(source=duplicated_source, clean=False, revise_after_build=True)
+        inst.build()
+        path = inst.map["es"][1]
+        fmt = translatables.format_for(path)
+        groups = fmt.read(path)
+        groups[-1]["TRANSLATION"] = "Marca de agua (diálogo)"
+        fmt.write(path, reversed(groups))           # order no longer matters
+
+        QAutoLinguist._process_insertion_from_source(inst.map["es"][0], path, debug=False)
+        ts = inst.map["es"][0].read_text(encoding="utf-8")
+        assert ts.index("Marca de agua (diálogo)") > ts.index("<name>Dialog</name>")
+
+    def test_missing_message_fails(self, offline_build):
+        inst = offline_build(clean=False, revise_after_build=True)
+        inst.build()
+        path = inst.map["es"][1]
+        fmt = translatables.format_for(path)
+        fmt.write(path, fmt.read(path)[1:])
+        with pytest.raises(exceptions.TranslationFailed, match="MainWindow::'MainWindow'"):
+            QAutoLinguist._process_insertion_from_source(inst.map["es"][0], path, debug=False)
+
+
+class TestBuildManifest:
+
+    def test_rebuild_skips_up_to_date_locales(self, offline_build, tmp_path):
+        offline_build(clean=True).build()
+        manifest = BuildManifest.load(tmp_path)
+        assert manifest.engine == "pseudo"
+        assert set(manifest.locales) == {"es", "fr"}
+        assert manifest.stale_locales() == []
+
+        inst = offline_build(clean=True)
+        inst.build()
+        assert inst.map == {}
+
+        (tmp_path / "translations" / "es.qm").write_text("edited", encoding="utf-8")
+        inst = offline_build(clean=True)
+        inst.build()
+        assert list(inst.map) == ["es"]
+        assert "Watermark" in (tmp_path / "translations" / "es.qm").read_text(encoding="utf-8")
+
+    def test_engine_change_invalidates_locales(self, offline_build, tmp_path):
+        offline_build(clean=True).build()
+        manifest = BuildManifest.load(tmp_path)
+        manifest.engine = "google"          # as if the previous build used another engine
+        manifest.save()
+
+        inst = offline_build(clean=True)
+        inst.build()
+        assert sorted(inst.map) == ["es", "fr"]
+
+    def test_compose_only_recompiles_edited_translatables(self, offline_build, tmp_path):
+        inst = offline_build(clean=False, revise_after_build=True)
+        inst.build()
+
+        assert QAutoLinguist.compose_qm_files(cache_dir=tmp_path) == ["es", "fr"]
+        assert QAutoLinguist.compose_qm_files(cache_dir=tmp_path) == []
+
+        es_translatable = inst.map["es"][1]
+        translations = translatables.format_for(es_translatable).translations(es_translatable)
+        translations[0] = "Editado"
+        translatables.format_for(es_translatable).update_translations(es_translatable, translations)
+
+        assert QAutoLinguist.compose_qm_files(cache_dir=tmp_path) == ["es"]
+        assert "Editado" in (tmp_path / "translations" / "es.qm").read_text(encoding="utf-8")
+
+    def test_compose_after_clean_build(self, offline_build, tmp_path):
+        offline_build(clean=True).build()
+        assert BuildManifest.load(tmp_path).nodes() == {"es": (None, None), "fr": (None, None)}
+        with pytest.raises(exceptions.QALBaseException, match="clean=False"):
+            QAutoLinguist.compose_qm_files(cache_dir=tmp_path)
+
+    def test_compose_skips_incomplete_locales(self, offline_build, tmp_path, capsys):
+        inst = offline_build(clean=False, revise_after_build=True)
+        inst.build()
+        inst.map["fr"][1].unlink()
+
+        assert QAutoLinguist.compose_qm_files(cache_dir=tmp_path) == ["es"]
+        assert "Skipping 'fr'" in capsys.readouterr().out
+
+
+class TestRevisedCompose:
+
+    def test_patch_translations_only_touches_changed_elements(self, tmp_path):
+        ts_file = tmp_path / "es.ts"
+        shutil.copy(TARGET_TS, ts_file)
+        original = ts_file.read_text(encoding="utf-8")
+        expected = original.count("<translation ")
+
+        QAutoLinguist._patch_translations_in_ts(ts_file, {1: "Uno & <dos>"}, expected)
+        patched = ts_file.read_text(encoding="utf-8")
+
+        assert '<translation type="Finished">Uno &amp; &lt;dos&gt;</translation>' in patched
+        assert patched.count('<translation type="unfinished"></translation>') == expected - 1
+        assert len(patched) - len(original) == len('<translation type="Finished">Uno &amp; &lt;dos&gt;</translation>') - len(
+            '<translation type="unfinished"></translation>'
+        )
+
+    def test_patch_translations_count_mismatch(self, tmp_path):
+        ts_file = tmp_path / "es.ts"
+        shutil.copy(TARGET_TS, ts_file)
+        with pytest.raises(exceptions.TranslationFailed):
+            QAutoLinguist._patch_translations_in_ts(ts_file, {0: "x"}, 1)
+
+    def test_compose_patches_edited_translations(self, offline_build, tmp_path, monkeypatch):
+        inst = offline_build(clean=False, revise_after_build=True)
+        inst.build()
+        QAutoLinguist.compose_qm_files(cache_dir=tmp_path)
+
+        full_insertions = []
+        monkeypatch.setattr(
+            QAutoLinguist, "_insert_translated_sources", staticmethod(lambda *args, **kwargs: full_insertions.append(args))
+        )
+        es_translatable = inst.map["es"][1]
+        fmt = translatables.format_for(es_translatable)
+        translations = fmt.translations(es_translatable)
+        translations[2] = "Editado"
+        fmt.update_translations(es_translatable, translations)
+
+        assert QAutoLinguist.compose_qm_files(cache_dir=tmp_path) == ["es"]
+        assert full_insertions == []
+        ts_content = inst.map["es"][0].read_text(encoding="utf-8")
+        assert "Editado" in ts_content
+        assert escape(translations[3]) in ts_content
+
+        fmt.update_translations(es_translatable, translations)       # saved again without edits
+        assert QAutoLinguist.compose_qm_files(cache_dir=tmp_path) == []
+
+
+class TestWatchSession:
+
+    @pytest.fixture
+    def session(self, offline_build, tmp_path):
+        source = tmp_path / "app.ts"
+        shutil.copy(TARGET_TS, source)
+        rebuilds = []
+        session = WatchSession(offline_build(source=source), debounce=0.5, on_rebuild=lambda kind, locales: rebuilds.append((kind, locales)))
+        session.process({source})
+        session.rebuilds = rebuilds
+        return session
+
+    def test_source_change_only_translates_new_messages(self, session):
+        qal = session.qal
+        assert session.rebuilds == [("sources", ["es", "fr"])]
+        messages = qal.instrumentation.locale_counters["es"]["messages"]
+
+        content = qal.source_file.read_text(encoding="utf-8")
+        qal.source_file.write_text(content.replace("<source>Watermark</source>", "<source>Brand new</source>", 1), encoding="utf-8")
+
+        assert session.step(now=0.0) is None            # debounced
+        assert session.step(now=0.1) is None
+        assert session.step(now=1.0) == "sources"
+        assert qal.instrumentation.locale_counters["es"]["messages"] == messages + 1
+        assert pseudo_localize("Brand new") in (qal.translations_folder / "es.qm").read_text(encoding="utf-8")
+        assert session.step(now=2.0) is None             # files written by the rebuild are not changes
+
+    def test_translatable_edit_recompiles_locale(self, session):
+        qal = session.qal
+        es_translatable = qal.map["es"][1]
+        fmt = translatables.format_for(es_translatable)
+        groups = fmt.read(es_translatable)
+        groups[0]["TRANSLATION"] = "Editado"
+        fmt.write(es_translatable, groups)
+
+        session.step(now=0.0)
+        assert session.step(now=1.0) == "translatables"
+        assert session.rebuilds[-1] == ("translatables", ["es"])
+        assert qal.translation_memory["es"][groups[0]["SOURCE"]] == "Editado"
+        assert "Editado" in (qal.translations_folder / "es.qm").read_text(encoding="utf-8")
+
+
+class TestBatchRunner:
+
+    @pytest.fixture
+    def projects(self, offline_build, tmp_path):
+        configs = []
+        for name in ("app_a", "app_b"):
+            folder = tmp_path / name
+            (folder / "translations").mkdir(parents=True)
+            shutil.copy(TARGET_TS, folder / "app.ts")
+            config = folder / ".qal_config.ini"
+            config.write_text(
+                "[Required]\nsource_file= app.ts\ndefault_locale= en\navailable_locales= ['es', 'fr']\n"
+                "[Optionals]\ntranslations_folder= translations\nengine= pseudo\nclean= true\ndebug_mode= false\n",
+                encoding="utf-8",
+            )
+            configs.append(config)
+        return configs
+
+    def test_default_output_folders_per_project(self, offline_build, tmp_path, monkeypatch):
+        monkeypatch.setattr(consts, "CMD_CWD", tmp_path)        # QAutoLinguist default for translations_folder
+        configs = []
+        for name in ("app_a", "app_b"):
+            folder = tmp_path / name
+            folder.mkdir()
+            shutil.copy(TARGET_TS, folder / "app.ts")
+            config = folder / ".qal_config.ini"
+            config.write_text(
+                "[Required]\nsource_file= app.ts\ndefault_locale= en\navailable_locales= ['es', 'fr']\n"
+                "[Optionals]\nengine= pseudo\nclean= true\ndebug_mode= false\n",
+                encoding="utf-8",
+            )
+            configs.append(config)
+
+        results = BatchRunner(configs, jobs=2, lrelease_workers=2).run()
+        assert [result.error for result in results] == [None, None]
+        for config in configs:
+            assert sorted(p.name for p in (config.parent / "translations").glob("*.qm")) == ["es.qm", "fr.qm"]
+            assert (config.parent / ".qal_cache" / "manifest.json").exists()
+        assert not (tmp_path / "translations").exists()
+
+    def test_discover(self, projects, tmp_path):
+        assert BatchRunner.discover(["*/.qal_config.ini"], root=tmp_path) == projects
+        assert BatchRunner.discover(["app_a"], root=tmp_path) == projects[:1]
+
+    def test_projects_share_engine_and_translation_memory(self, projects):
+        runner = BatchRunner(projects, jobs=1, lrelease_workers=2)
+        results = runner.run()
+        report = runner.report()
+
+        assert [result.ok for result in results] == [True, True]
+        for config in projects:
+            assert sorted(p.name for p in (config.parent / "translations").glob("*.qm")) == ["es.qm", "fr.qm"]
+            assert (config.parent / ".qal_cache" / "manifest.json").exists()
+        assert report["engines_built"] == 1
+        assert "messages" not in results[1].counters             # every string was translated by the first project
+        assert results[1].counters["memory_hits"] == results[0].counters["messages"]
+        assert report["coalescer"]["sent"] == results[0].counters["messages"]
+
+    def test_failed_project_does_not_stop_batch(self, projects):
+        (projects[0].parent / "app.ts").unlink()
+        results = BatchRunner(projects, jobs=2).run()
+        assert [result.ok for result in results] == [False, True]
+        assert results[0].error
+
+
+class TestBuildPlan:
+
+    @pytest.fixture
+    def project(self, offline_build, tmp_path):
+        folder = tmp_path / "app"
+        (folder / "translations").mkdir(parents=True)
+        shutil.copy(TARGET_TS, folder / "app.ts")
+        config = folder / ".qal_config.ini"
+        config.write_text(
+            "[Required]\nsource_file= app.ts\ndefault_locale= en\navailable_locales= ['es', 'fr']\n"
+            "[Optionals]\ntranslations_folder= translations\nengine= pseudo\nclean= true\ndebug_mode= false\n",
+            encoding="utf-8",
+        )
+        return config
+
+    def test_plan_without_previous_build(self, project):
+        plan = BuildPlan.from_config(project).to_dict()
+        assert plan["sources"]["messages"] == 67 and plan["sources"]["exact"]
+        assert {entry["reason"] for entry in plan["locales"].values()} == {"no previous build"}
+        assert plan["totals"]["stale"] == 2
+        assert plan["totals"]["messages"] == 2 * plan["sources"]["unique"]
+        assert plan["totals"]["requests"] == {"pseudo": 0}      # offline engine
+
+    def test_plan_after_build(self, project):
+        BatchRunner([project], jobs=1).run()
+        plan = BuildPlan.from_config(project)
+        assert plan.stale == []
+        assert plan.to_dict()["totals"]["characters"] == 0
+
+        (project.parent / "translations" / "es.qm").unlink()
+        plan = BuildPlan.from_config(project).to_dict()
+        assert plan["locales"]["es"]["reason"] == "qm missing or modified"
+        assert plan["locales"]["fr"]["status"] == "fresh"
+
+    def test_estimate_requests(self):
+        assert estimate_requests("google", ["Open", "Save"]) == 1
+        assert estimate_requests("mymemory", ["x" * 300, "y" * 300]) == 2
+        assert estimate_requests("pseudo", ["Open"]) == 0
+
+    def test_cli(self, project):
+        from click.testing import CliRunner
+        from qautolinguist.cli import qautolinguist
+
+        result = CliRunner().invoke(qautolinguist, ["build", "plan", str(project)])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.output)["totals"]["stale"] == 2
+
+
+class TestSharding:
+
+    @pytest.fixture
+    def project(self, offline_build, tmp_path):
+        folder = tmp_path / "app"
+        (folder / "translations").mkdir(parents=True)
+        shutil.copy(TARGET_TS, folder / "app.ts")
+        config = folder / ".qal_config.ini"
+        config.write_text(
+            "[Required]\nsource_file= app.ts\ndefault_locale= en\navailable_locales= ['es', 'fr']\n"
+            "[Optionals]\ntranslations_folder= translations\nengine= pseudo\nclean= true\ndebug_mode= false\n",
+            encoding="utf-8",
+        )
+        return config
+
+    def test_plan_units(self, project, tmp_path):
+        shards = ShardSet.plan(project, tmp_path / "shards", max_messages=20)
+        unique = BuildPlan.from_config(project).to_dict()["sources"]["unique"]
+        per_locale = -(-unique // 20)
+        assert len(shards.unit_ids) == 2 * per_locale
+        assert shards.unit_ids[0] == "es-0000"
+        units = [shards.load_unit(unit_id) for unit_id in shards.unit_ids[:per_locale]]
+        assert sum(len(unit.sources) for unit in units) == unique
+        assert ShardSet(tmp_path / "shards").status()["pending"] == len(shards.unit_ids)
+
+        with pytest.raises(exceptions.QALBaseException):
+            ShardSet.plan(project, tmp_path / "shards")
+
+    def test_workers_share_units(self, project, tmp_path):
+        shards = ShardSet.plan(project, tmp_path / "shards", max_messages=20)
+        first, second = ShardWorker(shards, worker_id="a"), ShardWorker(ShardSet(shards.root), worker_id="b")
+        done_a, _ = first.run(limit=1)
+        done_b, failed = second.run()
+        assert failed == {}
+        assert sorted(done_a + done_b) == sorted(shards.unit_ids)
+        assert shards.claim(shards.unit_ids[0], "c") is False       # already done
+        assert first.run() == ([], {})
+
+    def test_failed_unit_is_released(self, project, tmp_path, monkeypatch):
+        shards = ShardSet.plan(project, tmp_path / "shards", max_messages=100, locales=["es"])
+        worker = ShardWorker(shards)
+        monkeypatch.setattr(worker, "translate_unit", lambda unit: 1 / 0)
+        done, failed = worker.run()
+        assert done == [] and list(failed) == ["es-0000"]
+        assert shards.status()["pending"] == 1
+
+        with pytest.raises(exceptions.QALBaseException):
+            shards.merge()
+
+    def test_merge_build_does_not_translate(self, project, tmp_path):
+        shards = ShardSet.plan(project, tmp_path / "shards", max_messages=20)
+        ShardWorker(shards).run()
+        qal = shards.merge_build()
+        assert qal.instrumentation.counters.get("messages", 0) == 0
+        assert qal.instrumentation.counters["memory_hits"] > 0
+        qm = (project.parent / "translations" / "es.qm").read_text(encoding="utf-8")
+        assert pseudo_localize("Watermark") in qm
+        assert BuildPlan.from_config(project).stale == []
+
+
+class TestResume:
+
+    @pytest.fixture
+    def engine_calls(self, monkeypatch):
+        "Sizes of the batches sent to the pseudo engine. It fails on the call numbers added to ``engine_calls.fail_on``."
+        original = PseudoTranslator.translate_batch
+
+        class Calls(list):
+            fail_on = set()
+
+        calls = Calls()
+
+        def translate_batch(self, batch, **kwargs):
+            calls.append(len(batch))
+            if len(calls) in calls.fail_on:
+                raise RuntimeError("429 Too Many Requests")
+            return original(self, batch, **kwargs)
+
+        monkeypatch.setattr(PseudoTranslator, "translate_batch", translate_batch)
+        return calls
+
+    def test_failed_build_keeps_journal(self, offline_build, tmp_path, engine_calls):
+        engine_calls.fail_on.add(3)
+        with pytest.raises(exceptions.QALBaseException, match="--resume"):
+            offline_build(checkpoint_size=20).build()
+
+        journal = BuildJournal(tmp_path)
+        assert journal.exists()
+        assert {key: len(entries) for key, entries in journal.load("pseudo", "en").items()} == {"es": 40}
+        assert journal.load("google", "en") == {}
+
+    def test_resume_only_translates_missing_chunks(self, offline_build, tmp_path, engine_calls):
+        engine_calls.fail_on.add(3)
+        with pytest.raises(exceptions.QALBaseException):
+            offline_build(checkpoint_size=20).build()
+        unique = len(set(Catalog.from_ts(TARGET_TS).sources()))
+
+        engine_calls.clear()
+        engine_calls.fail_on.clear()
+        inst = offline_build(checkpoint_size=20, resume=True)
+        inst.build()
+        assert inst.instrumentation.counters["resumed_messages"] == 40
+        assert sum(engine_calls) == 2 * unique - 40
+        assert sorted(p.name for p in inst.translations_folder.glob("*.qm")) == ["es.qm", "fr.qm"]
+        assert not BuildJournal(tmp_path).exists()      # removed once the build succeeds
+
+    def test_new_build_ignores_old_journal(self, offline_build, tmp_path, engine_calls):
+        engine_calls.fail_on.add(2)
+        with pytest.raises(exceptions.QALBaseException):
+            offline_build(checkpoint_size=20).build()
+
+        engine_calls.clear()
+        engine_calls.fail_on.clear()
+        inst = offline_build(checkpoint_size=20)
+        inst.build()
+        assert inst.instrumentation.counters.get("resumed_messages", 0) == 0
+        assert sum(engine_calls) == 2 * len(set(Catalog.from_ts(TARGET_TS).sources()))
+
+    def test_journal_ignores_cut_line(self, tmp_path):
+        journal = BuildJournal(tmp_path)
+        journal.append("es", ["Open", "Save"], ["Abrir", "Guardar"], engine="google", default_locale="en")
+        journal.append("es>en", ["Abrir"], ["Open"], engine="google", default_locale="en")
+        journal.close()
+        with open(journal.path, mode="a", encoding="utf-8") as fp:
+            fp.write('{"engine": "google", "default_locale": "en", "memory": "fr", "sour')
+        assert journal.load("google", "en") == {"es": {"Open": "Abrir", "Save": "Guardar"}, "es>en": {"Abrir": "Open"}}
+        journal.discard()
+        assert not journal.exists()
+
+    def test_disabled(self, offline_build, tmp_path, engine_calls):
+        inst = offline_build(checkpoint_size=0)
+        inst.build()
+        assert len(engine_calls) == 2           # one batch per locale, nothing journaled
+        assert not BuildJournal(tmp_path).exists()
+
+
+
+class TestProgress:
+
+    def test_jsonl_progress_of_build(self, offline_build):
+        stream = io.StringIO()
+        first = Catalog.from_ts(TARGET_TS).sources()[0]
+        inst = offline_build(translation_memory={"es": {first: "Primero"}})
+        inst.run_build_with_bar(JsonLinesRenderer(stream))
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        stages = [event["stage"] for event in events if event["event"] == "stage_start"]
+        assert "translate_translatables" in stages and "create_qm_files" in stages
+
+        final = events[-1]
+        total = len(Catalog.from_ts(TARGET_TS).sources())
+        assert final["event"] == "done" and final["error"] is None
+        assert final["locales"] == {"es": {"done": total, "total": total}, "fr": {"done": total, "total": total}}
+        assert final["characters"] == inst.instrumentation.counters["characters"]
+        assert 0 < final["cache_hit_rate"] < 1          # one message of es is taken from the translation memory
+        assert not inst.instrumentation._counter_hooks
+
+    def test_failed_build_reports_error(self, offline_build, monkeypatch, capsys):
+        def fail(self, batch, **kwargs):
+            raise RuntimeError("429 Too Many Requests")
+
+        monkeypatch.setattr(PseudoTranslator, "translate_batch", fail)
+        with pytest.raises(exceptions.QALBaseException):
+            offline_build().build(with_progress_bar=True, progress_format="jsonl")
+
+        final = json.loads(capsys.readouterr().out.splitlines()[-1])
+        assert final["event"] == "failed" and "429" in final["error"]
+
+    def test_cli_stdout_is_only_json(self, offline_build, tmp_path, monkeypatch):
+        from click.testing import CliRunner
+        from qautolinguist.cli import qautolinguist
+
+        monkeypatch.setattr(consts, "CMD_CWD", tmp_path)        # default cache_dir of the CLI build
+        shutil.copy(TARGET_TS, tmp_path / "app.ts")
+        config = tmp_path / ".qal_config.ini"
+        config.write_text(
+            "[Required]\nsource_file= app.ts\ndefault_locale= en\navailable_locales= ['es', 'fr']\n"
+            "[Optionals]\ntranslations_folder= translations\nengine= pseudo\nclean= true\ndebug_mode= true\n",
+            encoding="utf-8",
+        )
+        result = CliRunner().invoke(qautolinguist, ["build", "run", str(config), "--progress", "jsonl"])
+        assert result.exit_code == 0, result.output
+
+        events = [json.loads(line) for line in result.stdout.splitlines()]
+        assert events[-1]["event"] == "done"
+        assert "Preparing build" in result.stderr           # logs are still shown, on stderr
+
+
+class TestEngineRouting:
+
+    class FrenchPseudoTranslator(PseudoTranslator):
+        "Offline engine that only translates from English into French."
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self._languages = {"english": "en", "french": "fr"}
+            self._supported_languages = list(self._languages)
+
+    def test_failover_build_routes_each_locale(self, offline_build, monkeypatch):
+        monkeypatch.setattr(MATranslator, "_check_connection", lambda self: True)
+        with MockTranslationServer() as server:
+            inst = offline_build(
+                engine="failover",
+                failover_engines=[self.FrenchPseudoTranslator(), server.attach(GoogleTranslator())],
+                routing_weights={"cost": 1.0, "latency": 0.0},       # ties are broken by the order of failover_engines
+            )
+            router = inst.translator._translator.router
+            assert router.priorities(["es", "fr"]) == {"es": ["google"], "fr": ["frenchpseudo", "google"]}
+
+            events = []
+            inst.translator.add_hook(events.append)
+            inst.build()
+
+        engines = {(event.target, event.engine) for event in events if event.kind == "request"}
+        assert engines == {("es", "GoogleTranslator"), ("fr", "FrenchPseudoTranslator")}
+        assert sorted(p.name for p in inst.translations_folder.glob("*.qm")) == ["es.qm", "fr.qm"]
+        assert server.stats["requests"] >= 1
+
+    def test_engine_options(self):
+        assert QAutoLinguist.engine_options("google", ["deepl"], {"cost": 0.0}) == {}
+        assert QAutoLinguist.engine_options("failover", ["deepl", "google"], None) == {"engines": ["deepl", "google"]}
+        router = MATranslator("failover", check_connection=False, engines=["google", "pseudo"])._translator.router
+        assert router.ranking("es") == ["pseudo", "google"]
+
+    def test_unknown_routing_weight(self):
+        with pytest.raises(exceptions.InvalidEngine, match="speed"):
+            MATranslator("failover", check_connection=False, routing_weights={"speed": 1.0})
@@ -0,0 +1,109 @@
+import sys
+import pytest
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+from qautolinguist.catalog import Catalog
+
+ROOT = Path(__file__).parent
+TARGET_TS = ROOT / "targets" / "test.ts"
+
+DUPLICATED_TS = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE TS>
+<TS version="2.1">
+<context>
+    <name>MainWindow</name>
+    <message>
+        <location filename="main.ui" line="20"/>
+        <location filename="main.ui" line="31"/>
+        <source>Open</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="main.ui" line="40"/>
+        <source>Close</source>
+        <comment>window</comment>
+        <translation type="unfinished"></translation>
+    </message>
+</context>
+<context>
+    <name>Dialog</name>
+    <message>
+        <location filename="dialog.ui" line="7"/>
+        <source>Open</source>
+        <translation type="unfinished"></translation>
+    </message>
+</context>
+</TS>
+"""
+
+
+@pytest.fixture
+def duplicated_ts(tmp_path):
+    path = tmp_path / "en.ts"
+    path.write_text(DUPLICATED_TS, encoding="utf-8")
+    return path
+
+
+class TestCatalog:
+
+    def test_from_ts(self):
+        catalog = Catalog.from_ts(TARGET_TS)
+        assert len(catalog) == 67
+        first = catalog[0]
+        assert first.key == ("MainWindow", "MainWindow", None)
+        assert first.lines == (20,)
+        assert first.filename == "resources/GUI_Window.ui"
+        assert catalog.sources()[:3] == ["MainWindow", "Watermark", "Type here the text to be added to the files"]
+
+    def test_relative_locations(self, tmp_path):
+        path = tmp_path / "en.ts"
+        path.write_text(
+            DUPLICATED_TS
+            .replace('filename="main.ui" line="31"', 'line="+11"')
+            .replace('filename="main.ui" line="40"', 'line="+9"')
+            .replace('filename="main.ui" line="20"', 'filename="main.ui" line="+20"'),
+            encoding="utf-8",
+        )
+        assert [(message.filename, message.lines) for message in Catalog.from_ts(path)] == [
+            ("main.ui", (20, 31)), ("main.ui", (40,)), ("dialog.ui", (7,))
+        ]
+
+    def test_messages_are_compact(self):
+        catalog = Catalog.from_ts(TARGET_TS)
+        assert not hasattr(catalog[0], "__dict__")
+        assert all(message.context is catalog[0].context for message in catalog)     # interned
+        assert sys.getsizeof(catalog[0]) < sys.getsizeof({"location": "", "SOURCE": "", "TRANSLATION": ""})
+
+    def test_contexts_and_comments(self, duplicated_ts):
+        catalog = Catalog.from_ts(duplicated_ts)
+        assert [message.key for message in catalog] == [
+            ("MainWindow", "Open", None),
+            ("MainWindow", "Close", "window"),
+            ("Dialog", "Open", None),
+        ]
+        assert catalog[0].lines == (20, 31)
+
+    def test_index(self, duplicated_ts):
+        catalog = Catalog.from_ts(duplicated_ts)
+        assert catalog.position(("Dialog", "Open", None)) == 2
+        assert catalog.position(("MainWindow", "Close", None)) is None      # comment is part of the key
+        assert ("MainWindow", "Close", "window") in catalog
+        assert catalog.keyed(["Abrir", "Cerrar", "Abrir diálogo"])[("Dialog", "Open", None)] == "Abrir diálogo"
+
+    def test_groups(self, duplicated_ts):
+        catalog = Catalog.from_ts(duplicated_ts)
+        groups = list(catalog.groups("main.ui", ["Abrir", "Cerrar", "Abrir diálogo"]))
+        assert groups[0] == {
+            "location": "line ['20', '31'] extracted from 'main.ui'", "context": "MainWindow", "SOURCE": "Open", "TRANSLATION": "Abrir"
+        }
+        assert groups[1]["comment"] == "window"
+        assert [Catalog.group_key(group) for group in groups] == [message.key for message in catalog]
+        assert next(catalog.groups("main.ui"))["TRANSLATION"] == "Open"
+        assert Catalog.group_key({"SOURCE": "Open", "TRANSLATION": "Abrir"}) is None
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / "broken.ts"
+        path.write_text("<TS><context>", encoding="utf-8")
+        with pytest.raises(ET.ParseError):
+            Catalog.from_ts(path)
@@ -4,7 +4,7 @@
 
 from pathlib import Path
 from qautolinguist.qal import QAutoLinguist
-from qautolinguist.config import Config
+from qautolinguist.config import Config, compiled_schema
 
 ROOT = Path(__file__).parent
 VALID_ROOT = ROOT / "valid"
@@ -66,6 +66,24 @@ def test_create_without_overwrite(self):
             inst.create(VALID_ROOT / "testing_config_overwrites.ini", overwrite=False)
         os.remove(VALID_ROOT / "testing_config_overwrites.ini")
     
+    def test_schema_compiled_once(self, monkeypatch):
+        schema = compiled_schema()
+        assert compiled_schema() is schema
+        assert schema["clean"].parse(" Yes ") is True
+        assert schema["available_locales"].parse("['es', 'fr']") == ["es", "fr"]
+        assert schema["source_file"].parse("   ") is None
+
+        monkeypatch.setattr("qautolinguist.config.import_resources.open_text", lambda *a, **k: pytest.fail("resource read again"))
+        assert Config().load_config(VALID_CONFIG_FILE)["available_locales"] == ["es"]
+
+    def test_load_many(self):
+        errors = {}
+        contents = Config.load_many([VALID_CONFIG_FILE, INVALID_ROOT / "miswritten_booleans.ini"], errors=errors)
+        assert list(contents) == [VALID_CONFIG_FILE.resolve()]
+        assert isinstance(errors[(INVALID_ROOT / "miswritten_booleans.ini").resolve()], qal_excs.ConfigWrongParamFormat)
+        with pytest.raises(qal_excs.ConfigWrongParamFormat):
+            Config.load_many([INVALID_ROOT / "miswritten_booleans.ini"])
+
     @pytest.mark.skip(reason="Being developed")
     def test_create_with_overwrite(self):
         inst = Config()
@@ -0,0 +1,287 @@
+import pytest
+import threading
+import time
+import qautolinguist.exceptions as qal_excs
+import qautolinguist.translators.exceptions as api_excs
+
+from qautolinguist.translator import MATranslator
+from qautolinguist.translators import GoogleTranslator, MyMemoryTranslator, DeeplTranslator, PseudoTranslator, FailoverTranslator, SILENT_SEPARATORS
+from qautolinguist.translators.engines import __engines__
+from qautolinguist.translators.metrics import MetricsAggregator, TranslatorEvent, percentile
+from qautolinguist.translators.coalescer import RequestCoalescer
+from qautolinguist.translators.routing import LanguageRouter
+from qautolinguist.translators.mock_server import MockTranslationServer
+from qautolinguist.translators.pseudo import pseudo_localize
+
+
+SAMPLE = [
+    "Open file",
+    "Save",
+    "<html><head/><body><p>Cleans the textEdit</p></body></html>",
+    "Deleted %1 items",
+]
+
+
+class TestPseudoEngine:
+    "Offline engine tests. None of them require network access."
+
+    def test_registered_in_engines(self):
+        assert __engines__["pseudo"] is PseudoTranslator
+
+    def test_preserves_tags_and_placeholders(self):
+        result = pseudo_localize("<b>Deleted %1 items</b>")
+        assert result.startswith("[<b>") and result.endswith("]")
+        assert "%1" in result
+        assert "Deleted" not in result
+
+    def test_batch_keeps_alignment(self):
+        result = PseudoTranslator().translate_batch(SAMPLE, target_lang="es", source_lang="en")
+        assert len(result) == len(SAMPLE)
+        assert all(r.startswith("[") and r.endswith("]") for r in result)
+
+    def test_ma_translator_offline(self):
+        translator = MATranslator("pseudo")
+        assert translator.translate_batch(["Save"], target_lang="fr", source_lang="en") == [pseudo_localize("Save")]
+
+    def test_unknown_engine(self):
+        with pytest.raises(qal_excs.InvalidEngine):
+            MATranslator("unknown")
+
+
+class TestMockServer:
+    "Checks the mock server emulates the response shapes expected by each engine."
+
+    @pytest.mark.parametrize("engine, source, target", [
+        (GoogleTranslator, "en", "es"),
+        (MyMemoryTranslator, "en-GB", "es-ES"),
+    ])
+    def test_public_engines(self, engine, source, target):
+        with MockTranslationServer() as server:
+            translator = server.attach(engine(source=source, target=target))
+            result = translator.translate_batch(SAMPLE[:2], target_lang=target, source_lang=source)
+        assert result == [pseudo_localize(text) for text in SAMPLE[:2]]
+
+    def test_deepl(self):
+        with MockTranslationServer() as server:
+            translator = server.attach(DeeplTranslator(api_key="mock-key"))
+            assert translator.translate_batch(["Save"], target_lang="es", source_lang="en") == [pseudo_localize("Save")]
+
+    def test_throttling(self):
+        with MockTranslationServer(error_rate=1.0) as server:
+            translator = server.attach(GoogleTranslator(source="en", target="es"))
+            with pytest.raises(api_excs.TooManyRequests):
+                translator.translate("Save")
+        assert server.stats["throttled"] == 1
+
+    def test_misalignment_falls_back_to_each_item(self):
+        with MockTranslationServer(misalign_rate=1.0) as server:
+            translator = server.attach(GoogleTranslator())
+            result = translator.translate_batch(SAMPLE[:2], target_lang="es", source_lang="en")
+        assert result == [pseudo_localize(text) for text in SAMPLE[:2]]
+        assert server.stats["misaligned"] >= 1
+
+
+class TestTranslatorMetrics:
+    "Checks request and batch events emitted by BaseTranslator hooks."
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([], 99) == 0.0
+
+    def test_joined_path(self):
+        translator = PseudoTranslator()
+        metrics = MetricsAggregator()
+        translator.add_hook(metrics)
+        translator.translate_batch(SAMPLE, target_lang="es", source_lang="en")
+
+        summary = metrics.summary()
+        assert summary["requests"] == 1
+        assert summary["paths"]["joined"]["time_share"] == 1.0
+        assert summary["payload_bytes"] > 0
+
+    def test_fallback_paths(self):
+        with MockTranslationServer(misalign_rate=1.0) as server:
+            translator = server.attach(GoogleTranslator())
+            metrics = MetricsAggregator()
+            translator.add_hook(metrics)
+            translator.translate_batch(SAMPLE[:2], target_lang="es", source_lang="en")
+
+        summary = metrics.summary()
+        assert summary["paths"]["joined"]["requests"] == 1
+        assert summary["paths"]["separator_retry"]["requests"] == len(SILENT_SEPARATORS) - 1
+        assert summary["paths"]["each"]["requests"] == 2
+        assert summary["requests"] == len(SILENT_SEPARATORS) + 2
+        assert set(summary["latency"]) == {"p50", "p90", "p95", "p99"}
+
+    def test_failed_each_item_fallback(self, monkeypatch):
+        def not_found(self, text):
+            raise api_excs.TranslationNotFound(text)
+
+        translator = PseudoTranslator()
+        metrics = MetricsAggregator()
+        translator.add_hook(metrics)
+        monkeypatch.setattr(PseudoTranslator, "translate", not_found)
+        with pytest.raises(api_excs.TranslationNotFound):
+            translator.translate_batch(SAMPLE[:2], target_lang="es", source_lang="en", fast_translation=False)
+
+        batch = [event for event in metrics.events if event.kind == "batch"]
+        assert [(event.path, event.error) for event in batch] == [("each", "TranslationNotFound")]
+        assert metrics.summary()["paths"]["each"]["failed_batches"] == 1
+
+    def test_aggregates_are_bounded(self):
+        metrics = MetricsAggregator(reservoir_size=100, recent=10)
+        for i in range(10_000):
+            metrics(TranslatorEvent("request", "pseudo", "en", "es", "joined", latency=(i % 100 + 1) / 1000, payload_bytes=2))
+            metrics(TranslatorEvent("batch", "pseudo", "en", "es", "joined", latency=0.5))
+
+        summary = metrics.summary()
+        assert summary["requests"] == 10_000 and summary["payload_bytes"] == 20_000
+        assert summary["paths"]["joined"]["time"] == 5000.0
+        assert len(metrics.events) == 10
+        assert len(metrics._overall.latencies) == len(metrics._paths["joined"].latencies) == 100
+        assert 0.03 < summary["latency"]["p50"] < 0.07          # sampled from a uniform 1..100 ms distribution
+
+        metrics.reset()
+        assert metrics.summary()["requests"] == 0 and not metrics.events
+
+
+class TestRequestCoalescer:
+
+    def test_reuses_translated_texts(self):
+        sent = []
+        def translate(texts):
+            sent.append(list(texts))
+            return [text.upper() for text in texts]
+
+        coalescer = RequestCoalescer()
+        assert coalescer.translate(translate, ["a", "b", "a"], source="en", target="es") == ["A", "B", "A"]
+        assert coalescer.translate(translate, ["b", "c"], source="en", target="es") == ["B", "C"]
+        assert coalescer.translate(translate, ["b"], source="en", target="fr") == ["B"]
+        assert sent == [["a", "b"], ["c"], ["b"]]
+        assert coalescer.stats()["sent"] == 4
+
+    def test_awaits_texts_in_flight(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+        def slow_translate(texts):
+            calls.append(list(texts))
+            started.set()
+            release.wait(5)
+            return [text.upper() for text in texts]
+
+        coalescer = RequestCoalescer()
+        results = {}
+        first = threading.Thread(target=lambda: results.setdefault("first", coalescer.translate(slow_translate, ["Save", "Open"], source="en", target="es")))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.setdefault("second", coalescer.translate(slow_translate, ["Open", "Save"], source="en", target="es")))
+        second.start()
+        release.set()
+        first.join(5), second.join(5)
+
+        assert calls == [["Save", "Open"]]
+        assert results["second"] == ["OPEN", "SAVE"]
+        assert coalescer.stats()["awaited"] == 2
+
+    def test_failures_are_propagated_and_retried(self):
+        coalescer = RequestCoalescer()
+        def failing(texts):
+            raise RuntimeError("engine down")
+        with pytest.raises(RuntimeError):
+            coalescer.translate(failing, ["Save"], source="en", target="es")
+        assert coalescer.translate(lambda texts: ["Guardar"], ["Save"], source="en", target="es") == ["Guardar"]
+
+    def test_shared_between_translators(self):
+        coalescer = RequestCoalescer()
+        metrics = MetricsAggregator()
+        first, second = MATranslator("pseudo", coalescer=coalescer), MATranslator("pseudo", coalescer=coalescer)
+        second.add_hook(metrics)
+
+        expected = first.translate_batch(SAMPLE, target_lang="es", source_lang="en")
+        assert second.translate_batch(SAMPLE, target_lang="es", source_lang="en") == expected
+        assert metrics.summary()["requests"] == 0
+
+
+class TestFailoverTranslator:
+    "Google answers through the mock server, the offline pseudo engine is the fallback."
+
+    def test_registered_in_engines(self):
+        assert __engines__["failover"] is FailoverTranslator
+
+    def test_priority_order_per_language(self):
+        translator = FailoverTranslator(["google", "pseudo"], priorities={"es": ["pseudo"]})
+        assert translator.order_for("es") == ["pseudo", "google"]
+        assert translator.order_for("fr") == ["google", "pseudo"]
+
+    def test_fails_over_on_throttling(self):
+        metrics = MetricsAggregator()
+        with MockTranslationServer(error_rate=1.0) as server:
+            translator = FailoverTranslator([server.attach(GoogleTranslator()), "pseudo"])
+            translator.add_hook(metrics)
+            result = translator.translate_batch(SAMPLE, target_lang="es", source_lang="en")
+            translator.close()
+
+        assert result == [pseudo_localize(text) for text in SAMPLE]
+        assert server.stats["throttled"] >= 1
+        assert any(event.path == "failover" and event.error.startswith("google") for event in metrics.events)
+
+    def test_events_carry_translated_locale(self):
+        metrics = MetricsAggregator()
+        with MockTranslationServer(error_rate=1.0) as server:
+            translator = FailoverTranslator([server.attach(GoogleTranslator()), "pseudo"])
+            translator.add_hook(metrics)
+            for target in ("es", "fr"):
+                translator.translate_batch(SAMPLE[:2], target_lang=target, source_lang="en")
+            translator.close()
+
+        failovers = [(event.source, event.target) for event in metrics.events if event.path == "failover"]
+        assert failovers == [("en", "es"), ("en", "fr")]
+
+    def test_unknown_engine(self):
+        with pytest.raises(qal_excs.InvalidEngine):
+            FailoverTranslator(["google", "babelfish"])
+
+    def test_hedges_slow_engine(self):
+        with MockTranslationServer(latency=1.0) as server:
+            translator = FailoverTranslator([server.attach(GoogleTranslator()), "pseudo"], hedge_after=0.05)
+            metrics = MetricsAggregator()
+            translator.add_hook(metrics)
+            start = time.perf_counter()
+            result = translator.translate_batch(SAMPLE, target_lang="es", source_lang="en")
+            elapsed = time.perf_counter() - start
+            translator.close()
+
+        assert result == [pseudo_localize(text) for text in SAMPLE]
+        assert elapsed < 0.9
+        assert [event.path for event in metrics.events if event.path == "hedge"] == ["hedge"]
+
+
+class TestLanguageRouter:
+
+    def test_routes_to_engines_supporting_locale(self):
+        router = LanguageRouter(["deepl", "google", "mymemory"])
+        assert router.ranking("es") == ["google", "deepl"]       # mymemory only knows region codes (es-ES)
+        assert router.ranking("es_ES") == ["google", "mymemory", "deepl"]
+        assert router.route("yo") == "google"                    # not in deepl table
+        assert router.unsupported(["xx"]) == ["xx"]
+
+    def test_weights_and_latency_feedback(self):
+        router = LanguageRouter(["google", "deepl"], cost_weight=0.0, latencies={"google": 1.0, "deepl": 0.2})
+        assert router.route("fr") == "deepl"
+        for _ in range(20):
+            router.observe("deepl", 3.0)
+        assert router.priorities(["fr"]) == {"fr": ["google", "deepl"]}
+
+    def test_runtime_language_table(self):
+        router = LanguageRouter(["microsoft"], languages={"microsoft": {"spanish": "es"}})
+        assert router.route("es") == "microsoft"
+        assert LanguageRouter(["microsoft"]).route("es") is None
+
+    def test_failover_uses_router_ranking(self):
+        router = LanguageRouter(["google", "pseudo"])
+        translator = FailoverTranslator(["google", "pseudo"], router=router)
+        assert translator.order_for("es") == ["pseudo", "google"]       # pseudo has no latency
+        router.observe("pseudo", 5.0)           # measured latencies re-rank the table
+        assert translator.order_for("es") == ["google", "pseudo"]
@@ -0,0 +1,148 @@
+import errno
+import os
+import pytest
+import qautolinguist.helpers as helpers
+
+from qautolinguist.helpers import SyncBatch, atomic_path, atomic_write, safe_open, stage_copy
+
+
+class TestAtomicWrite:
+
+    def test_replaces_file(self, tmp_path):
+        path = tmp_path / "es.ts"
+        path.write_text("old", encoding="utf-8")
+        with atomic_write(path, mode="w", encoding="utf-8") as fp:
+            fp.write("new")
+            assert path.read_text(encoding="utf-8") == "old"      # visible only once complete
+        assert path.read_text(encoding="utf-8") == "new"
+        assert os.listdir(tmp_path) == ["es.ts"]
+
+    def test_failure_keeps_original(self, tmp_path):
+        path = tmp_path / "es.ts"
+        path.write_text("old", encoding="utf-8")
+        with pytest.raises(RuntimeError):
+            with atomic_write(path, mode="w", encoding="utf-8") as fp:
+                fp.write("partial")
+                raise RuntimeError
+        assert path.read_text(encoding="utf-8") == "old"
+        assert os.listdir(tmp_path) == ["es.ts"]
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    def test_keeps_permissions(self, tmp_path):
+        path = tmp_path / "es.qm"
+        path.write_bytes(b"old")
+        path.chmod(0o640)
+        with atomic_path(path) as temp_path:
+            temp_path.write_bytes(b"new")
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    def test_sync_batch(self, tmp_path):
+        with SyncBatch() as batch:
+            for name in ("es.ts", "fr.ts"):
+                with atomic_write(tmp_path / name, mode="wb", sync=batch) as fp:
+                    fp.write(b"<TS/>")
+            (tmp_path / "fr.ts").unlink()
+            assert len(batch) == 2
+            assert batch.sync() == 1            # removed files are skipped
+        assert len(batch) == 0
+
+    def test_safe_open_append(self, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_text("a\n", encoding="utf-8")
+        with safe_open(path, mode="a", encoding="utf-8") as fp:
+            fp.write("b\n")
+        assert path.read_text(encoding="utf-8") == "a\nb\n"
+
+        with pytest.raises(ValueError):
+            with safe_open(path, both_paths=True, mode="w", encoding="utf-8") as (fp, temp_path):
+                assert temp_path != path
+                fp.write("lost")
+                raise ValueError
+        assert path.read_text(encoding="utf-8") == "a\nb\n"
+
+    def test_safe_open_read(self, tmp_path, monkeypatch):
+        path = tmp_path / "log.txt"
+        path.write_text("a\n", encoding="utf-8")
+        monkeypatch.setattr(helpers, "atomic_path", None)      # reads never go through a temporary file
+        with safe_open(path, both_paths=True, encoding="utf-8") as (fp, opened):
+            assert fp.read() == "a\n" and opened == path
+        with safe_open(path, mode="rb") as fp:
+            assert fp.read() == b"a\n"
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    def test_read_only_target(self, tmp_path):
+        path = tmp_path / "es.qm"
+        path.write_bytes(b"old")
+        path.chmod(0o444)
+        with atomic_path(path) as temp_path:
+            temp_path.write_bytes(b"new")
+        assert path.read_bytes() == b"new"
+        assert path.stat().st_mode & 0o777 == 0o444
+        with SyncBatch() as batch:
+            batch.add(path)
+            assert batch.sync() == 1
+
+
+class TestStageCopy:
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "en.ts"
+        path.write_bytes(b"<TS>reference</TS>")
+        return path
+
+    def test_copy(self, source, tmp_path):
+        dst = tmp_path / "es.ts"
+        dst.write_bytes(b"previous")
+        method = stage_copy(source, dst)
+        assert method in ("reflink", "copy_file_range", "copy")
+        assert dst.read_bytes() == source.read_bytes()
+        assert not os.path.samefile(source, dst)
+
+    def test_link_breaks_on_atomic_write(self, source, tmp_path):
+        dst = tmp_path / "es.ts"
+        if stage_copy(source, dst, link=True) != "hardlink":
+            pytest.skip("hardlinks not supported here")
+        assert os.path.samefile(source, dst)
+        with atomic_write(dst, mode="wb") as fp:
+            fp.write(b"<TS>traducido</TS>")
+        assert source.read_bytes() == b"<TS>reference</TS>"
+
+    def test_fallback(self, source, tmp_path, monkeypatch):
+        def no_links(src, dst):
+            raise OSError(errno.EXDEV, "cross-device link")
+
+        monkeypatch.setattr(helpers, "_unsupported", set())
+        monkeypatch.setattr(os, "link", no_links)
+        assert stage_copy(source, tmp_path / "es.ts", link=True) != "hardlink"
+        assert ("hardlink", source.stat().st_dev) in helpers._unsupported
+        assert (tmp_path / "es.ts").read_bytes() == source.read_bytes()
+
+    def test_link_limit_of_one_file(self, source, tmp_path, monkeypatch):
+        def too_many_links(src, dst):
+            raise OSError(errno.EMLINK, "too many links")
+
+        monkeypatch.setattr(helpers, "_unsupported", set())
+        monkeypatch.setattr(os, "link", too_many_links)
+        assert stage_copy(source, tmp_path / "es.ts", link=True) != "hardlink"
+        assert (tmp_path / "es.ts").read_bytes() == source.read_bytes()
+        assert ("hardlink", source.stat().st_dev) not in helpers._unsupported     # other files keep being linked
+
+    @pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range not available")
+    def test_short_copy_falls_back(self, source, tmp_path, monkeypatch):
+        def short_copy(src, dst, count):
+            return os.write(dst, os.read(src, 4)) if os.lseek(src, 0, os.SEEK_CUR) == 0 else 0
+
+        monkeypatch.setattr(helpers, "_unsupported", {("reflink", source.stat().st_dev)})
+        monkeypatch.setattr(os, "copy_file_range", short_copy)
+        assert stage_copy(source, tmp_path / "es.ts") == "copy"
+        assert (tmp_path / "es.ts").read_bytes() == source.read_bytes()
+        assert ("copy_file_range", source.stat().st_dev) in helpers._unsupported
+
+    def test_temp_copy(self, source):
+        from qautolinguist.helpers import make_temp_copy, remove_temp_copy
+
+        temp = make_temp_copy(source)
+        temp.write_bytes(b"<TS>edited</TS>")
+        remove_temp_copy(temp, source)
+        assert source.read_bytes() == b"<TS>edited</TS>" and not temp.exists()
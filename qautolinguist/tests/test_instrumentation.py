@@ -0,0 +1,144 @@
+import io
+import json
+import shutil
+import pytest
+
+from pathlib import Path
+from qautolinguist.qal import QAutoLinguist
+from qautolinguist.instrumentation import BuildInstrumentation
+from qautolinguist.progress import BuildProgress, JsonLinesRenderer, TerminalRenderer, get_renderer
+
+ROOT = Path(__file__).parent
+TARGET_TS = ROOT / "targets" / "test.ts"
+
+
+@pytest.fixture
+def offline_qal(tmp_path):
+    "QAutoLinguist instance using the offline engine with the reference .ts already in place (no lupdate needed)."
+    translations = tmp_path / "translations"
+    translations.mkdir()
+    inst = QAutoLinguist(
+        TARGET_TS,
+        ["es", "fr"],
+        engine="pseudo",
+        translations_folder=translations,
+        metrics_report=tmp_path / "report.json",
+    )
+    shutil.copy(TARGET_TS, inst._ts_reference_file)
+    return inst
+
+
+class TestInstrumentation:
+
+    def test_nested_stages_and_counters(self):
+        instr = BuildInstrumentation()
+        events = []
+        instr.add_hook(lambda event, span: events.append((event, span.name)))
+
+        with instr.stage("translate_translatables"):
+            with instr.stage("translate", locale="es"):
+                instr.count("requests", 2, locale="es")
+
+        report = instr.report()
+        assert report["stages"]["translate_translatables"]["calls"] == 1
+        assert report["locales"]["es"]["stages"]["translate"]["calls"] == 1
+        assert report["locales"]["es"]["counters"]["requests"] == 2
+        assert report["spans"][0]["parent"] == "translate_translatables"
+        assert events == [
+            ("start", "translate_translatables"), ("start", "translate"), ("end", "translate"), ("end", "translate_translatables")
+        ]
+
+    def test_pipeline_stages_are_reported(self, offline_qal):
+        offline_qal.create_ts_files()
+        offline_qal.create_translatables()
+        offline_qal.translate_translatables()
+        offline_qal.insert_translated_sources()
+
+        report_path = offline_qal.instrumentation.dump(offline_qal.metrics_report)
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+
+        assert set(report["locales"]) == {"es", "fr"}
+        for locale in ("es", "fr"):
+            assert {"translate", "insert_translations"} <= set(report["locales"][locale]["stages"])
+            assert report["locales"][locale]["counters"]["messages"] > 0
+            assert report["locales"][locale]["counters"]["requests"] >= 1
+        assert report["translator"]["requests"] == report["counters"]["requests"]
+        assert report["counters"]["bytes_received"] >= report["counters"]["bytes_sent"]
+
+
+class TestBuildProgress:
+
+    class Clock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def test_rates_hit_rate_and_eta(self):
+        instr, clock, stream = BuildInstrumentation(), self.Clock(), io.StringIO()
+        counted = []
+        instr.add_counter_hook(lambda name, value, locale: counted.append((name, value, locale)))
+        progress = BuildProgress(instr, JsonLinesRenderer(stream), interval=0, clock=clock)
+
+        with instr.stage("translate_translatables"):
+            instr.count("messages_expected", 100, locale="es")
+            instr.count("messages_expected", 100, locale="fr")
+            with instr.stage("translate", locale="es"):
+                instr.count("messages", 30, locale="es")        # translation starts at t=0
+                clock.now = 2.0
+                instr.count("messages", 20, locale="es")
+                instr.count("memory_hits", 50, locale="es")
+                instr.count("requests", 4, locale="es")
+                instr.count("characters", 1234, locale="es")
+            snapshot = progress.snapshot()
+        progress.close()
+
+        assert ("memory_hits", 50, "es") in counted
+        assert snapshot["stage"] == "translate_translatables" and snapshot["locale"] == "es"
+        assert (snapshot["done"], snapshot["total"]) == (100, 200)
+        assert snapshot["locales"] == {"es": {"done": 100, "total": 100}, "fr": {"done": 0, "total": 100}}
+        assert snapshot["messages_per_second"] == 25.0
+        assert snapshot["requests_per_second"] == 2.0
+        assert snapshot["cache_hit_rate"] == 0.5
+        assert snapshot["eta"] == 2.0               # 100 messages left at 50 messages/s
+        assert snapshot["characters"] == 1234
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert events[0]["event"] == "stage_start" and events[0]["stage"] == "translate_translatables"
+        assert events[-1]["event"] == "done" and events[-1]["state"] == "done"
+        assert "progress" in {event["event"] for event in events}
+
+        instr.count("messages", 1, locale="fr")         # detached once closed
+        assert len(stream.getvalue().splitlines()) == len(events)
+
+    def test_progress_is_throttled(self):
+        instr, clock, stream = BuildInstrumentation(), self.Clock(), io.StringIO()
+        progress = BuildProgress(instr, JsonLinesRenderer(stream), interval=1.0, clock=clock)
+        for _ in range(10):
+            instr.count("messages", 1, locale="es")
+        clock.now = 1.5
+        instr.count("messages", 1, locale="es")
+        progress.close(error="QALBaseException: stopped")
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [event["event"] for event in events] == ["progress", "progress", "failed"]
+        assert events[-1]["error"] == "QALBaseException: stopped"
+
+    def test_terminal_line(self):
+        instr, stream = BuildInstrumentation(), io.StringIO()
+        progress = BuildProgress(instr, TerminalRenderer(stream, width=10), interval=0, clock=self.Clock())
+        instr.count("messages_expected", 10, locale="es")
+        with instr.stage("translate_translatables"):
+            instr.count("memory_hits", 5, locale="es")
+        progress.close()
+
+        lines = stream.getvalue().splitlines()      # not a terminal: one line per finished stage
+        assert len(lines) == 2
+        assert lines[0].startswith("[build] | [#####.....]  50% 5/10") and "hits 100%" in lines[0]
+        assert "done in 00:00" in lines[1]
+
+    def test_unknown_renderer(self):
+        assert isinstance(get_renderer("JSONL", stream=io.StringIO()), JsonLinesRenderer)
+        with pytest.raises(ValueError, match="bar, jsonl"):
+            get_renderer("html")
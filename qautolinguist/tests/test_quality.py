@@ -0,0 +1,96 @@
+import pytest
+import subprocess
+import sys
+
+from qautolinguist.benchs.bench_quality import make_pairs
+from qautolinguist.translators.mt_quality import MTQualityValidator, ngram_counts, nltk_sentence_scores, sentence_scores, tokenize
+
+SOURCES = ["Open the file", "Save all the documents before closing", "Quit", "Delete the selected rows"]
+TRANSLATIONS = ["Abrir el archivo", "Guardar", "Salir", ""]
+
+
+class TestScores:
+
+    def test_tokenize(self):
+        assert tokenize("Open the File...") == ["open", "the", "file", ".", ".", "."]
+
+    def test_ngram_counts(self):
+        assert ngram_counts(["a", "b", "a", "b"], max_n=2) == {"a": 2, "b": 2, ("a", "b"): 2, ("b", "a"): 1}
+
+    def test_identical_and_disjoint(self):
+        assert sentence_scores("the cat is on the mat", "the cat is on the mat") == (1.0, 1.0)
+        assert sentence_scores("the cat is on the mat", "a dog runs") == (0.0, 0.0)
+
+    def test_short_sentences(self):
+        bleu, gleu = sentence_scores("Save file", "Save the file")
+        assert bleu == 0.0                 # no 3-gram or 4-gram can match
+        assert gleu == pytest.approx(2 / 6)
+
+
+class TestValidator:
+
+    def test_flags_without_references(self):
+        report = MTQualityValidator().check_batch(SOURCES, TRANSLATIONS, locale="es")
+        assert report.bleu is None
+        assert report.flagged == [1, 3]    # too short, empty
+
+    def test_flags_with_references(self):
+        validator = MTQualityValidator(min_gleu=0.5)
+        references = ["Open the file", "Save all documents before closing", "Exit", "Delete the selected rows"]
+        back = ["Open the file", "Save all documents before closing", "Quit", "Delete the selected rows"]
+        report = validator.check_batch(references, back, references=references)
+        assert report.flagged == [2]
+        assert report.gleu[0] == 1.0
+
+    def test_cache(self):
+        validator = MTQualityValidator()
+        validator.score_batch(SOURCES, SOURCES)
+        assert len(validator) == len(SOURCES)
+        validator.score_batch(SOURCES[:2], SOURCES[:2])
+        assert len(validator) == len(SOURCES)
+
+    def test_misaligned(self):
+        with pytest.raises(ValueError):
+            MTQualityValidator().check_batch(SOURCES, TRANSLATIONS[:2])
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_check_locales(self, processes):
+        validator = MTQualityValidator(parallel_threshold=0)
+        batches = {
+            "es": (SOURCES, SOURCES, SOURCES),
+            "fr": (SOURCES, list(reversed(SOURCES)), SOURCES),
+        }
+        reports = validator.check_locales(batches, processes=processes)
+        assert reports["es"].flagged == []
+        assert reports["fr"].flagged == [0, 1, 2, 3]
+        assert reports["es"].mean("gleu") == 1.0
+        assert len(validator) == 8
+
+    def test_check_locales_back_translations(self):
+        validator = MTQualityValidator(parallel_threshold=0)
+        batches = {"es": (SOURCES, SOURCES, None), "fr": (SOURCES, SOURCES, None)}
+        reports = validator.check_locales(batches, processes=2, back_translations={"es": SOURCES, "fr": list(reversed(SOURCES))})
+        assert reports["es"].mean("gleu") == 1.0
+        assert reports["fr"].flagged == [0, 1, 2, 3]
+        assert len(validator) == 8
+
+
+class TestBackends:
+
+    def test_nltk_not_imported(self):
+        code = "import sys, qautolinguist.translator; print('nltk' in sys.modules)"
+        assert subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip() == "False"
+
+    def test_native_matches_nltk(self):
+        pytest.importorskip("nltk")
+        for reference, hypothesis in make_pairs(500) + [("Quit", ""), ("", "Salir"), ("Save file", "Save the file")]:
+            assert sentence_scores(reference, hypothesis) == pytest.approx(nltk_sentence_scores(reference, hypothesis), abs=1e-12)
+
+    def test_nltk_backend(self):
+        pytest.importorskip("nltk")
+        bleu, gleu = MTQualityValidator(backend="nltk").score_batch(SOURCES, SOURCES)
+        assert bleu[1] == gleu[1] == pytest.approx(1.0)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            MTQualityValidator(backend="sacrebleu")
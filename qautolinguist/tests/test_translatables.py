@@ -0,0 +1,103 @@
+import pytest
+import shutil
+import qautolinguist.exceptions as qal_excs
+import qautolinguist.translatables as translatables
+
+from pathlib import Path
+from qautolinguist.qal import QAutoLinguist
+
+ROOT = Path(__file__).parent
+TARGET_TS = ROOT / "targets" / "test.ts"
+GROUPS = [
+    {"location": "line ['20'] extracted from 'test.ui'", "SOURCE": "Open", "TRANSLATION": "Open"},
+    {"location": "line ['21'] extracted from 'test.ui'", "SOURCE": "Say \"hi\"\nnow", "TRANSLATION": "Say \"hi\"\nnow"},
+    {"location": "line ['22'] extracted from 'test.ui'", "SOURCE": "Ñandú", "TRANSLATION": "Ñandú"},
+]
+FORMATS = [pytest.param(fmt, id=name) for name, fmt in translatables.__formats__.items()]
+
+
+class TestTranslatableFormats:
+
+    @pytest.mark.parametrize("fmt", FORMATS)
+    def test_round_trip(self, fmt, tmp_path):
+        path = tmp_path / f"es{fmt.extension}"
+        fmt.write(path, GROUPS)
+        assert translatables.format_for(path) is fmt
+        assert fmt.read(path) == GROUPS
+
+        fmt.update_translations(path, ["Abrir", "Di \"hola\"\nahora", "Ñandú"])
+        assert fmt.translations(path) == ["Abrir", "Di \"hola\"\nahora", "Ñandú"]
+        assert fmt.sources(path) == [group["SOURCE"] for group in GROUPS]
+
+    @pytest.mark.parametrize("fmt", FORMATS)
+    def test_length_mismatch(self, fmt, tmp_path):
+        path = tmp_path / f"es{fmt.extension}"
+        fmt.write(path, GROUPS)
+        with pytest.raises(ValueError):
+            fmt.update_translations(path, ["Abrir"])
+        with pytest.raises(ValueError):
+            fmt.update_translations(path, ["Abrir", "Di", "Ñandú", "Extra"])
+        assert fmt.read(path) == GROUPS                     # untouched
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+            p.name for p in [path, path.with_name(path.name + ".idx")] if p.exists()
+        )                                                   # no temporary files left
+
+    def test_jsonl_update_rewrites_index(self, tmp_path):
+        fmt = translatables.get_format("jsonl")
+        path = tmp_path / "es.jsonl"
+        fmt.write(path, GROUPS)
+        fmt.update_translations(path, ["Abrir un archivo existente", "Di", "Ñandú"])
+        assert fmt.read_group(path, 2)["TRANSLATION"] == "Ñandú"
+
+    def test_toml_streams_in_file_order(self, tmp_path, monkeypatch):
+        fmt = translatables.get_format("toml")
+        path = tmp_path / "es.toml"
+        groups = ({"location": f"line {idx}", "SOURCE": f"source {idx}", "TRANSLATION": f"source {idx}"} for idx in range(25))
+        monkeypatch.setattr(translatables.tomlparser, "dumps", None)       # the document is never built in memory
+        fmt.write(path, groups)
+
+        assert [group["SOURCE"] for group in fmt.iter_groups(path)] == [f"source {idx}" for idx in range(25)]
+
+    def test_toml_reader_accepts_hand_edits(self, tmp_path):
+        fmt = translatables.get_format("toml")
+        path = tmp_path / "es.toml"
+        path.write_text(
+            '# reviewed\n[Group0]\nlocation = "line 1"\nSOURCE = "Open"\nTRANSLATION = """Abrir\n[Group9]\n"""\n\n'
+            "[Group1]\nlocation = 'line 2'\nSOURCE = 'Save' # literal\nTRANSLATION = 'Guardar'\n",
+            encoding="utf-8",
+        )
+        assert fmt.translations(path) == ["Abrir\n[Group9]\n", "Guardar"]
+
+    def test_jsonl_append_and_random_access(self, tmp_path):
+        fmt = translatables.get_format("jsonl")
+        path = tmp_path / "es.jsonl"
+        assert fmt.append(path, GROUPS[:1]) == 1
+        assert fmt.append(path, GROUPS[1:]) == 3
+        assert fmt.read_group(path, 2) == GROUPS[2]
+        assert fmt.count(path) == 3
+
+        fmt._index_path(path).unlink()        # index is rebuilt from the data file when missing
+        assert fmt.read_group(path, 1) == GROUPS[1]
+
+    def test_unknown_format(self):
+        with pytest.raises(qal_excs.TranslatableError):
+            translatables.get_format("xml")
+
+    def test_pipeline_with_jsonl(self, tmp_path):
+        translations = tmp_path / "translations"
+        translations.mkdir()
+        inst = QAutoLinguist(TARGET_TS, ["es"], engine="pseudo", translations_folder=translations, translatable_format="jsonl")
+        shutil.copy(TARGET_TS, inst._ts_reference_file)
+
+        inst.create_ts_files()
+        inst.create_translatables()
+        inst.translate_translatables()
+        inst.insert_translated_sources()
+
+        ts_file, translatable = inst.map["es"]
+        assert translatable.suffix == ".jsonl"
+        assert "[" in ts_file.read_text(encoding="utf-8")     # pseudo-localized markers reached the .ts
+
+    def test_revised_builds_force_toml(self, tmp_path):
+        inst = QAutoLinguist(TARGET_TS, ["es"], engine="pseudo", translations_folder=tmp_path, translatable_format="jsonl", revise_after_build=True)
+        assert inst.translatable_format.name == "toml"
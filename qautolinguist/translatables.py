@@ -0,0 +1,262 @@
+"""
+Translatable file formats.
+
+A translatable holds the groups ``{location, context, [comment], SOURCE, TRANSLATION}`` extracted from a .ts file.
+``TOML`` is the default, human-editable format (needed for ``revise_after_build``). ``JSONL`` is a compact
+format for non-revised builds: one JSON group per line, streaming appends and O(1) random access through
+a binary offset index (``<file>.idx``).
+
+Both formats stream: groups are written one by one from any iterable and read back one by one, so memory
+does not grow with the size of the catalog. Files are written atomically (``helpers.atomic_write``): an
+interrupted write leaves the previous file in place.
+"""
+
+import json
+import re
+import pytomlpp as tomlparser
+import qautolinguist.exceptions as exceptions
+
+from abc import ABC, abstractmethod
+from array import array
+from pathlib import Path
+from qautolinguist.helpers import SyncBatch, atomic_write
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+
+__all__: List[str] = [
+    "TranslatableFormat",
+    "TomlTranslatable",
+    "JsonlTranslatable",
+    "get_format",
+    "format_for",
+]
+
+
+Group = Dict[str, str]      # {"location": str, "context": str, ["comment": str], "SOURCE": str, "TRANSLATION": str}
+
+_MISSING = object()
+
+
+class _LengthMismatch(Exception):
+    "Raised by the groups of ``update_translations`` to abort the write. Not a ValueError, formats wrap those."
+
+
+class TranslatableFormat(ABC):
+    "Base class for translatable formats. Subclasses are registered by ``name`` and ``extension``."
+
+    name: str
+    extension: str
+    editable: bool = False      # True when meant to be reviewed and edited by hand
+
+    @abstractmethod
+    def write(self, path: Path, groups: Iterable[Group], *, sync: Optional[SyncBatch] = None) -> None:
+        "Writes ``groups`` in ``path`` replacing any previous content, atomically (``sync``: see ``helpers.atomic_path``)."
+
+    @abstractmethod
+    def iter_groups(self, path: Path) -> Iterator[Group]:
+        "Yields the groups stored in ``path`` in order."
+
+    def read(self, path: Path) -> List[Group]:
+        return list(self.iter_groups(path))
+
+    def sources(self, path: Path) -> List[str]:
+        return [group.get("SOURCE", "") for group in self.iter_groups(path)]
+
+    def translations(self, path: Path) -> List[str]:
+        return [group.get("TRANSLATION", "") for group in self.iter_groups(path)]
+
+    def update_translations(self, path: Path, translations: Iterable[str], *, sync: Optional[SyncBatch] = None) -> None:
+        """
+        Replaces the ``TRANSLATION`` of every group in ``path``. Groups are streamed from ``path`` into the
+        temporary file of ``write()``, which replaces ``path`` once complete.
+
+        ### Raises:
+            - ``ValueError``: If translations length does not match the number of groups in the file.
+        """
+        path = Path(path)
+
+        def updated() -> Iterator[Group]:
+            translations_ = iter(translations)
+            for group in self.iter_groups(path):
+                translation = next(translations_, _MISSING)
+                if translation is _MISSING:
+                    raise _LengthMismatch
+                group["TRANSLATION"] = translation
+                yield group
+            if next(translations_, _MISSING) is not _MISSING:
+                raise _LengthMismatch
+
+        try:
+            self.write(path, updated(), sync=sync)
+        except _LengthMismatch:
+            raise ValueError("Content length does not match to file content length.") from None
+
+
+class TomlTranslatable(TranslatableFormat):
+    """
+    Default human-editable format. Groups are stored as ``[Group{idx}]`` tables.
+
+    The writer emits one table per group as they come and the reader parses one table at a time, so neither
+    the whole document nor its string representation is ever held in memory.
+    """
+
+    name = "toml"
+    extension = ".toml"
+    editable = True
+
+    _TABLE_HEADER = re.compile(r"^\s*\[\s*[^\[\]]+\]\s*(?:#.*)?$")
+
+    @staticmethod
+    def _string(value: str) -> str:
+        "TOML basic string. JSON escapes are valid TOML escapes; DEL is the only control char JSON leaves raw."
+        return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")
+
+    def write(self, path: Path, groups: Iterable[Group], *, sync: Optional[SyncBatch] = None) -> None:
+        try:
+            with atomic_write(path, mode="w", encoding="utf-8", sync=sync) as file_:
+                for idx, group in enumerate(groups):
+                    lines = [f"[Group{idx}]"]
+                    lines.extend(f"{key} = {self._string(value)}" for key, value in group.items())
+                    file_.write("\n".join(lines) + "\n\n")
+        except (TypeError, ValueError, OSError) as e:
+            raise exceptions.TOMLConversionError(f"Unexpected error writing translatable file {path}. Detailed error: {e}") from e
+
+    def _parse_table(self, path: Path, lines: List[str]) -> Iterator[Group]:
+        try:
+            data = tomlparser.loads("".join(lines))
+        except (ValueError, tomlparser.DecodeError) as e:
+            raise exceptions.TOMLConversionError(f"Unexpected error during loading the file {path!r}. Detailed error: {e}") from e
+        return iter(data.values())
+
+    def iter_groups(self, path: Path) -> Iterator[Group]:
+        try:
+            with open(path, mode="r", encoding="utf-8") as file_:
+                table: List[str] = []
+                for line in file_:
+                    # a header-like line inside a multi-line string (odd number of delimiters so far) is content
+                    if self._TABLE_HEADER.match(line) and not self._in_multiline_string(table):
+                        yield from self._parse_table(path, table)
+                        table = []
+                    table.append(line)
+                yield from self._parse_table(path, table)
+        except OSError as e:
+            raise exceptions.TOMLConversionError(f"Unexpected error during loading the file {path!r}. Detailed error: {e}") from e
+
+    @staticmethod
+    def _in_multiline_string(lines: List[str]) -> bool:
+        text = "".join(lines)
+        return text.count('"""') % 2 == 1 or text.count("'''") % 2 == 1
+
+
+class JsonlTranslatable(TranslatableFormat):
+    """
+    Compact format for non-revised builds: one JSON group per line.
+
+    Supports streaming appends (``append``) and random access (``read_group``) through an index file with
+    the byte offset of each line stored as unsigned 64-bit integers.
+    """
+
+    name = "jsonl"
+    extension = ".jsonl"
+    INDEX_SUFFIX = ".idx"
+
+    @classmethod
+    def _index_path(cls, path: Path) -> Path:
+        return Path(path).with_name(Path(path).name + cls.INDEX_SUFFIX)
+
+    @staticmethod
+    def _encode(group: Group) -> bytes:
+        return json.dumps(group, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    def write(self, path: Path, groups: Iterable[Group], *, sync: Optional[SyncBatch] = None) -> None:
+        "The index is renamed right before the file, both only once complete."
+        offsets = array("Q")
+        try:
+            with atomic_write(path, mode="wb", sync=sync) as file_:
+                for group in groups:
+                    offsets.append(file_.tell())
+                    file_.write(self._encode(group))
+                with atomic_write(self._index_path(path), mode="wb", sync=sync) as index:
+                    offsets.tofile(index)
+        except (TypeError, ValueError, OSError) as e:
+            raise exceptions.TranslatableError(f"Unexpected error writing translatable file {path}. Detailed error: {e}") from e
+
+    def append(self, path: Path, groups: Iterable[Group]) -> int:
+        "Appends ``groups`` at the end of ``path`` (created if missing) and returns the new number of groups."
+        offsets = self._load_index(path) if Path(path).exists() else array("Q")
+        try:
+            with open(path, mode="ab") as file_, open(self._index_path(path), mode="ab") as index:
+                new_offsets = array("Q")
+                for group in groups:
+                    new_offsets.append(file_.tell())
+                    file_.write(self._encode(group))
+                new_offsets.tofile(index)
+        except (TypeError, ValueError, OSError) as e:
+            raise exceptions.TranslatableError(f"Unexpected error appending to translatable file {path}. Detailed error: {e}") from e
+        return len(offsets) + len(new_offsets)
+
+    def _load_index(self, path: Path) -> array:
+        offsets = array("Q")
+        index_path = self._index_path(path)
+        if not index_path.exists():            # rebuilds a missing index with a single sequential scan
+            position = 0
+            with open(path, mode="rb") as file_:
+                for line in file_:
+                    offsets.append(position)
+                    position += len(line)
+            return offsets
+
+        with open(index_path, mode="rb") as index:
+            offsets.frombytes(index.read())
+        return offsets
+
+    def count(self, path: Path) -> int:
+        "Number of groups in ``path`` without reading it."
+        return len(self._load_index(path))
+
+    def read_group(self, path: Path, idx: int) -> Group:
+        "Random access to group ``idx`` of ``path``."
+        offsets = self._load_index(path)
+        try:
+            with open(path, mode="rb") as file_:
+                file_.seek(offsets[idx])
+                return json.loads(file_.readline())
+        except IndexError:
+            raise IndexError(f"Group {idx} out of range, {path} contains {len(offsets)} groups") from None
+        except (ValueError, OSError) as e:
+            raise exceptions.TranslatableError(f"Unexpected error reading group {idx} from {path}. Detailed error: {e}") from e
+
+    def iter_groups(self, path: Path) -> Iterator[Group]:
+        try:
+            with open(path, mode="rb") as file_:
+                for line in file_:
+                    if line.strip():
+                        yield json.loads(line)
+        except (ValueError, OSError) as e:
+            raise exceptions.TranslatableError(f"Unexpected error during loading the file {path!r}. Detailed error: {e}") from e
+
+
+__formats__: Dict[str, TranslatableFormat] = {
+    fmt.name: fmt for fmt in (TomlTranslatable(), JsonlTranslatable())
+}
+
+
+def get_format(name: Union[str, TranslatableFormat]) -> TranslatableFormat:
+    "Returns the registered format called ``name`` (toml, jsonl)."
+    if isinstance(name, TranslatableFormat):
+        return name
+    try:
+        return __formats__[name.strip().lower()]
+    except KeyError:
+        raise exceptions.TranslatableError(
+            f"Unknown translatable format {name!r}. Available formats: {', '.join(__formats__)}"
+        ) from None
+
+
+def format_for(path: Union[str, Path]) -> TranslatableFormat:
+    "Returns the format of an existing translatable file from its extension."
+    suffix = Path(path).suffix.lower()
+    for fmt in __formats__.values():
+        if fmt.extension == suffix:
+            return fmt
+    raise exceptions.TranslatableError(f"No translatable format registered for extension {suffix!r} ({path})")
@@ -1,9 +1,14 @@
+import sys
 import qautolinguist.translators as Translators
 import qautolinguist.translators.exceptions as api_exceptions                
 import qautolinguist.exceptions as exceptions #qautolinguist exceptions
 
-from qautolinguist.translators.mt_quality import MTQualityValidator
-from typing import List, Tuple, Union
+from qautolinguist.translators.mt_quality import MTQualityValidator, QualityReport
+from qautolinguist.translators.metrics import MetricsAggregator, TranslatorHook
+from qautolinguist.translators.coalescer import RequestCoalescer
+from qautolinguist.translators.composite import FailoverTranslator, engine_name
+from qautolinguist.translators.routing import LanguageRouter
+from typing import Dict, List, Optional, Tuple, Union
 
 __all__: List[str] = ["MATranslator"]
 
@@ -13,22 +18,92 @@ class MATranslator:
     
     This class lets you choose the api_translator and also adds a extra method _check_connection to verify the machine have connection
     before translation process starts. 
+    ``api_translator`` can be either a translator class or its name in ``__engines__`` (google, mymemory, deepl, microsoft, pseudo).
+    Offline engines (``requires_connection = False``) skip the connection check, as does ``check_connection=False``
+    (used when the connection was already checked, e.g. by ``batch.EnginePool``).
+    With a ``coalescer`` (``translators.coalescer.RequestCoalescer``), identical texts requested by any translator
+    sharing it are translated once.
+    The ``failover`` engine gets a ``translators.routing.LanguageRouter`` over its engines unless a ``router`` is given, so each
+    locale is sent to its best engine; ``routing_weights`` (``{"cost": ..., "latency": ...}``) weighs the ranking.
     """
     
-    GLEU_SCORE = 0.85
+    GLEU_SCORE = 0.5       # minimum GLEU against a reference before an entry is flagged for review
 
-    def __init__(self, api_translator = Translators.GoogleTranslator):
-        self._translator = api_translator()
-        self.mt_quality_validator = MTQualityValidator()
+    def __init__(
+        self, 
+        api_translator: Union[str, type] = Translators.GoogleTranslator, 
+        *, 
+        check_connection: bool = True, 
+        coalescer: Optional[RequestCoalescer] = None, 
+        routing_weights: Optional[Dict[str, float]] = None,
+        **engine_kwargs
+    ):
+        if isinstance(api_translator, str):
+            api_translator = self._resolve_engine(api_translator)
+        if issubclass(api_translator, FailoverTranslator) and engine_kwargs.get("router") is None:
+            engine_kwargs["router"] = self.make_router(engine_kwargs.get("engines") or FailoverTranslator.DEFAULT_ENGINES, routing_weights)
+        self._translator = api_translator(**engine_kwargs)
+        self.mt_quality_validator = MTQualityValidator(min_gleu=self.GLEU_SCORE)
+        self.metrics = MetricsAggregator()          # request latencies/sizes and batch paths, see metrics.summary()
+        self._translator.add_hook(self.metrics)
+        self.coalescer = coalescer                  # shared by translators of several builds to translate each text once
 
-        if not self._check_connection():
+        if check_connection and self._translator.requires_connection and not self._check_connection():
             raise exceptions.TranslatorConnectionError("You don't have internet connection. QAutoLinguist requires internet connection")
     
+    @staticmethod
+    def _resolve_engine(name: str) -> type:
+        "Returns the translator class registered as ``name`` in ``__engines__``"
+        from qautolinguist.translators.engines import __engines__
+        
+        try:
+            return __engines__[name.strip().lower()]
+        except KeyError:
+            raise exceptions.InvalidEngine(
+                f"Unknown translation engine {name!r}. Available engines: {', '.join(__engines__)}"
+            ) from None
+
+    @staticmethod
+    def make_router(engines, weights: Optional[Dict[str, float]] = None) -> LanguageRouter:
+        """
+        Routing table of the ``engines`` (names or translator instances) of a failover engine. The language table of
+        an instance is taken from the instance itself, the static tables are used for names.
+        
+        ### Raises:
+            - ``InvalidEngine``: If ``weights`` has keys other than ``cost`` and ``latency``.
+        """
+        weights = dict(weights or {})
+        unknown = set(weights) - {"cost", "latency"}
+        if unknown:
+            raise exceptions.InvalidEngine(f"Unknown routing weights {sorted(unknown)}. Valid weights: cost, latency")
+        names, languages = [], {}
+        for engine in engines:
+            if isinstance(engine, str):
+                names.append(engine.strip().lower())
+            else:
+                names.append(engine_name(engine))
+                languages[names[-1]] = engine.get_supported_languages(as_dict=True)
+        return LanguageRouter(
+            names, cost_weight=float(weights.get("cost", 1.0)), latency_weight=float(weights.get("latency", 1.0)), languages=languages
+        )
+
+
     def _check_connection(self):
         import requests
-        print("Check connection...Trying to connect with translator API")
+        print("Check connection...Trying to connect with translator API", file=sys.stderr)
         return requests.get("https://www.google.com", timeout=5).status_code == 200
         
+    def add_hook(self, hook: TranslatorHook) -> None:
+        "Registers a hook in the underlying engine. It receives a ``TranslatorEvent`` per request and per batch decision."
+        self._translator.add_hook(hook)
+
+    def remove_hook(self, hook: TranslatorHook) -> None:
+        self._translator.remove_hook(hook)
+
+    def close(self) -> None:
+        "Releases the pooled HTTP connections of the engine."
+        self._translator.close()
+
     def validate_languages(self, languages: List[str]):
         return all(self.validate_language(lang) for lang in languages)
 
@@ -39,10 +114,15 @@ def validate_language(self, language: str):
     def available_langs(self):
         return self._translator.get_supported_languages()
      
-    def check_mt_quality(self, batch: List[str]):
-        # gleu_score(batch)
-        #
-        ...
+    def check_mt_quality(
+        self, 
+        sources: List[str], 
+        translations: List[str], 
+        references: Optional[List[str]] = None, 
+        locale: str = ""
+    ) -> QualityReport:
+        "Scores a translated batch, see ``MTQualityValidator.check_batch()``. Flagged entries are in ``report.flagged``."
+        return self.mt_quality_validator.check_batch(sources, translations, references, locale)
      
     def translate_batch(
             self,
@@ -66,9 +146,16 @@ def translate_batch(
         """
 
         try:
-            l = self._translator.translate_batch(batch, **kwargs)  # noqa: E741
-            # mt_quality = self.check_mt_quality(l)
-            #return l if mt_quality >= MATranslator.GLEU_SCORE
+            if self.coalescer is None:
+                l = self._translator.translate_batch(batch, **kwargs)  # noqa: E741
+            else:
+                l = self.coalescer.translate(  # noqa: E741
+                    lambda texts: self._translator.translate_batch(texts, **kwargs), 
+                    batch, 
+                    source=kwargs.get("source_lang", "auto"), 
+                    target=kwargs.get("target_lang", "en"), 
+                    engine=self._translator._type(),
+                )
             return l
         except (
             api_exceptions.InvalidResource,
@@ -4,6 +4,8 @@
 from qautolinguist.translators.microsoft import MicrosoftTranslator
 from qautolinguist.translators.mymemory import MyMemoryTranslator
 from qautolinguist.translators.deepl import DeeplTranslator
+from qautolinguist.translators.pseudo import PseudoTranslator
+from qautolinguist.translators.composite import FailoverTranslator
 from qautolinguist.translators.constants import SILENT_SEPARATORS # export
 
 __all__ = [
@@ -11,5 +13,7 @@
     "MicrosoftTranslator",
     "DeeplTranslator",
     "MyMemoryTranslator",
+    "PseudoTranslator",
+    "FailoverTranslator",
     "SILENT_SEPARATORS"
 ]
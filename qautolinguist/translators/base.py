@@ -1,11 +1,15 @@
 """base translator class"""
 
+import time
+import sys
+import requests
 import qautolinguist.translators.exceptions as exceptions
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import List, Optional, Union
 
 from qautolinguist.translators.constants import GOOGLE_LANGUAGES_TO_CODES, SILENT_SEPARATORS
+from qautolinguist.translators.metrics import TranslatorEvent, TranslatorHook
 
 
 class BaseTranslator(ABC):
@@ -13,6 +17,8 @@ class BaseTranslator(ABC):
     Abstract class that serve as a base translator for other different translators
     """
 
+    requires_connection: bool = True    # offline engines (pseudo, mocks) set it to False to skip the connectivity check
+
     def __init__(
         self,
         base_url: str = None,
@@ -41,6 +47,7 @@ def __init__(
         self._element_tag = element_tag
         self._element_query = element_query
         self.payload_key = payload_key
+        self._hooks: List[TranslatorHook] = []
         super().__init__()
 
     @property
@@ -62,6 +69,54 @@ def target(self, lang):
     def _type(self):
         return self.__class__.__name__
 
+    @property
+    def session(self) -> requests.Session:
+        "HTTP session shared by every request of the engine, keeps connections alive between requests and batches."
+        session = getattr(self, "_session", None)     # may be used before __init__ (supported languages requests)
+        if session is None:
+            session = self._session = requests.Session()
+        return session
+
+    def close(self) -> None:
+        "Closes the pooled connections of ``session``."
+        session = getattr(self, "_session", None)
+        if session is not None:
+            session.close()
+            self._session = None
+
+    def add_hook(self, hook: TranslatorHook) -> None:
+        """
+        Registers a callable that receives a ``TranslatorEvent`` per request and per batch decision.
+        See ``translators.metrics.MetricsAggregator`` for a built-in aggregator.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: TranslatorHook) -> None:
+        self._hooks.remove(hook)
+
+    def _emit(self, kind: str, path: str, latency: float, **data) -> None:
+        if not self._hooks:
+            return
+        event = TranslatorEvent(kind, self._type(), self._source, self._target, path, latency, **data)
+        for hook in self._hooks:
+            hook(event)
+
+    def _request(self, text: str, path: str) -> str:
+        "Calls ``translate`` emitting a ``request`` event with its latency and payload sizes."
+        if not self._hooks:
+            return self.translate(text)
+
+        start = time.perf_counter()
+        payload_bytes = len(text.encode("utf-8"))
+        try:
+            result = self.translate(text)
+        except Exception as e:
+            self._emit("request", path, time.perf_counter() - start, payload_bytes=payload_bytes, error=type(e).__name__)
+            raise
+        response_bytes = len(result.encode("utf-8")) if isinstance(result, str) else 0
+        self._emit("request", path, time.perf_counter() - start, payload_bytes=payload_bytes, response_bytes=response_bytes)
+        return result
+
     def _map_language_to_code(self, *languages):
         """
         map language to its corresponding code (abbreviation) if the language was passed
@@ -133,7 +188,7 @@ def _translate_file(self, path: str, **kwargs) -> str:
             path = Path(path)
 
         if not path.exists():
-            print("Path to the file is wrong!")
+            print("Path to the file is wrong!", file=sys.stderr)
             exit(1)
         else:
             with open(path, "r", encoding="utf-8") as f:
@@ -173,34 +228,40 @@ def _translate_batch(
         self.target = target_lang
         
         if not fast_translation:
-            print(f"Using slow each-one translation for '{target_lang.upper()}'")
+            print(f"Using slow each-one translation for '{target_lang.upper()}'", file=sys.stderr)
             return self._translate_batch_each(batch)
         
         if allow_unresolved_sources:
+            start = time.perf_counter()
             shadow = []
-            for idx, item in enumerate(batch):
+            for item in batch:
                 try:
-                    resolve = self.translate(item)
+                    resolve = self._request(item, "unresolved")
                 except exceptions.BaseError:
-                    shadow.insert(idx, "")
+                    shadow.append("")
                 else:
-                    shadow.append(idx, resolve)     
+                    shadow.append(resolve)     
+            self._emit("batch", "unresolved", time.perf_counter() - start, items=len(batch))
             return shadow
         
 
-        for sep in SILENT_SEPARATORS:
+        for attempt, sep in enumerate(SILENT_SEPARATORS):
+            path = "joined" if attempt == 0 else "separator_retry"
+            start = time.perf_counter()
             joined_batch = sep.join(batch)
-            result = self.translate(joined_batch) #, separator = " "
+            result = self._request(joined_batch, path) #, separator = " "
             to_batch = result.split(sep)
-            print(f"Checking joiner {sep!r}, same chars to {self.source}->{self.target}: O:{len(batch)} -- T:{len(to_batch)}")
+            aligned = len(to_batch) == len(batch)
+            self._emit("batch", path, time.perf_counter() - start, items=len(batch), error=None if aligned else "misaligned")
+            print(f"Checking joiner {sep!r}, same chars to {self.source}->{self.target}: O:{len(batch)} -- T:{len(to_batch)}", file=sys.stderr)
             
-            if len(to_batch) == len(batch):
-                print(f"Batch joint worked with {target_lang.upper()}\n")
+            if aligned:
+                print(f"Batch joint worked with {target_lang.upper()}\n", file=sys.stderr)
                 return to_batch
        
         if never_fail:
-            print(f"Joint batch translation failed with {self.source}->{self.target}: Using each-item translation instead.")
-            print("[WARNING]:: This translation process may take a while to process.....")
+            print(f"Joint batch translation failed with {self.source}->{self.target}: Using each-item translation instead.", file=sys.stderr)
+            print("[WARNING]:: This translation process may take a while to process.....", file=sys.stderr)
             return self._translate_batch_each(batch)
             
         raise exceptions.TranslationNotFound(f"Internal error during translating batch.\nInform this error to the developers: 'Invalid unicode separators: {SILENT_SEPARATORS}' didn-t worked")
@@ -208,14 +269,18 @@ def _translate_batch(
 
     def _translate_batch_each(self, batch):
         "Method called when failed to translate a batch using separators in a single text"
+        start = time.perf_counter()
         try:
-            return [self.translate(item) for item in batch]
+            result = [self._request(item, "each") for item in batch]
         except (
             exceptions.TranslationNotFound,
             exceptions.RequestError,
             exceptions.TooManyRequests
         ) as e:
+            self._emit("batch", "each", time.perf_counter() - start, items=len(batch), error=type(e).__name__)
             raise exceptions.TranslationNotFound(f"Translation cannot be done for this batch. Tried each-one translation for {self.source}->{self.target}") from e
+        self._emit("batch", "each", time.perf_counter() - start, items=len(batch))
+        return result
 
 
         
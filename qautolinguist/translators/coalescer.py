@@ -0,0 +1,107 @@
+"""
+Global deduplication of translation requests.
+
+A ``RequestCoalescer`` sits in front of the engine ``translate_batch``: every ``(engine, source, target, text)``
+is translated at most once. Texts already translated are served from memory and texts being translated by
+another batch (another project or locale running in another thread) are awaited instead of being sent again.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple
+
+
+__all__: List[str] = ["RequestCoalescer"]
+
+
+Key = Tuple[Hashable, str, str, str]        # (engine, source, target, text)
+
+
+class RequestCoalescer:
+    """
+    Usage:
+        coalescer = RequestCoalescer()
+        coalescer.translate(engine.translate_batch, batch, source="en", target="es", engine="google")
+
+    Only unique texts that nobody translated or is translating are passed to ``translate_batch``, in order.
+    ``stats()`` tells how many texts were requested, sent, reused and awaited.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._done: Dict[Key, str] = {}
+        self._inflight: Dict[Key, Future] = {}
+        self._stats = {"requested": 0, "sent": 0, "reused": 0, "awaited": 0}
+
+    def translate(
+        self,
+        translate_batch: Callable[[List[str]], List[str]],
+        batch: Sequence[str],
+        *,
+        source: str,
+        target: str,
+        engine: Hashable = None,
+    ) -> List[str]:
+        """
+        Returns the translations of ``batch``. Exceptions raised by ``translate_batch`` are propagated to every
+        batch awaiting one of its texts, and those texts can be requested again afterwards.
+        """
+        owned: List[str] = []
+        awaited: Dict[str, Future] = {}
+        resolved: Dict[str, str] = {}
+
+        with self._lock:
+            self._stats["requested"] += len(batch)
+            for text in dict.fromkeys(batch):
+                key = (engine, source, target, text)
+                if key in self._done:
+                    resolved[text] = self._done[key]
+                    self._stats["reused"] += 1
+                elif key in self._inflight:
+                    awaited[text] = self._inflight[key]
+                    self._stats["awaited"] += 1
+                else:
+                    self._inflight[key] = Future()
+                    owned.append(text)
+            self._stats["sent"] += len(owned)
+
+        if owned:        # owned texts are translated before awaiting others, so two batches never wait for each other
+            self._translate_owned(translate_batch, owned, resolved, source, target, engine)
+
+        for text, future in awaited.items():
+            resolved[text] = future.result()
+        return [resolved[text] for text in batch]
+
+    def _translate_owned(self, translate_batch, owned: List[str], resolved: Dict[str, str], source: str, target: str, engine: Hashable) -> None:
+        keys = [(engine, source, target, text) for text in owned]
+        try:
+            result = translate_batch(owned)
+            if len(result) != len(owned):
+                raise ValueError(f"Engine returned {len(result)} translations for {len(owned)} texts")
+        except BaseException as e:
+            with self._lock:
+                futures = [self._inflight.pop(key) for key in keys]
+            for future in futures:
+                future.set_exception(e)
+            raise
+
+        with self._lock:
+            futures = [self._inflight.pop(key) for key in keys]
+            self._done.update(zip(keys, result))
+        for text, translation, future in zip(owned, result, futures):
+            resolved[text] = translation
+            future.set_result(translation)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["dedup_ratio"] = round(1 - stats["sent"] / stats["requested"], 4) if stats["requested"] else 0.0
+        return stats
+
+    def clear(self) -> None:
+        "Forgets translated texts. Texts in flight are kept."
+        with self._lock:
+            self._done.clear()
+
+    def __len__(self) -> int:
+        return len(self._done)
@@ -0,0 +1,216 @@
+"""Composite translator impl: failover between engines and optional hedging of slow batches."""
+
+import threading
+import time
+import requests
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Union
+
+import qautolinguist.exceptions as qal_exceptions
+import qautolinguist.translators.exceptions as exceptions
+from qautolinguist.translators.base import BaseTranslator
+from qautolinguist.translators.metrics import TranslatorHook
+from qautolinguist.translators.routing import LanguageRouter
+from qautolinguist.translators.validate import is_empty, is_input_valid
+
+
+# errors after which the next engine is tried: throttling (429), server/request errors (5xx) and misaligned batches
+FAILOVER_ERRORS = (
+    exceptions.BaseError,
+    exceptions.RequestError,
+    exceptions.TooManyRequests,
+    exceptions.ServerException,
+    exceptions.AuthorizationException,
+    requests.exceptions.RequestException,
+)
+
+
+def engine_name(translator: BaseTranslator) -> str:
+    "Name of ``translator`` in ``__engines__`` (GoogleTranslator -> google)."
+    return translator.__class__.__name__.replace("Translator", "").lower()
+
+
+class FailoverTranslator(BaseTranslator):
+    """
+    class that translates with the first engine able to do it, in priority order.
+
+    Each engine is tried in ``priorities[target]`` order (``router`` ranking or ``engines`` order by default) and the next one is used when
+    the current one throttles, fails or returns a misaligned batch. With ``hedge_after`` (seconds), a batch that takes
+    longer is raced against the next engine and the first good result wins.
+
+    Usage:
+        FailoverTranslator(["google", "mymemory"], priorities={"ja": ["deepl", "google"]}, hedge_after=2.0,
+                           engine_kwargs={"deepl": {"api_key": ...}})
+    """
+
+    DEFAULT_ENGINES = ("google", "mymemory")
+
+    def __init__(
+        self,
+        engines: Sequence[Union[str, BaseTranslator]] = DEFAULT_ENGINES,
+        source: str = "auto",
+        target: str = "en",
+        priorities: Optional[Dict[str, List[str]]] = None,
+        hedge_after: Optional[float] = None,
+        engine_kwargs: Optional[Dict[str, dict]] = None,
+        router: Optional[LanguageRouter] = None,
+        **kwargs
+    ):
+        """
+        @param engines: engine names registered in ``__engines__`` or translator instances, in default priority order.
+        @param priorities: per target language engine order, e.g. ``{"ja": ["deepl", "google"]}``.
+        @param hedge_after: seconds after which a running batch is raced against the next engine. None disables hedging.
+        @param engine_kwargs: per engine constructor params, e.g. ``{"deepl": {"api_key": ...}}``.
+        @param router: ranks the engines of each language without explicit priority; fed with the measured latencies.
+        """
+        if not engines:
+            raise exceptions.InvalidResource("FailoverTranslator needs at least one engine")
+
+        self.engines: Dict[str, BaseTranslator] = {}
+        for engine in engines:
+            translator = self._build_engine(engine, source, target, (engine_kwargs or {}).get(engine, {}))
+            self.engines[engine_name(translator)] = translator
+
+        self.priorities = {lang: list(order) for lang, order in (priorities or {}).items()}
+        self.hedge_after = hedge_after
+        self._locks = {name: threading.Lock() for name in self.engines}     # engines keep per-call state
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        languages = {}
+        for translator in reversed(list(self.engines.values())):    # first engine wins on conflicting names
+            languages.update(translator.get_supported_languages(as_dict=True))
+        super().__init__(source=source, target=target, languages=languages, **kwargs)
+
+        self.router = router
+        if router is not None:
+            self.add_hook(router)
+
+    @staticmethod
+    def _build_engine(engine: Union[str, BaseTranslator], source: str, target: str, kwargs: dict) -> BaseTranslator:
+        if isinstance(engine, BaseTranslator):
+            return engine
+        from qautolinguist.translators.engines import __engines__   # imported here, engines imports this module
+        try:
+            cls = __engines__[engine.strip().lower()]
+        except KeyError:
+            raise qal_exceptions.InvalidEngine(
+                f"Unknown translation engine {engine!r}. Available engines: {', '.join(__engines__)}"
+            ) from None
+        return cls(**kwargs)
+
+    @property
+    def requires_connection(self) -> bool:
+        return any(translator.requires_connection for translator in self.engines.values())
+
+    def add_hook(self, hook: TranslatorHook) -> None:
+        "Registers ``hook`` in the composite (failover/hedge events) and in every engine (request events)."
+        super().add_hook(hook)
+        for translator in self.engines.values():
+            translator.add_hook(hook)
+
+    def remove_hook(self, hook: TranslatorHook) -> None:
+        super().remove_hook(hook)
+        for translator in self.engines.values():
+            translator.remove_hook(hook)
+
+    def close(self) -> None:
+        for translator in self.engines.values():
+            translator.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def is_language_supported(self, language: str, **kwargs) -> bool:
+        return any(translator.is_language_supported(language) for translator in self.engines.values())
+
+    def order_for(self, target: str) -> List[str]:
+        "Engines able to translate into ``target``, in priority order."
+        order = list(self.priorities.get(target) or (self.router.ranking(target) if self.router is not None else self.engines))
+        order += [name for name in self.engines if name not in order]   # engines missing in a priority list go last
+        return [name for name in order if name in self.engines and self.engines[name].is_language_supported(target)]
+
+    def translate(self, text: str, **kwargs) -> str:
+        """
+        function that translates ``text`` with the first engine able to
+        @param text: desired text to translate
+        @return: str: translated text
+        """
+        if not is_input_valid(text):
+            return
+        if self._same_source_target() or is_empty(text.strip()):
+            return text
+
+        errors = {}
+        for name in self.order_for(self._target):
+            translator = self.engines[name]
+            with self._locks[name]:
+                translator.source, translator.target = self._source, self._target
+                try:
+                    return translator.translate(text, **kwargs)
+                except FAILOVER_ERRORS as e:
+                    errors[name] = e
+                    self._emit("batch", "failover", 0.0, error=f"{name}: {type(e).__name__}")
+        raise exceptions.TranslationNotFound(f"{text} (every engine failed: {self._describe(errors)})")
+
+    def translate_file(self, path: str, **kwargs) -> str:
+        return self._translate_file(path, **kwargs)
+
+    def _translate_with(self, name: str, batch: List[str], kwargs: dict) -> List[str]:
+        translator = self.engines[name]
+        with self._locks[name]:
+            result = translator.translate_batch(batch, **{**kwargs, "never_fail": False})
+        if not isinstance(result, list) or len(result) != len(batch):
+            raise exceptions.TranslationNotFound(f"{name} returned a misaligned batch")
+        return result
+
+    def translate_batch(self, batch: List[str], **kwargs) -> List[str]:
+        """
+        translate a list of texts failing over (and racing, when ``hedge_after`` is set) between engines
+        @param batch: list of texts you want to translate
+        @return: list of translations
+        """
+        target = kwargs.get("target_lang", self._target)
+        self.source = kwargs.get("source_lang", "en")       # same defaults as BaseTranslator._translate_batch: events carry the locale
+        self.target = target
+        order = self.order_for(target)
+        if not order:
+            raise exceptions.LanguageNotSupportedException(target, message=f"No engine supports {target!r}")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(len(self.engines), thread_name_prefix="failover")
+
+        errors: Dict[str, Exception] = {}
+        pending: Dict[Future, str] = {}
+        remaining = list(order)
+        start = time.perf_counter()
+
+        def launch() -> None:
+            name = remaining.pop(0)
+            pending[self._executor.submit(self._translate_with, name, batch, kwargs)] = name
+
+        launch()
+        while pending:
+            hedge = self.hedge_after is not None and bool(remaining)
+            done, _ = wait(pending, timeout=self.hedge_after if hedge else None, return_when=FIRST_COMPLETED)
+            if not done:        # slow engine: race the next one
+                self._emit("batch", "hedge", time.perf_counter() - start, items=len(batch), error=f"{pending[next(iter(pending))]} slow")
+                launch()
+                continue
+
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    return future.result()      # losers keep running in background and release their engine when done
+                except FAILOVER_ERRORS as e:
+                    errors[name] = e
+                    self._emit("batch", "failover", time.perf_counter() - start, items=len(batch), error=f"{name}: {type(e).__name__}")
+            if not pending and remaining:
+                launch()
+
+        if kwargs.get("never_fail", True):      # last resort: first engine translating item by item
+            with self._locks[order[0]]:
+                return self.engines[order[0]].translate_batch(batch, **kwargs)
+        raise exceptions.TranslationNotFound(f"Batch cannot be translated, every engine failed: {self._describe(errors)}")
+
+    @staticmethod
+    def _describe(errors: Dict[str, Exception]) -> str:
+        return ", ".join(f"{name}: {type(error).__name__}" for name, error in errors.items())
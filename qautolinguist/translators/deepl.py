@@ -77,7 +77,7 @@ def translate(self, text: str, **kwargs) -> str:
             }
             # Do the request and check the connection.
             try:
-                response = requests.get(
+                response = self.session.get(
                     self._base_url + translate_endpoint, params=params
                 )
             except ConnectionError:
@@ -1,5 +1,5 @@
 
-
+import qautolinguist.translators   # noqa: F401 -- imports every engine so BaseTranslator knows its subclasses
 from qautolinguist.translators.base import BaseTranslator
 
 __engines__ = {
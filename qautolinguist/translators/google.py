@@ -67,7 +67,7 @@ def translate(self, text: str, strip_text: bool = False, separator: str = "") ->
         if self.payload_key:
             self._url_params[self.payload_key] = text
 
-        response = requests.get(
+        response = self.session.get(
             self._base_url, params=self._url_params, proxies=self.proxies
         )
 
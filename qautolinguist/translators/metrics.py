@@ -0,0 +1,172 @@
+"""Request-level events emitted by translators and a built-in aggregator producing latency percentiles."""
+
+import math
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+__all__: List[str] = ["TranslatorEvent", "MetricsAggregator", "percentile"]
+
+
+class TranslatorEvent:
+    """
+    Event emitted by ``BaseTranslator`` hooks.
+
+    - ``kind == "request"``: one call to the engine ``translate`` (one HTTP request for network engines).
+    - ``kind == "batch"``: one batch decision in ``_translate_batch`` with the time spent in that path.
+
+    ``path`` tells which strategy produced the event: ``joined`` (first separator), ``separator_retry``
+    (next separators after a misaligned result), ``each`` (per-item fallback), ``unresolved`` (per-item allowing failures).
+    """
+
+    __slots__ = ("kind", "engine", "source", "target", "path", "latency", "payload_bytes", "response_bytes", "items", "error")
+
+    def __init__(
+        self,
+        kind: str,
+        engine: str,
+        source: str,
+        target: str,
+        path: str,
+        latency: float,
+        payload_bytes: int = 0,
+        response_bytes: int = 0,
+        items: int = 1,
+        error: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.engine = engine
+        self.source = source
+        self.target = target
+        self.path = path
+        self.latency = latency
+        self.payload_bytes = payload_bytes
+        self.response_bytes = response_bytes
+        self.items = items
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"TranslatorEvent({self.kind}, {self.engine}, {self.source}->{self.target}, {self.path}, {self.latency:.4f}s)"
+
+
+TranslatorHook = Callable[[TranslatorEvent], None]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    "Nearest-rank percentile of an already sorted list. Returns 0.0 on empty input."
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _PathStats:
+    "Streaming figures of the events of one path: counts and sums, and a fixed-size reservoir of request latencies."
+
+    __slots__ = ("requests", "batches", "failed_batches", "errors", "payload_bytes", "response_bytes", "time", "latencies", "_seen", "_random")
+
+    def __init__(self, reservoir_size: int) -> None:
+        self.requests = 0
+        self.batches = 0
+        self.failed_batches = 0         # misaligned joins, each-item fallbacks that raised
+        self.errors = 0
+        self.payload_bytes = 0
+        self.response_bytes = 0
+        self.time = 0.0                 # batch time
+        self.latencies: List[float] = []
+        self._seen = 0
+        self._random = random.Random(reservoir_size)        # deterministic samples, summaries are reproducible
+
+    def add(self, event: TranslatorEvent, reservoir_size: int) -> None:
+        if event.kind == "batch":
+            self.batches += 1
+            self.failed_batches += not event.ok
+            self.time += event.latency
+            return
+        self.requests += 1
+        self.errors += not event.ok
+        self.payload_bytes += event.payload_bytes
+        self.response_bytes += event.response_bytes
+        self._seen += 1         # reservoir sampling (algorithm R): exact percentiles until the reservoir is full
+        if len(self.latencies) < reservoir_size:
+            self.latencies.append(event.latency)
+        else:
+            slot = self._random.randrange(self._seen)
+            if slot < reservoir_size:
+                self.latencies[slot] = event.latency
+
+
+class MetricsAggregator:
+    """
+    Translator hook that aggregates events. Add it with ``translator.add_hook(aggregator)``.
+
+    ``summary()`` returns request counts, errors, payload sizes, latency percentiles (overall and per path)
+    and the share of total batch time spent in each batch path.
+
+    Memory does not grow with the number of requests (translators live as long as ``watch`` sessions, batch runs
+    and shard workers): counts and sums are streamed, percentiles are computed from a reservoir of
+    ``reservoir_size`` latencies per path and only the last ``recent`` events are kept in ``events``.
+    """
+
+    PERCENTILES = (50, 90, 95, 99)
+    RESERVOIR_SIZE = 2048
+    RECENT_EVENTS = 256
+
+    def __init__(self, *, reservoir_size: int = RESERVOIR_SIZE, recent: int = RECENT_EVENTS) -> None:
+        self._lock = threading.Lock()
+        self.reservoir_size = reservoir_size
+        self.events: Deque[TranslatorEvent] = deque(maxlen=recent)      # last events, for debugging
+        self._paths: Dict[str, _PathStats] = {}
+        self._overall = _PathStats(reservoir_size)
+
+    def __call__(self, event: TranslatorEvent) -> None:
+        with self._lock:
+            self.events.append(event)
+            stats = self._paths.get(event.path)
+            if stats is None:
+                stats = self._paths[event.path] = _PathStats(self.reservoir_size)
+            stats.add(event, self.reservoir_size)
+            self._overall.add(event, self.reservoir_size)
+
+    def reset(self) -> None:
+        "Forgets every event, e.g. before the next build of a long-running process."
+        with self._lock:
+            self.events.clear()
+            self._paths.clear()
+            self._overall = _PathStats(self.reservoir_size)
+
+    def _latencies(self, stats: _PathStats) -> Dict[str, float]:
+        latencies = sorted(stats.latencies)
+        return {f"p{pct}": round(percentile(latencies, pct), 6) for pct in self.PERCENTILES}
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            overall = self._overall
+            per_path = {
+                path: {
+                    "requests": stats.requests,
+                    "batches": stats.batches,
+                    "failed_batches": stats.failed_batches,
+                    "time": round(stats.time, 6),
+                    "time_share": round(stats.time / overall.time, 4) if overall.time else 0.0,
+                    "latency": self._latencies(stats),
+                }
+                for path, stats in sorted(self._paths.items())
+            }
+            return {
+                "requests": overall.requests,
+                "errors": overall.errors,
+                "payload_bytes": overall.payload_bytes,
+                "response_bytes": overall.response_bytes,
+                "latency": self._latencies(overall),
+                "paths": per_path,
+            }
@@ -62,7 +62,7 @@ def _get_supported_languages(self):
             "https://api.cognitive.microsofttranslator.com/languages?api-version=3.0&scope"
             "=translation "
         )
-        microsoft_languages_response = requests.get(
+        microsoft_languages_response = self.session.get(
             microsoft_languages_api_url
         )
         translation_dict = microsoft_languages_response.json()["translation"]
@@ -87,7 +87,7 @@ def translate(self, text: str, **kwargs) -> str:
 
             valid_microsoft_json = [{"text": text}]
             try:
-                response = requests.post(
+                response = self.session.post(
                     self._base_url,
                     params=self._url_params,
                     headers=self.headers,
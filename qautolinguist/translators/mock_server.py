@@ -0,0 +1,220 @@
+"""
+Local mock translation server.
+
+Emulates the response shapes of the Google (``/m``), MyMemory (``/get``) and DeepL (``/v2/translate``) endpoints
+so the engines in this package can be exercised and load tested without network access.
+Translations are produced with ``pseudo_localize``; latency, 429 responses and misaligned batches can be injected.
+"""
+
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from qautolinguist.translators.base import BaseTranslator
+from qautolinguist.translators.constants import SILENT_SEPARATORS
+from qautolinguist.translators.pseudo import pseudo_localize
+
+
+__all__: List[str] = ["MockTranslationServer"]
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    server: "_MockHTTPServer"
+
+    def log_message(self, format, *args):     # silence default stderr logging
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self._dispatch(url.path, {key: values[0] for key, values in parse_qs(url.query).items()})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        params.update({key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()})
+        self._dispatch(url.path, params)
+
+    def _dispatch(self, path: str, params: Dict[str, str]):
+        mock = self.server.mock
+        status, content_type, body = mock._respond(path, params)
+        payload = body.encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, mock: "MockTranslationServer"):
+        self.mock = mock
+        super().__init__(address, _MockHandler)
+
+
+class MockTranslationServer:
+    """
+    Small threaded HTTP server that answers like the public translation endpoints.
+
+    Usage:
+        with MockTranslationServer(latency=0.05, error_rate=0.1) as server:
+            translator = GoogleTranslator()
+            server.attach(translator)          # points translator._base_url to the mock
+            translator.translate_batch(["Open", "Save"], target_lang="es")
+
+    ### Params:
+    @param latency: Seconds waited before answering each request.
+    @param jitter: Random extra seconds (uniform in ``[0, jitter]``) added to ``latency``.
+    @param error_rate: Probability (0-1) of answering with ``429 Too Many Requests``.
+    @param misalign_rate: Probability (0-1) of dropping one silent separator, so a joined batch no longer splits
+    into the same number of items.
+    @param transform: Callable used to "translate" the text. Defaults to ``pseudo_localize``.
+    """
+
+    ENDPOINTS = {
+        "google": "/m",
+        "mymemory": "/get",
+        "deepl": "/v2/",
+    }
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        misalign_rate: float = 0.0,
+        transform: Optional[Callable[[str], str]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.misalign_rate = misalign_rate
+        self.transform = transform or pseudo_localize
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[_MockHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"requests": 0, "throttled": 0, "misaligned": 0}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("Mock server is not running. Call start() first.")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, engine: str) -> str:
+        "Returns the url that replaces the ``BASE_URLS`` entry of ``engine`` (google, mymemory or deepl)."
+        try:
+            return self.base_url + self.ENDPOINTS[engine.lower()]
+        except KeyError:
+            raise ValueError(f"No mock endpoint for engine {engine!r}. Available: {list(self.ENDPOINTS)}") from None
+
+    def attach(self, translator: BaseTranslator) -> BaseTranslator:
+        "Redirects ``translator`` requests to this server."
+        engine = translator._type().replace("Translator", "").lower()
+        translator._base_url = self.url_for(engine)
+        return translator
+
+    def start(self) -> "MockTranslationServer":
+        self._httpd = _MockHTTPServer((self.host, self.port), self)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="qal-mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = self._thread = None
+
+    def serve_forever(self) -> None:
+        "Blocking variant of ``start()``, used when running the module as a script."
+        self._httpd = _MockHTTPServer((self.host, self.port), self)
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    #& -- Internal --
+    def _roll(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def _translate(self, text: str) -> str:
+        translated = self.transform(text)
+        if self._roll(self.misalign_rate):
+            for sep in SILENT_SEPARATORS:
+                if sep in translated:
+                    with self._lock:
+                        self.stats["misaligned"] += 1
+                    return translated.replace(sep, "", 1)
+        return translated
+
+    def _respond(self, path: str, params: Dict[str, str]):
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        if self._roll(self.error_rate):
+            with self._lock:
+                self.stats["throttled"] += 1
+            return 429, "text/plain", "Too Many Requests"
+
+        if path == self.ENDPOINTS["google"]:
+            text = self._translate(params.get("q", ""))
+            return 200, "text/html; charset=utf-8", (
+                f'<html><body><div class="result-container">{html.escape(text, quote=False)}</div></body></html>'
+            )
+        if path == self.ENDPOINTS["mymemory"]:
+            text = self._translate(params.get("q", ""))
+            return 200, "application/json", json.dumps(
+                {"responseData": {"translatedText": text, "match": 1}, "responseStatus": 200, "matches": []}
+            )
+        if path == self.ENDPOINTS["deepl"] + "translate":
+            text = self._translate(params.get("text", ""))
+            return 200, "application/json", json.dumps(
+                {"translations": [{"detected_source_language": params.get("source_lang", "EN"), "text": text}]}
+            )
+        return 404, "text/plain", "Not Found"
+
+
+if __name__ == "__main__":
+    import click
+
+    @click.command()
+    @click.option("--host", default="127.0.0.1")
+    @click.option("--port", default=8765, type=int)
+    @click.option("--latency", default=0.0, type=float, help="Seconds waited before each answer.")
+    @click.option("--error-rate", default=0.0, type=float, help="Probability of answering 429.")
+    @click.option("--misalign-rate", default=0.0, type=float, help="Probability of breaking joined batches.")
+    def main(host, port, latency, error_rate, misalign_rate):
+        server = MockTranslationServer(host, port, latency=latency, error_rate=error_rate, misalign_rate=misalign_rate)
+        click.secho(f"Mock translation server listening on http://{host}:{port}", fg="green")
+        server.serve_forever()
+
+    main()
@@ -1,7 +1,289 @@
-"File that checks the quality of automatic translations."
+"""
+File that checks the quality of automatic translations.
+
+``MTQualityValidator`` scores whole batches at once:
+    - BLEU and GLEU (sentence level, 1-4 grams) of each translation against a reference, when there is one
+      (a reviewed translation, a back-translation...). N-grams of each sentence are counted once and shared by both metrics.
+    - a length-ratio heuristic (translation chars / source chars) that needs no reference.
+
+Scores are cached per (reference, translation) pair and the batches of several locales can be scored in
+worker processes. Entries under the thresholds are flagged for review.
+
+The n-gram scorer is implemented here, without dependencies. ``nltk`` (``pip install qautolinguist[nltk]``) is only
+a reference backend, imported the first time it is used (``MTQualityValidator(backend="nltk")``).
+See ``benchs/bench_quality.py`` for a speed and equality comparison of both backends.
+"""
+
+import math
+import re
+import warnings
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+__all__: List[str] = [
+    "MTQualityValidator",
+    "QualityReport",
+    "tokenize",
+    "ngram_counts",
+    "sentence_scores",
+    "nltk_sentence_scores",
+    "BACKENDS",
+]
+
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+Batch = Tuple[Sequence[str], Sequence[str], Optional[Sequence[str]]]     # (sources, translations, references)
+
+
+def tokenize(text: str) -> List[str]:
+    "Lowercased words and punctuation marks of ``text``."
+    return _TOKEN_RE.findall(text.lower())
+
+
+def ngram_counts(tokens: Sequence[str], max_n: int = 4) -> Counter:
+    "Counts of every 1 to ``max_n``-gram of ``tokens`` in one ``Counter`` (1-grams are plain tokens, longer n-grams tuples)."
+    counts = Counter(tokens)
+    for n in range(2, max_n + 1):
+        counts.update(zip(*(tokens[i:] for i in range(n))))
+    return counts
+
+
+@lru_cache(maxsize=1 << 16)
+def _analyze(text: str, max_n: int) -> Tuple[int, Counter]:
+    "Token count and n-gram counts of ``text``. Cached: sources are scored against the translations of every locale."
+    tokens = tokenize(text)
+    return len(tokens), ngram_counts(tokens, max_n)
+
+
+def sentence_scores(reference: str, hypothesis: str, max_n: int = 4) -> Tuple[float, float]:
+    """
+    ``(BLEU, GLEU)`` of ``hypothesis`` against ``reference``.
+    BLEU uses uniform weights, brevity penalty and no smoothing; GLEU is min(recall, precision) of all 1 to ``max_n``-grams.
+    """
+    ref_len, ref_counts = _analyze(reference, max_n)
+    hyp_len, hyp_counts = _analyze(hypothesis, max_n)
+
+    matches = [0] * max_n
+    for gram, count in (hyp_counts & ref_counts).items():
+        matches[0 if isinstance(gram, str) else len(gram) - 1] += count
+    hyp_totals = [max(0, hyp_len - n) for n in range(max_n)]
+    ref_totals = [max(0, ref_len - n) for n in range(max_n)]
+
+    # GLEU
+    denominator = max(sum(hyp_totals), sum(ref_totals))
+    gleu = sum(matches) / denominator if denominator else 0.0
+
+    # BLEU: geometric mean of the modified precisions times the brevity penalty
+    if not hyp_len or 0 in matches:
+        return 0.0, gleu
+    log_precision = sum(math.log(match / total) for match, total in zip(matches, hyp_totals)) / max_n
+    brevity = 1.0 if hyp_len > ref_len else math.exp(1 - ref_len / hyp_len)
+    return brevity * math.exp(log_precision), gleu
+
+
+def nltk_sentence_scores(reference: str, hypothesis: str, max_n: int = 4) -> Tuple[float, float]:
+    """
+    ``sentence_scores()`` computed by nltk with the same tokens and settings.
+    
+    ### Raises:
+        - ``ImportError``: If nltk is not installed.
+    """
+    try:
+        from nltk.translate.bleu_score import sentence_bleu
+        from nltk.translate.gleu_score import sentence_gleu
+    except ImportError:
+        raise ImportError("The nltk quality backend requires nltk: pip install qautolinguist[nltk]") from None
+    
+    ref_tokens, hyp_tokens = tokenize(reference), tokenize(hypothesis)
+    with warnings.catch_warnings():         # nltk warns about zero n-gram matches, scored 0 anyway
+        warnings.simplefilter("ignore")
+        bleu = sentence_bleu([ref_tokens], hyp_tokens, weights=(1 / max_n,) * max_n) if hyp_tokens else 0.0
+    return float(bleu), float(sentence_gleu([ref_tokens], hyp_tokens, min_len=1, max_len=max_n))
+
+
+BACKENDS: Dict[str, Callable[[str, str, int], Tuple[float, float]]] = {
+    "native": sentence_scores,
+    "nltk": nltk_sentence_scores,
+}
+
+
+def _score_pairs(pairs: List[Tuple[str, str]], max_n: int, backend: str = "native") -> List[Tuple[float, float]]:
+    "Worker of ``MTQualityValidator.check_locales``: scores ``(reference, hypothesis)`` pairs."
+    scorer = BACKENDS[backend]
+    return [scorer(reference, hypothesis, max_n) for reference, hypothesis in pairs]
+
+
+class QualityReport:
+    "Scores of one locale batch. ``bleu`` and ``gleu`` are None when the batch had no references."
+
+    __slots__ = ("locale", "bleu", "gleu", "length_ratio", "flagged")
+
+    def __init__(
+        self,
+        locale: str,
+        length_ratio: List[float],
+        flagged: List[int],
+        bleu: Optional[List[float]] = None,
+        gleu: Optional[List[float]] = None,
+    ):
+        self.locale = locale
+        self.length_ratio = length_ratio
+        self.flagged = flagged          # indices of the entries to review
+        self.bleu = bleu
+        self.gleu = gleu
+
+    def mean(self, metric: str) -> Optional[float]:
+        values = getattr(self, metric)
+        return sum(values) / len(values) if values else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "locale": self.locale,
+            "messages": len(self.length_ratio),
+            "flagged": self.flagged,
+            "mean_bleu": self.mean("bleu"),
+            "mean_gleu": self.mean("gleu"),
+        }
+
+    def __repr__(self) -> str:
+        return f"QualityReport({self.locale}, {len(self.flagged)}/{len(self.length_ratio)} flagged)"
 
-from nltk.translate.bleu_score import sentence_bleu
-from nltk.translate.gleu_score import sentence_gleu
 
 class MTQualityValidator:
-    ... # implement stuff
+    """
+    Usage:
+        validator = MTQualityValidator(min_gleu=0.5)
+        report = validator.check_batch(sources, translations, references=back_translations, locale="es")
+        reports = validator.check_locales({"es": (sources, es, None), "fr": (sources, fr, None)}, processes=4)
+
+    An entry is flagged when its GLEU is under ``min_gleu`` (only with references), when its length ratio is out
+    of ``length_bounds`` (only sources with ``min_length`` chars or more) or when a non empty source has an empty translation.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_gleu: float = 0.5,
+        length_bounds: Tuple[float, float] = (0.25, 4.0),
+        min_length: int = 8,
+        max_n: int = 4,
+        parallel_threshold: int = 20000,
+        backend: str = "native",
+    ):
+        """
+        @param parallel_threshold: minimum number of uncached pairs to score them in worker processes.
+        @param backend: ``native`` (default) or ``nltk`` (reference implementation, needs nltk installed).
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown quality backend {backend!r}. Available: {', '.join(BACKENDS)}")
+        self.backend = backend
+        self.min_gleu = min_gleu
+        self.length_bounds = length_bounds
+        self.min_length = min_length
+        self.max_n = max_n
+        self.parallel_threshold = parallel_threshold
+        self._cache: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def length_ratios(self, sources: Sequence[str], translations: Sequence[str]) -> List[float]:
+        return [len(translation) / len(source) if source else 1.0 for source, translation in zip(sources, translations)]
+
+    def score_batch(self, references: Sequence[str], hypotheses: Sequence[str]) -> Tuple[List[float], List[float]]:
+        "``(bleu, gleu)`` lists of ``hypotheses`` against ``references``. Cached pairs are not scored again."
+        cache, max_n, scorer = self._cache, self.max_n, BACKENDS[self.backend]
+        for pair in zip(references, hypotheses):
+            if pair not in cache:
+                cache[pair] = scorer(pair[0], pair[1], max_n)
+        scores = [cache[pair] for pair in zip(references, hypotheses)]
+        return [bleu for bleu, _ in scores], [gleu for _, gleu in scores]
+
+    def _flag(self, sources: Sequence[str], translations: Sequence[str], ratios: List[float], gleu: Optional[List[float]]) -> List[int]:
+        low, high = self.length_bounds
+        flagged = []
+        for idx, (source, translation, ratio) in enumerate(zip(sources, translations, ratios)):
+            if source.strip() and not translation.strip():
+                flagged.append(idx)
+            elif gleu is not None and gleu[idx] < self.min_gleu:
+                flagged.append(idx)
+            elif len(source) >= self.min_length and not low <= ratio <= high:
+                flagged.append(idx)
+        return flagged
+
+    def check_batch(
+        self,
+        sources: Sequence[str],
+        translations: Sequence[str],
+        references: Optional[Sequence[str]] = None,
+        locale: str = "",
+        *,
+        back_translations: Optional[Sequence[str]] = None,
+    ) -> QualityReport:
+        """
+        Scores the ``translations`` of ``sources``. With ``references`` (aligned with ``sources``), BLEU and GLEU of the
+        translations are computed too. With ``back_translations`` instead, BLEU and GLEU are those of the round trip
+        (``back_translations`` against ``sources``).
+
+        ### Raises:
+            - ``ValueError``: If the lists are not aligned.
+        """
+        self._check_aligned(sources, translations, references)
+        self._check_aligned(sources, translations, back_translations)
+        ratios = self.length_ratios(sources, translations)
+        bleu = gleu = None
+        if references is not None:
+            bleu, gleu = self.score_batch(references, translations)
+        elif back_translations is not None:
+            bleu, gleu = self.score_batch(sources, back_translations)
+        return QualityReport(locale, ratios, self._flag(sources, translations, ratios, gleu), bleu, gleu)
+
+    def check_locales(
+        self, 
+        batches: Dict[str, Batch], 
+        processes: Optional[int] = None, 
+        *, 
+        back_translations: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> Dict[str, QualityReport]:
+        """
+        ``check_batch`` for every ``dict[locale: (sources, translations, references)]``, with the ``back_translations``
+        (``dict[locale: back_translations]``) of the locales without references. When the uncached pairs
+        reach ``parallel_threshold`` and ``processes`` allows it, each locale is scored in a worker process.
+        """
+        back_translations = back_translations or {}
+        pending: Dict[str, List[Tuple[str, str]]] = {}
+        for locale, (sources, translations, references) in batches.items():
+            back = back_translations.get(locale)
+            self._check_aligned(sources, translations, references)
+            self._check_aligned(sources, translations, back)
+            if references is not None:
+                pairs = zip(references, translations)
+            elif back is not None:
+                pairs = zip(sources, back)
+            else:
+                continue
+            pending[locale] = list(dict.fromkeys(pair for pair in pairs if pair not in self._cache))
+
+        if (processes is None or processes > 1) and len(pending) > 1 and sum(map(len, pending.values())) >= self.parallel_threshold:
+            with ProcessPoolExecutor(processes) as executor:
+                futures = {locale: executor.submit(_score_pairs, pairs, self.max_n, self.backend) for locale, pairs in pending.items() if pairs}
+                for locale, future in futures.items():
+                    self._cache.update(zip(pending[locale], future.result()))
+
+        return {
+            locale: self.check_batch(*batch, locale=locale, back_translations=back_translations.get(locale)) 
+            for locale, batch in batches.items()
+        }
+
+    @staticmethod
+    def _check_aligned(sources: Sequence[str], translations: Sequence[str], references: Optional[Sequence[str]]) -> None:
+        if len(sources) != len(translations) or (references is not None and len(references) != len(sources)):
+            raise ValueError("Sources, translations and references must have the same length.")
@@ -62,7 +62,7 @@ def translate(
             if self.email:
                 self._url_params["de"] = self.email
 
-            response = requests.get(
+            response = self.session.get(
                 self._base_url, params=self._url_params, proxies=self.proxies
             )
 
@@ -0,0 +1,120 @@
+"""Pseudo-localization translator impl (offline engine)"""
+
+import re
+from typing import List, Optional
+
+from qautolinguist.translators.base import BaseTranslator
+from qautolinguist.translators.constants import GOOGLE_LANGUAGES_TO_CODES, SILENT_SEPARATORS
+from qautolinguist.translators.validate import is_empty, is_input_valid
+
+
+ACCENTED_CHARS = str.maketrans(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "àƀçđéƒĝĥîĵķĺɱñöþǫŕšŧûṽŵẋýžÀƁÇĐÉƑĜĤÎĴĶĹṀÑÖÞǪŔŠŦÛṼŴẊÝŽ",
+)
+
+# Tokens that must reach the .ts untouched: html tags, entities, Qt (%1, %n) and python-format ({0}, {name}) placeholders.
+_PROTECTED_TOKENS = re.compile(r"<[^>]*>|&[#\w]+;|%(?:\d+|n|L\d+)|\{[^{}]*\}")
+_SEPARATORS_SPLIT = re.compile(f"({'|'.join(map(re.escape, SILENT_SEPARATORS))})")
+
+
+def pseudo_localize(
+    text: str,
+    *,
+    accents: bool = True,
+    expansion: float = 0.3,
+    padding_char: str = "~",
+    brackets: Optional[tuple] = ("[", "]"),
+) -> str:
+    """
+    Pseudo-localizes ``text``: replaces ascii letters with accented look-alikes, pads the text by ``expansion`` times its length
+    and wraps it into ``brackets``. Silent separators are kept so joined batches can still be split back.
+    @param accents: When True, replaces ascii letters with accented variants.
+    @param expansion: Fraction of the text length appended as padding to emulate longer languages.
+    @param brackets: Pair of markers used to reveal truncated or concatenated strings. Use None to disable it.
+    """
+    chunks = []
+    for chunk in _SEPARATORS_SPLIT.split(text):
+        if not chunk.strip() or chunk in SILENT_SEPARATORS:
+            chunks.append(chunk)
+            continue
+
+        parts, last = [], 0
+        for match in _PROTECTED_TOKENS.finditer(chunk):
+            plain = chunk[last:match.start()]
+            parts.append(plain.translate(ACCENTED_CHARS) if accents else plain)
+            parts.append(match.group())
+            last = match.end()
+        plain = chunk[last:]
+        parts.append(plain.translate(ACCENTED_CHARS) if accents else plain)
+
+        localized = "".join(parts) + padding_char * int(len(chunk) * expansion)
+        if brackets:
+            localized = f"{brackets[0]}{localized}{brackets[1]}"
+        chunks.append(localized)
+
+    return "".join(chunks)
+
+
+class PseudoTranslator(BaseTranslator):
+    """
+    class that pseudo-localizes texts without any network access.
+    Useful to exercise the build pipeline offline and to reveal UI truncation or hard-coded strings.
+    """
+
+    requires_connection = False
+
+    def __init__(
+        self,
+        source: str = "auto",
+        target: str = "en",
+        accents: bool = True,
+        expansion: float = 0.3,
+        padding_char: str = "~",
+        brackets: Optional[tuple] = ("[", "]"),
+        **kwargs
+    ):
+        """
+        @param source: source language to translate from
+        @param target: target language to translate to
+        @param expansion: fraction of the text length added as padding
+        @param brackets: pair of markers that wrap every translated text
+        """
+        self.accents = accents
+        self.expansion = expansion
+        self.padding_char = padding_char
+        self.brackets = brackets
+        super().__init__(
+            source=source,
+            target=target,
+            languages=GOOGLE_LANGUAGES_TO_CODES,
+            **kwargs
+        )
+
+    def translate(self, text: str, **kwargs) -> str:
+        """
+        function to pseudo-localize a text
+        @param text: desired text to translate
+        @return: str: translated text
+        """
+        if is_input_valid(text):
+            if self._same_source_target() or is_empty(text.strip()):
+                return text
+            return pseudo_localize(
+                text,
+                accents=self.accents,
+                expansion=self.expansion,
+                padding_char=self.padding_char,
+                brackets=self.brackets,
+            )
+
+    def translate_file(self, path: str, **kwargs) -> str:
+        return self._translate_file(path, **kwargs)
+
+    def translate_batch(self, batch: List[str], **kwargs) -> List[str]:
+        """
+        translate a list of texts
+        @param batch: list of texts you want to translate
+        @return: list of translations
+        """
+        return self._translate_batch(batch, **kwargs)
@@ -0,0 +1,148 @@
+"""
+Engine-aware language routing.
+
+``LanguageRouter`` precomputes, for each requested locale, the engines able to translate into it ranked by
+``cost_weight * cost + latency_weight * latency``. Support comes from the static language tables of each engine
+(no engine is built and nothing is probed); latency starts from a prior and is updated with the latencies measured
+by translator hooks, re-ranking the table when it changes.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from qautolinguist.translators.constants import (
+    DEEPL_LANGUAGE_TO_CODE,
+    GOOGLE_LANGUAGES_TO_CODES,
+    MY_MEMORY_LANGUAGES_TO_CODES,
+)
+from qautolinguist.translators.metrics import TranslatorEvent
+
+
+__all__: List[str] = ["EngineProfile", "LanguageRouter", "DEFAULT_PROFILES"]
+
+
+class EngineProfile:
+    """
+    Static description of an engine used for routing.
+
+    - ``languages``: names and codes the engine accepts (``None`` when only known at runtime, e.g. Microsoft).
+    - ``cost``: price per million characters (0 for free endpoints).
+    - ``latency``: expected seconds per request until measured.
+    """
+
+    __slots__ = ("name", "languages", "cost", "latency")
+
+    def __init__(self, name: str, languages: Optional[Dict[str, str]], cost: float = 0.0, latency: float = 0.5):
+        self.name = name
+        self.languages: Optional[Set[str]] = (
+            {lang.lower() for pair in languages.items() for lang in pair} if languages is not None else None
+        )
+        self.cost = cost
+        self.latency = latency
+
+    def supports(self, locale: str) -> bool:
+        return self.languages is not None and any(candidate in self.languages for candidate in _candidates(locale))
+
+    def __repr__(self) -> str:
+        return f"EngineProfile({self.name}, cost={self.cost}, latency={self.latency:.3f})"
+
+
+DEFAULT_PROFILES: Dict[str, EngineProfile] = {
+    profile.name: profile for profile in (
+        EngineProfile("google", GOOGLE_LANGUAGES_TO_CODES, cost=0.0, latency=0.3),
+        EngineProfile("mymemory", MY_MEMORY_LANGUAGES_TO_CODES, cost=0.0, latency=0.6),
+        EngineProfile("deepl", DEEPL_LANGUAGE_TO_CODE, cost=20.0, latency=0.4),
+        EngineProfile("microsoft", None, cost=10.0, latency=0.4),      # languages are downloaded by the engine
+        EngineProfile("pseudo", GOOGLE_LANGUAGES_TO_CODES, cost=0.0, latency=0.0),
+    )
+}
+
+
+def _candidates(locale: str) -> List[str]:
+    "Spellings of ``locale`` tried against the language tables: es_ES -> es_es, es-es, es."
+    locale = locale.strip().lower()
+    dashed = locale.replace("_", "-")
+    return [locale, dashed, dashed.split("-")[0]]
+
+
+class LanguageRouter:
+    """
+    Usage:
+        router = LanguageRouter(["google", "deepl"], latency_weight=10.0)
+        router.route("ja")                  # best engine for ja
+        router.priorities(["ja", "es"])     # {locale: [engines by rank]}, e.g. for FailoverTranslator(priorities=...)
+        translator.add_hook(router)         # feeds measured latencies back
+
+    ``languages`` adds or replaces the table of an engine, e.g. ``{"microsoft": translator.get_supported_languages(as_dict=True)}``.
+    """
+
+    def __init__(
+        self,
+        engines: Iterable[str] = ("google", "mymemory", "deepl", "microsoft"),
+        *,
+        cost_weight: float = 1.0,
+        latency_weight: float = 1.0,
+        costs: Optional[Dict[str, float]] = None,
+        latencies: Optional[Dict[str, float]] = None,
+        languages: Optional[Dict[str, Dict[str, str]]] = None,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.cost_weight = cost_weight
+        self.latency_weight = latency_weight
+        self.smoothing = smoothing          # weight of each new latency sample in the moving average
+        self._lock = threading.Lock()
+        self._table: Dict[str, List[str]] = {}
+
+        self.profiles: Dict[str, EngineProfile] = {}
+        for name in engines:
+            default = DEFAULT_PROFILES.get(name)
+            table = (languages or {}).get(name)
+            profile = EngineProfile(name, table, default.cost if default else 0.0, default.latency if default else 0.5)
+            if table is None and default is not None:
+                profile.languages = default.languages
+            profile.cost = (costs or {}).get(name, profile.cost)
+            profile.latency = (latencies or {}).get(name, profile.latency)
+            self.profiles[name] = profile
+
+    def score(self, engine: str) -> float:
+        profile = self.profiles[engine]
+        return self.cost_weight * profile.cost + self.latency_weight * profile.latency
+
+    def ranking(self, locale: str) -> List[str]:
+        "Engines supporting ``locale`` from best to worst score. Computed once per locale and cached."
+        with self._lock:
+            ranked = self._table.get(locale)
+            if ranked is None:
+                order = list(self.profiles)
+                ranked = sorted(
+                    (name for name in order if self.profiles[name].supports(locale)),
+                    key=lambda name: (self.score(name), order.index(name)),
+                )
+                self._table[locale] = ranked
+        return list(ranked)
+
+    def route(self, locale: str) -> Optional[str]:
+        "Best engine for ``locale`` or None if no engine supports it."
+        ranked = self.ranking(locale)
+        return ranked[0] if ranked else None
+
+    def priorities(self, locales: Iterable[str]) -> Dict[str, List[str]]:
+        "Precomputed routing table ``dict[locale: engines by rank]``."
+        return {locale: self.ranking(locale) for locale in locales}
+
+    def unsupported(self, locales: Iterable[str]) -> List[str]:
+        return [locale for locale in locales if not self.ranking(locale)]
+
+    def observe(self, engine: str, latency: float) -> None:
+        "Updates the measured latency of ``engine``; routing is recomputed when needed."
+        with self._lock:
+            profile = self.profiles.get(engine)
+            if profile is None:
+                return
+            profile.latency += self.smoothing * (latency - profile.latency)
+            self._table.clear()
+
+    def __call__(self, event: TranslatorEvent) -> None:
+        "Translator hook: feeds the latency of successful requests."
+        if event.kind == "request" and event.ok:
+            self.observe(event.engine.replace("Translator", "").lower(), event.latency)
@@ -0,0 +1,169 @@
+"""
+Watch mode: keeps a warm ``QAutoLinguist`` instance (engine, HTTP session, translation memory and build manifest)
+and rebuilds translations when the source file or a translatable changes.
+
+- Source file changed:  lupdate + incremental in-memory build. Only sources missing in the translation memory
+                        are translated and up-to-date locales are skipped by the build manifest.
+- Translatable changed: ``compose_qm_files()``, which patches the edited ``<translation>`` elements and only
+                        recompiles the affected locales. Edits are fed back into the translation memory.
+
+Changes are detected by polling file mtimes (no extra dependency) and debounced, so an editor saving
+several files at once triggers a single rebuild.
+"""
+
+import time
+import threading
+import qautolinguist.exceptions as exceptions
+import qautolinguist.translatables as translatables
+
+from click import echo
+from pathlib import Path
+from qautolinguist.qal import QAutoLinguist
+from qautolinguist.debugstyles import DebugLogs
+from typing import Callable, Dict, List, Optional, Set
+
+
+__all__: List[str] = ["WatchSession"]
+
+
+class WatchSession:
+    """
+    Polls ``qal.source_file`` and ``qal.translatables_folder`` and rebuilds on changes.
+
+    Usage:
+        session = WatchSession(QAutoLinguist(**config))
+        session.run()                   # until KeyboardInterrupt or session.stop()
+
+    ``on_rebuild(kind, locales)`` is called after each rebuild, where kind is ``"sources"`` or ``"translatables"``.
+    """
+
+    def __init__(
+        self,
+        qal: QAutoLinguist,
+        *,
+        interval: float = 0.5,
+        debounce: float = 0.3,
+        on_rebuild: Optional[Callable[[str, List[str]], None]] = None,
+    ) -> None:
+        if qal.clean:       # watched translatables and .ts files must survive between rebuilds
+            echo(DebugLogs.warning("Watch mode keeps translatables and .ts files, clean option is ignored."))
+            qal.clean = False
+        if qal.revise_after_build:
+            qal.revise_after_build = False
+
+        self.qal = qal
+        self.interval = interval
+        self.debounce = debounce
+        self.on_rebuild = on_rebuild
+        self._stop = threading.Event()
+        self._mtimes: Dict[Path, int] = {}
+        self._pending: Set[Path] = set()
+        self._last_change: float = 0.0
+
+    #& -- Change detection --
+    def _watched(self) -> List[Path]:
+        files = [Path(self.qal.source_file)]
+        extension = self.qal.translatable_format.extension
+        if self.qal.translatables_folder.exists():
+            files.extend(sorted(self.qal.translatables_folder.glob(f"*{extension}")))
+        return files
+
+    def snapshot(self) -> None:
+        "Stores the current mtimes as the reference for ``poll()``."
+        self._mtimes = {path: self._mtime(path) for path in self._watched()}
+
+    @staticmethod
+    def _mtime(path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return -1
+
+    def poll(self) -> Set[Path]:
+        "Returns the watched files created, modified or removed since the last ``snapshot()``."
+        current = {path: self._mtime(path) for path in self._watched()}
+        changed = {path for path, mtime in current.items() if self._mtimes.get(path) != mtime}
+        changed.update(path for path in self._mtimes if path not in current)
+        self._mtimes = current
+        return changed
+
+    #& -- Rebuilds --
+    def rebuild_sources(self) -> List[str]:
+        "Runs an incremental build with the warm instance. Returns the rebuilt locales."
+        qal = self.qal
+        qal.reinitiaze()
+        with qal.instrumentation.stage("watch_rebuild"):
+            qal._run_build()
+        return list(qal.map)
+
+    def recompile_translatables(self) -> List[str]:
+        "Recompiles the locales whose translatable was edited. Returns the recompiled locales."
+        qal = self.qal
+        with qal.instrumentation.stage("watch_compose"):
+            compiled = QAutoLinguist.compose_qm_files(cache_dir=qal.cache_dir)
+
+        for locale in compiled:     # edits made by hand are kept by later source rebuilds
+            translatable = qal.translatables_folder / (locale.lower() + qal.translatable_format.extension)
+            if translatable.exists():
+                groups = translatables.format_for(translatable).iter_groups(translatable)
+                qal.translation_memory.setdefault(locale, {}).update(
+                    (group["SOURCE"], group["TRANSLATION"]) for group in groups
+                )
+        return compiled
+
+    def process(self, changed: Set[Path]) -> Optional[str]:
+        """
+        Rebuilds according to ``changed`` files. A source change takes precedence since it rewrites the translatables.
+        Returns the kind of rebuild done, if any.
+        """
+        if not changed:
+            return None
+
+        source = Path(self.qal.source_file)
+        kind = "sources" if source in changed else "translatables"
+        start = time.perf_counter()
+        try:
+            locales = self.rebuild_sources() if kind == "sources" else self.recompile_translatables()
+        except exceptions.QALBaseException as e:
+            echo(DebugLogs.error(f"Rebuild failed, waiting for new changes. Detailed error: {e}"))
+            return None
+        finally:
+            self.snapshot()     # files written by the rebuild must not trigger another one
+
+        echo(DebugLogs.info(
+            f"Rebuilt {kind} in {time.perf_counter() - start:.3f}s: {', '.join(locales) if locales else 'everything up to date'}"
+        ))
+        if self.on_rebuild is not None:
+            self.on_rebuild(kind, locales)
+        return kind
+
+    def step(self, now: Optional[float] = None) -> Optional[str]:
+        """
+        One polling cycle. Changes are accumulated until no new change is seen during ``debounce`` seconds.
+        Returns the kind of rebuild done, if any.
+        """
+        now = time.monotonic() if now is None else now
+        changed = self.poll()
+        if changed:
+            self._pending |= changed
+            self._last_change = now
+            return None
+        if self._pending and now - self._last_change >= self.debounce:
+            pending, self._pending = self._pending, set()
+            return self.process(pending)
+        return None
+
+    def run(self) -> None:
+        "Initial build and then watches until ``stop()`` or KeyboardInterrupt."
+        self.process({Path(self.qal.source_file)})
+        echo(DebugLogs.info(f"Watching {self.qal.source_file} and {self.qal.translatables_folder} (Ctrl+C to stop)"))
+        try:
+            while not self._stop.wait(self.interval):
+                self.step()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.qal.translator.close()
+
+    def stop(self) -> None:
+        self._stop.set()